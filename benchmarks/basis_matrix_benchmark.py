@@ -0,0 +1,181 @@
+#!/usr/bin/env python
+"""
+Benchmark of the dense and sparse basis matrices
+
+Times the linear algebra of basis generation (cofactors, determinants of
+candidate replacements, and row replacements), followed by the estimation
+of edge weights, with a ``BasisMatrix`` and with a ``SparseBasisMatrix``,
+on the control-flow graphs of synthetic functions made of a sequence of
+switch statements. Each basis path takes one case of each switch, so
+the rows of the basis matrix become sparser as the path dimension grows.
+
+Usage:
+    python benchmarks/basis_matrix_benchmark.py --dimensions 250 500 1000 2000
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import networkx as nx
+import numpy as np
+import scipy.sparse
+
+# Add the src directory to the path to allow imports
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from basis_matrix import BasisMatrix, SparseBasisMatrix
+from nx_helper import Dag, get_random_path
+from path_encoding import PathEncoder
+
+
+def make_switch_dag(dimension: int, num_cases: int) -> Dag:
+    """
+    Parameters:
+        dimension: int
+            Desired path dimension of the DAG.
+        num_cases: int
+            Number of cases of each switch statement.
+
+    Returns:
+        Dag: DAG of a sequence of switch statements whose path dimension
+        is at least the one provided.
+    """
+    graph = nx.DiGraph()
+    num_switches = -(-(dimension - 1) // (num_cases - 1))
+    head = "entry"
+    for switch in range(num_switches):
+        tail = "join%d" % switch
+        for case in range(num_cases):
+            case_node = "switch%d_case%d" % (switch, case)
+            graph.add_edge(head, case_node)
+            graph.add_edge(case_node, tail)
+        head = tail
+    for node in graph.nodes:
+        graph.nodes[node]["label"] = node
+    dag = Dag(graph)
+    dag.load_variables()
+    return dag
+
+
+def run_basis_generation(basis_matrix_class, encoded_paths, threshold: float):
+    """
+    Replaces the rows of a basis matrix with the encoded paths provided,
+    in the same way as ``Analyzer.generate_basis_paths`` does, and then
+    solves for the edge weights.
+
+    Parameters:
+        basis_matrix_class
+            ``BasisMatrix`` or ``SparseBasisMatrix``.
+        encoded_paths
+            List of candidate rows, as 0-1 vectors, one per row to replace.
+        threshold: float
+            Smallest absolute value of the determinant for a replacement.
+
+    Returns:
+        Tuple of the number of rows replaced, the time taken, in seconds,
+        and the peak memory allocated, in bytes.
+    """
+    dimension = len(encoded_paths[0])
+    tracemalloc.start()
+    start_time = time.perf_counter()
+
+    if basis_matrix_class is SparseBasisMatrix:
+        basis_matrix = SparseBasisMatrix(scipy.sparse.identity(dimension))
+    else:
+        basis_matrix = BasisMatrix(np.eye(dimension))
+
+    num_replaced = 0
+    for row, candidate in zip(range(dimension), encoded_paths):
+        basis_matrix.cofactors(row)
+        sign, log_det = basis_matrix.replacement_log_det(row, candidate)
+        if sign != 0 and np.exp(log_det) >= threshold:
+            basis_matrix.replace_row(row, candidate)
+            num_replaced += 1
+    basis_matrix.solve(np.ones(dimension))
+
+    elapsed = time.perf_counter() - start_time
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return num_replaced, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the dense and sparse basis matrices"
+    )
+    parser.add_argument(
+        "--dimensions",
+        type=int,
+        nargs="+",
+        default=[250, 500, 1000, 2000],
+        help="Path dimensions to benchmark",
+    )
+    parser.add_argument(
+        "--cases", type=int, default=16, help="Number of cases of each switch"
+    )
+    parser.add_argument(
+        "--rows",
+        type=int,
+        default=200,
+        help="Number of rows to replace for each dimension",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(
+        "%10s %8s %10s %12s %12s %12s %12s"
+        % (
+            "dimension",
+            "density",
+            "replaced",
+            "dense (s)",
+            "sparse (s)",
+            "dense (MB)",
+            "sparse (MB)",
+        )
+    )
+    for dimension in args.dimensions:
+        random.seed(args.seed)
+        dag = make_switch_dag(dimension, args.cases)
+        encoder = PathEncoder(dag)
+        # The candidate for row i goes through the edge of column i, as
+        # the paths found from the cofactors of row i tend to.
+        paths = []
+        for source, sink in dag.edges_reduced[: args.rows]:
+            paths.append(
+                get_random_path(dag, dag.source, source)
+                + get_random_path(dag, sink, dag.sink)
+            )
+        encoded_paths = list(encoder.dense_rows(paths))
+        density = np.mean([np.count_nonzero(row) for row in encoded_paths]) / len(
+            encoded_paths[0]
+        )
+
+        results = [
+            run_basis_generation(basis_matrix_class, encoded_paths, 1e-3)
+            for basis_matrix_class in (BasisMatrix, SparseBasisMatrix)
+        ]
+        print(
+            "%10d %8.3f %10d %12.3f %12.3f %12.1f %12.1f"
+            % (
+                encoder.num_columns,
+                density,
+                results[0][0],
+                results[0][1],
+                results[1][1],
+                results[0][2] / 2**20,
+                results[1][2] / 2**20,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Benchmark of the compacted DAG
+
+Compares the integer linear program that finds the longest path through
+a DAG with one flow variable for each edge against the one with one flow
+variable for each chain of a ``CompactDag``. The comparison covers
+the size of the program, the time to solve it, and the time to map
+the chains of the solution back to the edges of the DAG. The old mapping
+searched an edge-to-chain dictionary once per chain; the new one reads the
+reverse arrays of the ``CompactDag``. The DAGs are the control-flow graphs
+of synthetic functions made of a sequence of switch statements, where each
+case is a straight-line sequence of basic blocks.
+
+Usage:
+    python benchmarks/compact_dag_benchmark.py --switches 10 20 40 --blocks 8
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+import pulp
+
+# Add the src directory to the path to allow imports
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from compact_dag import CompactDag
+from nx_helper import Dag
+
+
+def make_switch_dag(num_switches: int, num_cases: int, num_blocks: int) -> Dag:
+    """
+    Parameters:
+        num_switches: int
+            Number of switch statements, one after the other.
+        num_cases: int
+            Number of cases of each switch statement.
+        num_blocks: int
+            Number of basic blocks in each case.
+
+    Returns:
+        Dag: DAG of the sequence of switch statements.
+    """
+    graph = nx.DiGraph()
+    head = "entry"
+    for switch in range(num_switches):
+        tail = "join%d" % switch
+        for case in range(num_cases):
+            previous = head
+            for block in range(num_blocks):
+                node = "switch%d_case%d_block%d" % (switch, case, block)
+                graph.add_edge(previous, node)
+                previous = node
+            graph.add_edge(previous, tail)
+        head = tail
+    for node in graph.nodes:
+        graph.nodes[node]["label"] = node
+    dag = Dag(graph)
+    dag.load_variables()
+    return dag
+
+
+def solve_longest_path(tails, heads, weights, source, sink, bound):
+    """
+    Solves the integer linear program that finds the longest path through
+    the graph whose edges are provided, with an upper bound on the value
+    of the path, so that the program cannot be solved by dynamic programming.
+
+    Parameters:
+        tails
+            Node that each edge starts from.
+        heads
+            Node that each edge ends at.
+        weights
+            Weight on each edge.
+        source
+            Source of the graph.
+        sink
+            Sink of the graph.
+        bound
+            Upper bound on the value of the path.
+
+    Returns:
+        Tuple of the number of variables, the number of constraints,
+        the time taken to solve the program, in seconds, and the edges
+        whose flow is 1 in the solution.
+    """
+    problem = pulp.LpProblem("FindExtremePath", pulp.LpMaximize)
+    flows = pulp.LpVariable.dicts("EdgeFlow", range(len(tails)), 0, 1, pulp.LpBinary)
+    out_edges, in_edges = {}, {}
+    for edge, (tail, head) in enumerate(zip(tails, heads)):
+        out_edges.setdefault(tail, []).append(flows[edge])
+        in_edges.setdefault(head, []).append(flows[edge])
+    for node in set(out_edges) | set(in_edges):
+        if node == source:
+            problem += pulp.lpSum(out_edges[node]) == 1
+        elif node == sink:
+            problem += pulp.lpSum(in_edges[node]) == 1
+        else:
+            problem += pulp.lpSum(in_edges[node]) == pulp.lpSum(out_edges[node])
+    objective = pulp.lpSum(weight * flows[edge] for edge, weight in enumerate(weights))
+    problem += objective
+    problem += objective <= bound
+
+    start_time = time.perf_counter()
+    problem.solve(pulp.PULP_CBC_CMD(msg=False))
+    elapsed = time.perf_counter() - start_time
+    solution = [edge for edge in flows if flows[edge].value() > 0.5]
+    return len(flows), len(problem.constraints), elapsed, solution
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the ILPs over the edges and over the chains of a DAG"
+    )
+    parser.add_argument(
+        "--switches",
+        type=int,
+        nargs="+",
+        default=[10, 20, 40],
+        help="Numbers of switch statements to benchmark",
+    )
+    parser.add_argument(
+        "--cases", type=int, default=8, help="Number of cases of each switch"
+    )
+    parser.add_argument(
+        "--blocks", type=int, default=8, help="Number of basic blocks in each case"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(
+        "%8s %8s %8s %10s %10s %12s %12s %12s %12s"
+        % (
+            "edges",
+            "chains",
+            "rows",
+            "rows (c)",
+            "build (s)",
+            "solve (s)",
+            "solve (c)",
+            "decomp (s)",
+            "decomp (c)",
+        )
+    )
+    for num_switches in args.switches:
+        random.seed(args.seed)
+        dag = make_switch_dag(num_switches, args.cases, args.blocks)
+        edges = list(dag.all_edges)
+        weights = [random.randint(1, 100) for _ in edges]
+
+        start_time = time.perf_counter()
+        compact_dag = CompactDag(dag)
+        build_time = time.perf_counter() - start_time
+        chain_weights = compact_dag.chain_weights(weights).tolist()
+
+        # Bound the value below that of the longest path, so that the solver
+        # has to search.
+        bound = 0.9 * sum(
+            max(chain_weights[chain] for chain in compact_dag.out_chains[node])
+            for node in compact_dag.nodes
+            if node != dag.sink
+        )
+        num_vars, num_rows, edge_time, _ = solve_longest_path(
+            [tail for tail, _ in edges],
+            [head for _, head in edges],
+            weights,
+            dag.source,
+            dag.sink,
+            bound,
+        )
+        _, num_rows_compact, chain_time, chains = solve_longest_path(
+            compact_dag.chain_tails,
+            compact_dag.chain_heads,
+            chain_weights,
+            dag.source,
+            dag.sink,
+            bound,
+        )
+
+        # Map the chains of the solution back to the edges of the DAG, with
+        # the old search of the edge-to-chain dictionary, and with
+        # the reverse arrays.
+        edge_map = compact_dag.edge_map()
+        start_time = time.perf_counter()
+        old_path = []
+        for chain in chains:
+            old_path.extend(edge for edge in edge_map if edge_map[edge] == chain)
+        old_decompress_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        new_path = compact_dag.edges_of(chains)
+        new_decompress_time = time.perf_counter() - start_time
+        assert sorted(old_path) == sorted(new_path)
+
+        print(
+            "%8d %8d %8d %10d %10.4f %12.3f %12.3f %12.5f %12.5f"
+            % (
+                num_vars,
+                compact_dag.num_chains,
+                num_rows,
+                num_rows_compact,
+                build_time,
+                edge_time,
+                chain_time,
+                old_decompress_time,
+                new_decompress_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
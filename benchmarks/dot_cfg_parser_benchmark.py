@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+"""
+Benchmark of the parser of the DOT files written by opt
+
+Compares the time and the peak memory taken to read a control-flow graph
+written by ``opt -passes=dot-cfg`` into a ``Dag`` with ``parse_dot_cfg``,
+which reads the file in a single pass, against ``read_dot`` of
+the NetworkX package, which reads it with the Graphviz library, through
+PyGraphviz, into an intermediate graph, and then copies it. When both
+are available, the graphs that they read are checked to be the same.
+
+The files are either the DOT files provided, such as those of the largest
+unrolled functions of a project, or synthetic files in the same dialect,
+for fully unrolled loops whose body is a diamond of basic blocks, each of
+which holds a number of instructions of LLVM IR in its label.
+
+Usage:
+    python benchmarks/dot_cfg_parser_benchmark.py --iterations 1000 5000 20000
+    python benchmarks/dot_cfg_parser_benchmark.py --files .main.dot
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import networkx as nx
+
+# Add the src directory to the path to allow imports
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from dot_cfg_parser import parse_dot_cfg
+from nx_helper import Dag
+
+
+def write_unrolled_dot(location: str, num_iterations: int, num_instructions: int):
+    """
+    Parameters:
+        location: str
+            Location of the DOT file to write.
+        num_iterations: int
+            Number of iterations of the unrolled loop.
+        num_instructions: int
+            Number of instructions of LLVM IR in each basic block.
+    """
+
+    def block(name: str, terminator: str, ports: str) -> str:
+        instructions = "".join(
+            "  %%%s.%d = add nsw i32 %%%s.%d, %d\\l" % (name, i, name, i - 1, i)
+            for i in range(num_instructions)
+        )
+        return (
+            '\tNode%s [shape=record,color="#3d50c3ff", style=filled, '
+            'fillcolor="#f7ac8e70",label="{%s:%s\\l%s  %s\\l%s}"];\n'
+            % (name, name, " " * 40, instructions, terminator, ports)
+        )
+
+    with open(location, "w") as dot_file:
+        dot_file.write("digraph \"CFG for 'main' function\" {\n")
+        dot_file.write("\tlabel=\"CFG for 'main' function\";\n\n")
+        branch = "|{<s0>T|<s1>F}"
+        for i in range(num_iterations):
+            head, then, other, join = ("h%d" % i, "t%d" % i, "e%d" % i, "h%d" % (i + 1))
+            dot_file.write(
+                block(
+                    head,
+                    "br i1 %%c.%d, label %%%s, label %%%s" % (i, then, other),
+                    branch,
+                )
+            )
+            dot_file.write("\tNode%s:s0 -> Node%s;\n" % (head, then))
+            dot_file.write("\tNode%s:s1 -> Node%s;\n" % (head, other))
+            for name in (then, other):
+                dot_file.write(block(name, "br label %%%s" % join, ""))
+                dot_file.write("\tNode%s -> Node%s;\n" % (name, join))
+        dot_file.write(block("h%d" % num_iterations, "ret i32 0", ""))
+        dot_file.write("}\n")
+
+
+def measure(read, location):
+    """
+    Parameters:
+        read
+            Function that reads the DOT file at the location provided into
+            a ``Dag`` object, and returns it.
+        location
+            Location of the DOT file.
+
+    Returns:
+        Tuple of the ``Dag`` object, the time taken to read the file, in
+        seconds, and the peak memory allocated to read it, in megabytes.
+        The memory is measured in a second read, since tracing
+        the allocations slows the read down.
+    """
+    start_time = time.perf_counter()
+    dag = read(location)
+    elapsed = time.perf_counter() - start_time
+    tracemalloc.start()
+    read(location)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return dag, elapsed, peak / 2**20
+
+
+def read_with_parser(location: str) -> Dag:
+    """Reads the DOT file at the location provided with ``parse_dot_cfg``."""
+    dag = Dag()
+    with open(location, "r") as dot_file:
+        assert parse_dot_cfg(dot_file, dag)
+    return dag
+
+
+def read_with_read_dot(location: str) -> Dag:
+    """Reads the DOT file at the location provided with ``read_dot``."""
+    with open(location, "r") as dot_file:
+        return Dag(nx.nx_agraph.read_dot(dot_file))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare parse_dot_cfg against read_dot on opt CFGs"
+    )
+    parser.add_argument(
+        "--files", nargs="*", default=[], help="DOT files written by opt"
+    )
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        nargs="+",
+        default=[1000, 5000, 20000],
+        help="Numbers of iterations of the synthetic unrolled loops",
+    )
+    parser.add_argument(
+        "--instructions",
+        type=int,
+        default=20,
+        help="Number of instructions in each synthetic basic block",
+    )
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    try:
+        import pygraphviz  # noqa: F401
+
+        has_read_dot = True
+    except ImportError:
+        has_read_dot = False
+        print("PyGraphviz is not installed: read_dot is not measured.")
+
+    locations = list(args.files)
+    temp_dir = tempfile.mkdtemp(prefix="dot-cfg-")
+    if not locations:
+        for num_iterations in args.iterations:
+            location = os.path.join(temp_dir, "unrolled%d.dot" % num_iterations)
+            write_unrolled_dot(location, num_iterations, args.instructions)
+            locations.append(location)
+
+    print(
+        "%8s %8s %10s %12s %12s %12s %12s"
+        % (
+            "nodes",
+            "edges",
+            "size (MB)",
+            "parse (s)",
+            "read_dot (s)",
+            "parse (MB)",
+            "read_dot (MB)",
+        )
+    )
+    for location in locations:
+        dag, parse_time, parse_memory = measure(read_with_parser, location)
+        read_dot_time = read_dot_memory = float("nan")
+        if has_read_dot:
+            other_dag, read_dot_time, read_dot_memory = measure(
+                read_with_read_dot, location
+            )
+            assert list(dag.nodes(data=True)) == list(other_dag.nodes(data=True))
+            assert list(dag.edges()) == list(other_dag.edges())
+        print(
+            "%8d %8d %10.1f %12.3f %12.3f %12.1f %12.1f"
+            % (
+                dag.number_of_nodes(),
+                dag.number_of_edges(),
+                os.path.getsize(location) / 2**20,
+                parse_time,
+                read_dot_time,
+                parse_memory,
+                read_dot_memory,
+            )
+        )
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Benchmark of the integer linear program in matrix form
+
+Compares the time to build the integer linear program that finds
+the longest path through a DAG term by term with PuLP, as
+``_ExtremePathModel`` and ``_solve_extreme_path_problem`` do, against
+the time to assemble it in matrix form, as ``ExtremePathMatrix`` does.
+Both times cover the first solve on a DAG, which builds the variables
+and the flow-conservation constraints, and the setup of each later
+solve, which only builds the objective function and the bound on it.
+With ``--solve``, both programs are also solved, with an upper bound on
+the value of the path, so that the solver has to search, and their
+optimal values are compared. The DAGs are layered, with every node of
+a layer joined to two nodes of the next, so that few edges are
+collapsed into chains.
+
+Usage:
+    python benchmarks/ilp_matrix_benchmark.py --layers 100 500 2000 --width 10
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import time
+
+import networkx as nx
+import pulp
+
+# Add the src directory to the path to allow imports
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+)
+
+from ilp_matrix import ExtremePathMatrix
+from interval import Interval
+from nx_helper import Dag
+from pulp_helper import _ExtremePathModel
+
+
+def make_layered_dag(num_layers: int, width: int, seed: int) -> Dag:
+    """
+    Parameters:
+        num_layers: int
+            Number of layers of nodes between the source and the sink.
+        width: int
+            Number of nodes in each layer.
+        seed: int
+            Seed of the choice of the edges between layers.
+
+    Returns:
+        Dag: DAG whose nodes of each layer are each joined to the node
+        below them in the next layer and to another, random node of it.
+    """
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    for node in range(width):
+        graph.add_edge("entry", "n0_%d" % node)
+        graph.add_edge("n%d_%d" % (num_layers - 1, node), "exit")
+    for layer in range(num_layers - 1):
+        for node in range(width):
+            tail = "n%d_%d" % (layer, node)
+            graph.add_edge(tail, "n%d_%d" % (layer + 1, node))
+            graph.add_edge(tail, "n%d_%d" % (layer + 1, rng.randrange(width)))
+    for node in graph.nodes:
+        graph.nodes[node]["label"] = node
+    dag = Dag(graph)
+    dag.load_variables()
+    return dag
+
+
+def build_pulp_problem(model, chain_weights, bound):
+    """
+    Parameters:
+        model
+            ``_ExtremePathModel`` of the DAG.
+        chain_weights
+            Sum of the weights on the edges of each chain.
+        bound
+            Upper bound on the value of the path.
+
+    Returns:
+        Integer linear program that finds the longest path, built term by
+        term with PuLP from the variables and the flow constraints of
+        the model, as each solve of ``_solve_extreme_path_problem`` does.
+    """
+    problem = pulp.LpProblem("FindExtremePath", pulp.LpMaximize)
+    problem.extend(model.flow_constraints)
+    objective = pulp.LpAffineExpression(
+        [
+            (variable, chain_weights[chain])
+            for chain, variable in model.edge_flows.items()
+        ]
+    )
+    problem += objective <= bound
+    problem.setObjective(objective)
+    return problem
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the ILP built term by term and in matrix form"
+    )
+    parser.add_argument(
+        "--layers",
+        type=int,
+        nargs="+",
+        default=[100, 500, 2000],
+        help="Numbers of layers to benchmark",
+    )
+    parser.add_argument(
+        "--width", type=int, default=10, help="Number of nodes in each layer"
+    )
+    parser.add_argument("--solve", action="store_true", help="Also solve both programs")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(
+        "%8s %8s %12s %12s %12s %12s %12s %12s"
+        % (
+            "edges",
+            "chains",
+            "model (s)",
+            "matrix (s)",
+            "setup (s)",
+            "setup (m)",
+            "solve (s)",
+            "solve (m)",
+        )
+    )
+    for num_layers in args.layers:
+        random.seed(args.seed)
+        dag = make_layered_dag(num_layers, args.width, args.seed)
+        weights = [random.randint(1, 100) for _ in range(dag.num_edges)]
+
+        start_time = time.perf_counter()
+        model = _ExtremePathModel(dag)
+        model_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        matrix = ExtremePathMatrix(dag)
+        matrix_time = time.perf_counter() - start_time
+
+        # Bound the value below that of the longest path, which is at most
+        # the largest weight on an edge for each layer.
+        bound = 0.9 * 100 * (num_layers + 1)
+        interval = Interval(upper=bound)
+
+        start_time = time.perf_counter()
+        chain_weights = model.compact_dag.chain_weights(weights).tolist()
+        problem = build_pulp_problem(model, chain_weights, bound)
+        setup_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        matrix_chain_weights = matrix.compact_dag.chain_weights(weights)
+        setup_matrix_time = time.perf_counter() - start_time
+
+        solve_time = solve_matrix_time = float("nan")
+        if args.solve:
+            start_time = time.perf_counter()
+            problem.solve(pulp.PULP_CBC_CMD(msg=False))
+            solve_time = time.perf_counter() - start_time
+            start_time = time.perf_counter()
+            _, value = matrix.solve(matrix_chain_weights, True, [], interval)
+            solve_matrix_time = time.perf_counter() - start_time
+            assert abs(pulp.value(problem.objective) - value) < 1e-6
+
+        # Add the time to set up the first solve to the time to build
+        # the program, which the first solve includes.
+        print(
+            "%8d %8d %12.4f %12.4f %12.4f %12.4f %12.3f %12.3f"
+            % (
+                dag.num_edges,
+                matrix.compact_dag.num_chains,
+                model_time + setup_time,
+                matrix_time + setup_matrix_time,
+                setup_time,
+                setup_matrix_time,
+                solve_time,
+                solve_matrix_time,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,27 +2,33 @@
 import os
 import shutil
 import time
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Tuple, Optional
 
 import numpy as np
-import networkx as nx
+import scipy.sparse
 
 import clang_helper
 import nx_helper
 import pulp_helper
 import inliner
+import basis_checkpoint
+import incremental_basis
 import unroller
 from defaults import config, logger
+from basis_matrix import BasisMatrix, SparseBasisMatrix
+from constraint_pool import ConstraintPool
 from file_helper import remove_all_except
 from gametime_error import GameTimeError
 from nx_helper import Dag, write_dag_to_dot_file
 from path import Path
 from path_analyzer import PathAnalyzer
+from path_encoding import PathEncoder
+from edge_weights import EdgeWeights
 from project_configuration import ProjectConfiguration
 from path_generator import PathGenerator
 
-from numpy import dot, exp, eye
-from numpy.linalg import det, inv, slogdet
+from numpy import exp, eye
 
 from backend.flexpret_backend.flexpret_backend import FlexpretBackend
 from backend.x86_backend.x86_backend import X86Backend
@@ -63,18 +69,27 @@ class Analyzer(object):
         #: Data structure for the DAG of the code being analyzed.
         self.dag: Dag = Dag()
 
+        #: Encoder of paths through the DAG as vectors over
+        #: its `non-special' edges.
+        self.path_encoder: Optional[PathEncoder] = None
+
         ### PATHS INFORMATION ###
         #: Dimension of the vector representing each path.
         self.path_dimension: int = 0
 
-        #: Basis matrix.
-        self.basis_matrix: Optional[np.ndarray] = None
+        #: Basis matrix, together with its factorization and determinant.
+        self.basis_matrix: Optional[BasisMatrix] = None
+
+        #: Weights on the `non-special' edges of the DAG, as estimated
+        #: from the values of the basis paths.
+        self.reduced_edge_weights: Optional[np.ndarray] = None
 
-        #: Set whose elements are lists of edges that must not be taken
+        #: Pool whose elements are lists of edges that must not be taken
         #: together along any path through the DAG. For example, the element
         #: [e1, e2] means "if you take e1, you cannot take e2" and
-        #: "if you take e2, you cannot take e1".
-        self.path_exclusive_constraints: List[List[Tuple[str, str]]] = []
+        #: "if you take e2, you cannot take e1". Elements implied by
+        #: an element with fewer edges are not kept.
+        self.path_exclusive_constraints: ConstraintPool = ConstraintPool()
 
         #: List whose elements are lists of edges that must be taken together,
         #: if at least one is taken along a path through the DAG. For example,
@@ -84,8 +99,15 @@ class Analyzer(object):
         # Number of `bad' rows in the basis matrix.
         self.num_bad_rows: int = 0
 
+        # Identities of the nodes of the DAG that do not depend on their
+        # names, with which the checkpoints of basis generation are saved
+        # and restored. They are computed the first time that they are used.
+        self._node_identities: Optional[basis_checkpoint.NodeIdentities] = None
+
         # List of the Path objects associated with all_temp_files basis paths
-        # generated so far.
+        # generated so far. Path i is the path of row i of the basis matrix,
+        # as ordered by the permutation index of the matrix; the remaining
+        # `num_bad_rows' rows are at the bottom of the matrix.
         self.basis_paths: List[Path] = []
 
         # List of lists, each of which is a list of IDs of the nodes in
@@ -158,14 +180,18 @@ class Analyzer(object):
         # of the same GameTime project, and create a fresh new
         # temporary directory.
         if os.path.exists(project_temp_dir):
+            kept_files = []
             if self.project_config.UNROLL_LOOPS:
                 # If a previous run of the same GameTime project produced
                 # a loop configuration file, and the current run involves
                 # unrolling the loops that are configured in the file,
                 # do not remove the file.
-                remove_all_except([config.TEMP_LOOP_CONFIG], project_temp_dir)
-            else:
-                remove_all_except([], project_temp_dir)
+                kept_files.append(config.TEMP_LOOP_CONFIG)
+            if self.project_config.RESUME_BASIS_GENERATION:
+                # Likewise, keep the checkpoint of the basis generation
+                # of a previous run that the current run resumes.
+                kept_files.append(config.TEMP_BASIS_CHECKPOINT)
+            remove_all_except(kept_files, project_temp_dir)
         else:
             os.mkdir(project_temp_dir)
 
@@ -354,6 +380,8 @@ class Analyzer(object):
 
         """
         self.dag, modified = nx_helper.construct_dag(location)
+        self.path_encoder = PathEncoder(self.dag)
+        self._node_identities = None
         print(f"num_edges in load_dag_from_dot_file = {self.dag.num_edges}")
         if modified:
             modified_dag_location = os.path.join(
@@ -370,9 +398,30 @@ class Analyzer(object):
         self.reset_path_bundled_constraints()
 
     ### BASIS MATRIX FUNCTIONS ###
+    def _basis_matrix_class(self) -> type:
+        """
+        Returns:
+            Class of the basis matrix: ``SparseBasisMatrix`` if the path
+            dimension is at least the configured threshold, and
+            ``BasisMatrix`` otherwise.
+        """
+        if self.path_dimension >= self.project_config.SPARSE_BASIS_THRESHOLD:
+            return SparseBasisMatrix
+        return BasisMatrix
+
     def _init_basis_matrix(self):
         """Initializes the basis matrix."""
-        self.basis_matrix: np.ndarray = eye(self.path_dimension)
+        basis_matrix_class = self._basis_matrix_class()
+        if basis_matrix_class is SparseBasisMatrix:
+            logger.info(
+                "Path dimension %d is at least %d: using a sparse basis matrix."
+                % (self.path_dimension, self.project_config.SPARSE_BASIS_THRESHOLD)
+            )
+            self.basis_matrix = SparseBasisMatrix(
+                scipy.sparse.identity(self.path_dimension)
+            )
+        else:
+            self.basis_matrix = BasisMatrix(eye(self.path_dimension))
         if self.project_config.RANDOMIZE_INITIAL_BASIS:
             self._randomize_basis_matrix()
 
@@ -389,7 +438,8 @@ class Analyzer(object):
 
     def _swap_basis_matrix_rows(self, i, j):
         """
-        Swaps two rows of the basis matrix.
+        Swaps two rows of the basis matrix. Only the permutation index
+        of the basis matrix changes: no row values are copied.
 
         Parameters:
             i:
@@ -397,31 +447,220 @@ class Analyzer(object):
             j:
                 Index of other row to swap.
         """
-        row_to_swap_out = self.basis_matrix[j]
-        row_to_swap_in = self.basis_matrix[i]
-        row_len = len(row_to_swap_out)
+        self.basis_matrix.swap_rows(i, j)
+
+    ### CHECKPOINT FUNCTIONS ###
+    def _basis_checkpoint_location(self) -> str:
+        """
+        Returns:
+            Location of the checkpoint file of basis generation.
+        """
+        return os.path.join(
+            self.project_config.location_temp_dir, config.TEMP_BASIS_CHECKPOINT
+        )
+
+    def get_node_identities(self) -> basis_checkpoint.NodeIdentities:
+        """
+        Returns:
+            Identities of the nodes of the DAG that do not depend on their
+            names, which change every time that the code is preprocessed.
+        """
+        if self._node_identities is None or self._node_identities.dag is not self.dag:
+            self._node_identities = basis_checkpoint.NodeIdentities(self.dag)
+        return self._node_identities
+
+    def _save_basis_checkpoint(
+        self,
+        stage: str,
+        basis_paths: List[Path],
+        infeasible: List[List[Tuple[str, str]]],
+        **loop_state,
+    ):
+        """
+        Saves the state of basis generation, so that it can be resumed
+        from this point if it is interrupted. The state consists of
+        the basis matrix and the order of its rows, the basis paths and
+        their measured values, the number of `bad' rows, the infeasible
+        paths, the path-exclusive constraints, and the state of the loop
+        that is running.
+
+        Parameters:
+            stage: str :
+                Stage of basis generation: "initial" while the rows of
+                the basis matrix are replaced, "refinement" while the basis
+                is refined, "overcomplete" while an overcomplete basis is
+                found, and "done" once the basis paths have been generated.
+            basis_paths: List[Path] :
+                Basis paths generated so far.
+            infeasible: List[List[Tuple[str, str]]] :
+                Edges of the infeasible paths found so far.
+            loop_state :
+                Values of the variables of the loop that is running,
+                which must be JSON-serializable.
+        """
+        identities = self.get_node_identities()
+        checkpoint = {
+            "dag_fingerprint": identities.fingerprint,
+            "stage": stage,
+            "basis_matrix": (
+                basis_checkpoint.sparse_to_dict(self.basis_matrix.sparse_matrix)
+                if self.basis_matrix is not None
+                else None
+            ),
+            "row_order": (
+                self.basis_matrix.order.tolist()
+                if self.basis_matrix is not None
+                else None
+            ),
+            "num_bad_rows": self.num_bad_rows,
+            "basis_paths": [identities.path_to_dict(path) for path in basis_paths],
+            "infeasible": [identities.edges_to_list(e) for e in infeasible],
+            "path_exclusive_constraints": [
+                identities.edges_to_list(edges)
+                for edges in self.path_exclusive_constraints
+            ],
+            "loop_state": loop_state,
+        }
+        basis_checkpoint.write_checkpoint(self._basis_checkpoint_location(), checkpoint)
+
+    def _load_basis_checkpoint(
+        self,
+    ) -> Optional[Tuple[str, List[Path], List[List[Tuple[str, str]]], dict]]:
+        """
+        Restores the state of basis generation from the last checkpoint,
+        if the project is configured to resume basis generation, and if
+        a checkpoint for the current DAG exists. The basis matrix,
+        the number of `bad' rows and the path-exclusive constraints of
+        this object are restored.
+
+        Returns:
+            Tuple of the stage of basis generation, the basis paths,
+            the edges of the infeasible paths, and the state of the loop
+            that was running, as passed to `_save_basis_checkpoint`,
+            or None if there is no checkpoint to resume from.
+        """
+        if not self.project_config.RESUME_BASIS_GENERATION:
+            return None
+        identities = self.get_node_identities()
+        checkpoint = basis_checkpoint.read_checkpoint(
+            self._basis_checkpoint_location(), identities
+        )
+        if checkpoint is None:
+            return None
+
+        if checkpoint["basis_matrix"] is not None:
+            self.basis_matrix = self._basis_matrix_class().restore(
+                basis_checkpoint.sparse_from_dict(checkpoint["basis_matrix"]),
+                checkpoint["row_order"],
+            )
+        self.num_bad_rows = checkpoint["num_bad_rows"]
+        self.path_exclusive_constraints = ConstraintPool(
+            identities.edges_from_list(edges)
+            for edges in checkpoint["path_exclusive_constraints"]
+        )
+        basis_paths = [
+            identities.path_from_dict(path_dict)
+            for path_dict in checkpoint["basis_paths"]
+        ]
+        infeasible = [
+            identities.edges_from_list(edges) for edges in checkpoint["infeasible"]
+        ]
+        logger.info(
+            "Resuming basis generation at stage `%s', with %d basis paths."
+            % (checkpoint["stage"], len(basis_paths))
+        )
+        return checkpoint["stage"], basis_paths, infeasible, checkpoint["loop_state"]
+
+    ### INCREMENTAL ANALYSIS FUNCTIONS ###
+    def _reuse_basis_paths(self, basis_paths: List[Path]) -> int:
+        """
+        Reuses the basis paths of the previous incremental analysis that
+        only go through basic blocks that did not change since, together
+        with their inputs and measured values. A maximal set of linearly
+        independent paths among them becomes the top rows of the basis
+        matrix, and the remaining rows are rows of the identity matrix,
+        which are the only rows that basis generation needs to replace.
+
+        Parameters:
+            basis_paths: List[Path] :
+                List of basis paths, to which the reused paths are appended.
+
+        Returns:
+            Number of basis paths reused, which is also the index of
+            the first row of the basis matrix to replace.
+        """
+        location = self.project_config.location_incremental_dir
+        state = incremental_basis.read_basis_paths(location)
+        if state is None:
+            return 0
+        kept = incremental_basis.match_basis_paths(state, self.dag)
+        if not kept:
+            return 0
+
+        rows = self.path_encoder.sparse_rows([nodes for _, nodes in kept])
+        selected, free_columns = incremental_basis.select_basis_rows(rows.toarray())
+        identity = scipy.sparse.identity(self.path_dimension, format="csr")
+        self.basis_matrix = self._basis_matrix_class()(
+            scipy.sparse.vstack([rows[selected], identity[free_columns]])
+        )
+
+        for index in selected:
+            saved_path, nodes = kept[index]
+            path = Path(nodes=nodes, measured_value=saved_path["measured_value"])
+            path.name = f"reused-basis-path{len(basis_paths)}"
+            # The path is known to be feasible, and its inputs are restored,
+            # so that it is neither checked nor measured again.
+            path_analyzer = PathAnalyzer(
+                self.preprocessed_path,
+                self.project_config,
+                self.dag,
+                path,
+                path.name,
+            )
+            incremental_basis.restore_inputs(
+                location, saved_path["name"], path_analyzer.output_folder
+            )
+            path_analyzer.set_feasibility(True)
+            path.path_analyzer = path_analyzer
+            basis_paths.append(path)
+        logger.info(
+            "Reusing %d basis paths of the previous analysis: %d rows of "
+            "the basis matrix remain to be replaced."
+            % (len(selected), self.path_dimension - len(selected))
+        )
+        return len(selected)
+
+    def _save_incremental_basis_paths(self, basis_paths: List[Path]):
+        """
+        Saves the basis paths, so that the next incremental analysis of
+        the function can reuse the ones that go through unchanged code.
 
-        temp_row_to_swap_out = [0] * row_len
-        for k in range(row_len):
-            temp_row_to_swap_out[k] = row_to_swap_out[k]
-        for k in range(row_len):
-            row_to_swap_out[k] = row_to_swap_in[k]
-            row_to_swap_in[k] = temp_row_to_swap_out[k]
+        Parameters:
+            basis_paths: List[Path] :
+                Basis paths to save.
+        """
+        incremental_basis.save_basis_paths(
+            self.project_config.location_incremental_dir,
+            self.dag,
+            basis_paths,
+            self.project_config.location_temp_dir,
+        )
 
     ### PATH GENERATION FUNCTIONS ###
     def add_path_exclusive_constraint(self, edges: List[Tuple[str, str]]):
         """
-        Adds the edges provided to the list of path-exclusive
-        constraints, if not already present. These edges must not
-        be taken together along any path through the DAG.
+        Adds the edges provided to the pool of path-exclusive
+        constraints, unless a constraint with the same edges, or with
+        a subset of them, is already present. These edges must not
+        be taken together along any path through the DAG. Constraints
+        whose edges are a superset of the edges provided are removed.
 
         Parameters:
             edges: List[Tuple[str, str]] :
-                List of edges to add to the list of path-exclusive constraints.
+                List of edges to add to the pool of path-exclusive constraints.
 
         """
-        if edges not in self.path_exclusive_constraints:
-            self.path_exclusive_constraints.append(edges)
+        self.path_exclusive_constraints.add(edges)
 
     def add_path_bundled_constraint(self, edges: List[Tuple[str, str]]):
         """
@@ -440,46 +679,30 @@ class Analyzer(object):
 
     def reset_path_exclusive_constraints(self):
         """Resets the path-exclusive constraints."""
-        self.path_exclusive_constraints = []
+        self.path_exclusive_constraints = ConstraintPool()
 
     def reset_path_bundled_constraints(self):
         """Resets the path-bundled constraints."""
         self.path_bundled_constraints = []
 
-    def _compress_path(self, path_edges: List[Tuple[str, str]]) -> List[float]:
-        """
-        Compresses the path provided: this method converts
-        the provided path to a 0-1 vector that is 1 if a
-        'non-special' edge is along the path, and 0 otherwise.
-
-        Parameters:
-            path_edges: List[Tuple[str, str]] :
-                Edges along the path to represent with 'non-special' edges.
-
-        Returns:
-            0-1 vector that is 1 if a `non-special' edge is along the path, and 0 otherwise.
-        """
-        return [(1.0 if edge in path_edges else 0.0) for edge in self.dag.edges_reduced]
-
     ####### Fuctions to FIX
     def generate_overcomplete_basis(self, k: int):
         """
         Generates an overcomplete basis so that each feasible path can be
            written as a liner combination of the paths in the basis so that the
-           L1 norm is at most 'k'. This method is for testing purposes
-           only as it exhaustively generates all_temp_files paths in the graph!. Use the
-           function below for a scalable version.
+           L1 norm is at most 'k'. The basis starts from the current basis
+           paths, and new basis paths are priced in by column generation,
+           without listing all of the paths in the graph.
 
         Parameters:
             k: int :
                 Maximum value of L1 norm.
 
+        Returns:
+            The set of basis paths.
         """
-        logger.info("Generating all_temp_files paths")
-        paths = nx.all_simple_paths(self.dag, self.dag.source, self.dag.sink)
-        feasible = list(paths)
         logger.info("Find minimal overcomplete basis")
-        pulp_helper.find_minimal_overcomplete_basis(self, feasible, k)
+        return pulp_helper.find_minimal_overcomplete_basis(self, self.basis_paths, k)
 
     def iteratively_find_overcomplete_basis(
         self, initial_paths: List[List[Tuple[str, str]]], k: int
@@ -506,15 +729,27 @@ class Analyzer(object):
         edge_node_paths = initial_paths
         optimal_bound = 1
         start_time = time.perf_counter()
+
+        resumed = self._load_basis_checkpoint()
+        if resumed is not None and resumed[0] == "overcomplete":
+            _, self.basis_paths, infeasible, _ = resumed
+            edge_node_paths = [Dag.get_edges(path.nodes) for path in self.basis_paths]
+
+        # Time taken by each iteration to find the worst expressible path.
+        # The integer linear program is kept between iterations, so each
+        # iteration only adds the rows for the new basis path or
+        # the new exclusive path constraint, and solves it again.
+        iteration_times = []
         while True:
             before_time = time.perf_counter()
             length, path, ilp_problem = pulp_helper.find_worst_expressible_path(
                 self, self.basis_paths, 0
             )
             after_time = time.perf_counter()
+            iteration_times.append(after_time - before_time)
             logger.info(
-                "Found a candidate path of length %.2f in %d seconds"
-                % (length, after_time - before_time)
+                "Iteration %d: found a candidate path of length %.2f in %.3f seconds"
+                % (len(iteration_times), length, after_time - before_time)
             )
 
             optimal_bound = length
@@ -532,6 +767,9 @@ class Analyzer(object):
                 logger.info("Path is feasible.")
                 self.basis_paths.append(result_path)
                 edge_node_paths.append(candidate_path_edges)
+                self._save_basis_checkpoint(
+                    "overcomplete", self.basis_paths, infeasible
+                )
             else:
                 logger.info("Path is infeasible.")
                 logger.info("Finding the edges to exclude...")
@@ -545,13 +783,26 @@ class Analyzer(object):
                 else:
                     self.add_path_exclusive_constraint(candidate_path_edges)
                 logger.info("Constraint added.")
+                self._save_basis_checkpoint(
+                    "overcomplete", self.basis_paths, infeasible
+                )
 
         logger.info(
             "Found overcomplete basis of size %d, yielding bound %.2f"
             % (len(edge_node_paths), optimal_bound)
         )
+        logger.info(
+            "Found the worst expressible paths of %d iterations in %.3f seconds "
+            "(%.3f seconds per iteration)"
+            % (
+                len(iteration_times),
+                sum(iteration_times),
+                sum(iteration_times) / len(iteration_times),
+            )
+        )
 
         self.basis_paths_nodes = [path.nodes for path in self.basis_paths]
+        self._save_basis_checkpoint("done", self.basis_paths, infeasible)
         return self.basis_paths
 
     def generate_basis_paths(self):
@@ -613,9 +864,13 @@ class Analyzer(object):
 
             logger.info("Basis paths generated.")
 
+            if self.project_config.INCREMENTAL_ANALYSIS:
+                self._save_incremental_basis_paths(basis_paths)
+
             # If we are computing overcomplete basis, use the computed set as
             # the initial set of paths in the iterative algorithm,
             if self.project_config.OVER_COMPLETE_BASIS:
+                self._save_basis_checkpoint("overcomplete", basis_paths, infeasible)
                 logger.info("Iteratively improving the basis")
                 for path in infeasible:
                     self.add_path_exclusive_constraint(path)
@@ -630,6 +885,7 @@ class Analyzer(object):
                 )
                 return result
             else:
+                self._save_basis_checkpoint("done", basis_paths, infeasible)
                 return self.basis_paths
 
         if self.path_dimension == 1:
@@ -651,6 +907,44 @@ class Analyzer(object):
         # Collects all_temp_files infeasible paths discovered during the computation
         infeasible = []
         current_row, num_paths_unsat = 0, 0
+
+        # Stage of basis generation to start from, and the state of its loop,
+        # which are restored from the last checkpoint when resuming.
+        stage, loop_state = "initial", {}
+        resumed = self._load_basis_checkpoint()
+        if resumed is not None:
+            stage, basis_paths, infeasible, loop_state = resumed
+            if stage == "done":
+                self.basis_paths = basis_paths
+                self.basis_paths_nodes = [path.nodes for path in basis_paths]
+                return self.basis_paths
+            if stage == "overcomplete":
+                return on_exit(start_time, infeasible)
+            if stage == "initial":
+                current_row = loop_state["current_row"]
+                num_paths_unsat = loop_state["num_paths_unsat"]
+                i = loop_state["attempt"]
+            else:
+                # Every row has already been replaced, or found to be bad.
+                current_row = self.path_dimension - self.num_bad_rows
+            if loop_state.get("num_paths_unsat", 0) > 0:
+                # The subdeterminants are only calculated on the first attempt
+                # to replace a row, which was before the checkpoint.
+                self.dag.reset_edge_weights()
+                self.dag.edge_weights = self._calculate_subdets(
+                    loop_state["current_row"]
+                )
+        elif self.project_config.INCREMENTAL_ANALYSIS:
+            # Only the rows that are not spanned by the reused basis paths
+            # are replaced.
+            current_row = self._reuse_basis_paths(basis_paths)
+
+        if self.project_config.NUM_JOBS > 1 and stage == "initial":
+            # All of the rows are replaced, or found to be bad, in batches,
+            # so the loop below is skipped.
+            current_row = self._replace_rows_speculatively(
+                basis_paths, infeasible, current_row, i
+            )
         while current_row < (self.path_dimension - self.num_bad_rows):
             logger.info("Currently at row %d..." % (current_row + 1))
             logger.info(
@@ -682,22 +976,30 @@ class Analyzer(object):
                     % (current_row + 1)
                 )
                 logger.info("Moving the bad row to the bottom of the basis matrix.")
-                for k in range((current_row + 1), self.path_dimension):
-                    self._swap_basis_matrix_rows(k - 1, k)
+                self.basis_matrix.move_row_to_bottom(current_row)
                 self.num_bad_rows += 1
                 num_paths_unsat = 0
+                self._save_basis_checkpoint(
+                    "initial",
+                    basis_paths,
+                    infeasible,
+                    current_row=current_row,
+                    num_paths_unsat=num_paths_unsat,
+                    attempt=i,
+                )
                 continue
             logger.info("Candidate path found.")
 
             candidate_path_edges = Dag.get_edges(candidate_path_nodes)
             print("candidate_path_edges: ", candidate_path_edges)
-            compressed_path = self._compress_path(candidate_path_edges)
+            compressed_path = self.path_encoder.dense(candidate_path_nodes)
             print("compressed_path: ", compressed_path)
 
-            # Temporarily replace the row in the basis matrix to calculate the new determinant.
-            prev_matrix_row = self.basis_matrix[current_row].copy()
-            self.basis_matrix[current_row] = compressed_path
-            sign, new_basis_matrix_log_det = slogdet(self.basis_matrix)
+            # Calculate the determinant that the basis matrix would have
+            # if the row were replaced, without replacing it.
+            sign, new_basis_matrix_log_det = self.basis_matrix.replacement_log_det(
+                current_row, compressed_path
+            )
             new_basis_matrix_det = exp(new_basis_matrix_log_det)
             logger.info(
                 "Absolute value of the new determinant: %g" % new_basis_matrix_det
@@ -723,9 +1025,7 @@ class Analyzer(object):
 
                 logger.info("Moving the bad row to the bottom of the basis matrix.")
 
-                self.basis_matrix[current_row] = prev_matrix_row
-                for k in range((current_row + 1), self.path_dimension):
-                    self._swap_basis_matrix_rows(k - 1, k)
+                self.basis_matrix.move_row_to_bottom(current_row)
                 self.num_bad_rows += 1
                 num_paths_unsat = 0
             else:  # Row is good, check feasibility
@@ -744,6 +1044,7 @@ class Analyzer(object):
                     # A row should not be replaced if it replaces a good row and decreases the determinant. However, replacing a bad row and decreasing the determinant is okay. (TODO: Are we actually doing this?)
                     logger.info("Replacement is feasible.")
                     logger.info("Row %d replaced." % (current_row + 1))
+                    self.basis_matrix.replace_row(current_row, compressed_path)
                     basis_paths.append(result_path)
                     current_row += 1
                     num_paths_unsat = 0
@@ -753,9 +1054,16 @@ class Analyzer(object):
                     self.add_path_exclusive_constraint(candidate_path_edges)
                     infeasible.append(candidate_path_edges)
                     logger.info("Constraint added.")
-                    self.basis_matrix[current_row] = prev_matrix_row
                     num_paths_unsat += 1
 
+            self._save_basis_checkpoint(
+                "initial",
+                basis_paths,
+                infeasible,
+                current_row=current_row,
+                num_paths_unsat=num_paths_unsat,
+                attempt=i,
+            )
             logger.info("")
             logger.info("")
 
@@ -765,7 +1073,8 @@ class Analyzer(object):
         logger.info("Refining the basis into a 2-barycentric spanner...")
         logger.info("")
         is_two_barycentric = False
-        refinement_round = 0
+        resume_refinement = stage == "refinement"
+        refinement_round = loop_state["refinement_round"] if resume_refinement else 0
         while not is_two_barycentric:
             logger.info(
                 "Currently in round %d of refinement..." % (refinement_round + 1)
@@ -774,6 +1083,12 @@ class Analyzer(object):
 
             is_two_barycentric = True
             current_row, num_paths_unsat = 0, 0
+            if resume_refinement:
+                # Resume the round of refinement that was interrupted.
+                is_two_barycentric = loop_state["is_two_barycentric"]
+                current_row = loop_state["current_row"]
+                num_paths_unsat = loop_state["num_paths_unsat"]
+                resume_refinement = False
             good_rows = self.path_dimension - self.num_bad_rows
             while current_row < good_rows:
                 logger.info(
@@ -807,23 +1122,33 @@ class Analyzer(object):
                     )
                     current_row += 1
                     num_paths_unsat = 0
+                    self._save_basis_checkpoint(
+                        "refinement",
+                        basis_paths,
+                        infeasible,
+                        refinement_round=refinement_round,
+                        is_two_barycentric=is_two_barycentric,
+                        current_row=current_row,
+                        num_paths_unsat=num_paths_unsat,
+                    )
                     continue
 
                 logger.info("Candidate path found.")
                 candidate_path_edges = Dag.get_edges(candidate_path_nodes)
-                compressed_path = self._compress_path(candidate_path_edges)
+                compressed_path = self.path_encoder.dense(candidate_path_nodes)
 
-                sign, old_basis_matrix_log_det = slogdet(self.basis_matrix)
-                old_basis_matrix_det = exp(old_basis_matrix_log_det)
+                # The determinant of the current basis matrix is maintained
+                # along with its factorization, and is not recomputed.
+                old_basis_matrix_det = exp(self.basis_matrix.log_det)
                 logger.info(
                     "Absolute value of the old determinant: %g" % old_basis_matrix_det
                 )
 
-                # Temporarily replace the row in the basis matrix
-                # to calculate the new determinant.
-                prev_matrix_row = self.basis_matrix[current_row].copy()
-                self.basis_matrix[current_row] = compressed_path
-                sign, new_basis_matrix_log_det = slogdet(self.basis_matrix)
+                # Calculate the determinant that the basis matrix would have
+                # if the row were replaced, without replacing it.
+                sign, new_basis_matrix_log_det = self.basis_matrix.replacement_log_det(
+                    current_row, compressed_path
+                )
                 new_basis_matrix_det = exp(new_basis_matrix_log_det)
                 logger.info(
                     "Absolute value of the new determinant: %g" % new_basis_matrix_det
@@ -836,9 +1161,6 @@ class Analyzer(object):
                     result_path = Path(
                         ilp_problem=ilp_problem, nodes=candidate_path_nodes
                     )
-                    basis_paths[current_row] = result_path
-                    current_row += 1
-                    num_paths_unsat = 0
 
                     # feasibility test
                     value = self.measure_path(
@@ -846,9 +1168,15 @@ class Analyzer(object):
                         f"gen-basis-path-replace-candid-{current_row+1}-{good_rows}",
                     )
 
+                    # The row and its basis path are replaced only once
+                    # the candidate is known to be feasible, and the loop
+                    # then moves on by one row. An infeasible candidate
+                    # leaves the row as it was, so that the next candidate
+                    # for the same row is compared against it.
                     if value < float("inf"):
                         logger.info("Replacement is feasible.")
                         is_two_barycentric = False
+                        self.basis_matrix.replace_row(current_row, compressed_path)
                         basis_paths[current_row] = result_path
                         logger.info("Row %d replaced." % (current_row + 1))
                         current_row += 1
@@ -859,15 +1187,22 @@ class Analyzer(object):
                         logger.info("Adding a constraint to exclude these edges...")
                         infeasible.append(candidate_path_edges)
                         logger.info("Constraint added.")
-                        self.basis_matrix[current_row] = prev_matrix_row
                         num_paths_unsat += 1
 
                 else:
                     logger.info("No replacement for row %d found." % (current_row + 1))
-                    self.basis_matrix[current_row] = prev_matrix_row
                     current_row += 1
                     num_paths_unsat = 0
 
+                self._save_basis_checkpoint(
+                    "refinement",
+                    basis_paths,
+                    infeasible,
+                    refinement_round=refinement_round,
+                    is_two_barycentric=is_two_barycentric,
+                    current_row=current_row,
+                    num_paths_unsat=num_paths_unsat,
+                )
                 logger.info("")
                 logger.info("")
 
@@ -885,6 +1220,10 @@ class Analyzer(object):
         subdeterminants of the basis matrix without row i and column j:
         column j corresponds to the `non-special' edge j.
 
+        All of the subdeterminants of the row are read off a single
+        factorization of the basis matrix, maintained by its
+        ``BasisMatrix`` object.
+
         Parameters:
             row: int :
                 Row to ignore.
@@ -892,65 +1231,90 @@ class Analyzer(object):
         Returns:
             List of weights as specified above.
         """
-        edges_reduced = self.dag.edges_reduced
-        edges_reduced_indices = self.dag.edges_reduced_indices
-
-        edge_weight_list = [0] * self.dag.num_edges
-
-        row_list = list(range(self.path_dimension))
-        row_list.remove(row)
-
-        for j in range(self.path_dimension):
-            col_list = list(range(self.path_dimension))
-            col_list.remove(j)
-            sub_matrix = self.basis_matrix[row_list][:, col_list]
-
-            if sub_matrix.size != 0:
-                # Compute the subdeterminant of this submatrix.
-                subdet = det(sub_matrix)
-                if ((row + j) % 2) == 1:
-                    edge_weight = -1 * subdet
-                else:
-                    edge_weight = subdet
-            else:
-                # Special case of a 1x1 matrix, or of code under analysis
-                # with only one path that goes through.
-                edge_weight = 1
-
-            # Assign this edge weight to the proper `non-special' edge.
-            edge_weight_list[edges_reduced_indices[edges_reduced[j]]] = edge_weight
-
-        return edge_weight_list
-
-    def estimate_edge_weights(self):
+        # Special case of a 1x1 matrix, or of code under analysis
+        # with only one path that goes through, is handled by the engine:
+        # the cofactor of a 1x1 matrix is 1.
+        cofactors = self.basis_matrix.cofactors(row)
+
+        # Assign each edge weight to the proper `non-special' edge.
+        return self.path_encoder.expand(cofactors)
+
+    def estimate_edge_weights(
+        self,
+        basis_values: Optional[np.ndarray] = None,
+        labels: Optional[List[str]] = None,
+    ) -> EdgeWeights:
         """
         Estimates the weights on the edges of the DAG, using the values
-        of the basis "Path" objects. The result is stored in the instance
-        variable "edgeWeights".
+        of the basis "Path" objects. The weights for every column of
+        values are solved for at once, against the factorization of
+        the basis matrix that is maintained during basis generation.
+
+        The weights estimated from the first column are also stored in
+        the instance variable "reduced_edge_weights" and, for all of
+        the edges, in the edge weights of the DAG.
 
         Precondition: The basis paths have been generated and have values.
+
+        Parameters:
+            basis_values: Optional[np.ndarray] :
+                Matrix whose element (i, j) is value j of basis path i,
+                such as the value of repetition j of its measurement, or
+                its value on backend j. By default, the only column is
+                the measured values of the basis paths.
+            labels: Optional[List[str]] :
+                Labels of the columns of values, if any.
+
+        Returns:
+            Weights on the edges of the DAG, with one column for
+            each column of values.
         """
         self.dag.reset_edge_weights()
 
-        basis_values = [basis_path.measured_value for basis_path in self.basis_paths]
+        if basis_values is None:
+            basis_values = [
+                basis_path.measured_value for basis_path in self.basis_paths
+            ]
+        basis_values = np.asarray(basis_values, dtype=float)
+        if basis_values.ndim == 1:
+            basis_values = basis_values.reshape(-1, 1)
         # By default, we assume a value of 0 for each of the rows in
         # the basis matrix that no replacement could be found for
         # (the `bad' rows in the basis matrix).
-        basis_values += [0] * (self.path_dimension - len(basis_values))
+        values = np.zeros((self.path_dimension, basis_values.shape[1]))
+        values[: basis_values.shape[0]] = basis_values
 
         # Estimate the weights on the `non-special' edges of the graph.
         logger.info("Estimating the weights on the `non-special' edges...")
-        reduced_edge_weights = dot(inv(self.basis_matrix), basis_values)
+        edge_weights = EdgeWeights(
+            self.basis_matrix.solve(values), self.path_encoder, labels
+        )
+        self.reduced_edge_weights = edge_weights.reduced_column(0)
         logger.info("Weights estimated.")
 
         # Generate the list of edge weights that the integer linear
         # programming problem will use.
         logger.info("Generating the list of weights on all_temp_files edges...")
-        for reduced_edge_index, reduced_edge in enumerate(self.dag.edges_reduced):
-            self.dag.edge_weights[self.dag.edges_reduced_indices[reduced_edge]] = (
-                reduced_edge_weights[reduced_edge_index]
-            )
+        self.dag.edge_weights = edge_weights.column(0)
         logger.info("List generated.")
+        return edge_weights
+
+    def predict_path_values(self, paths: List[List[str]]) -> np.ndarray:
+        """
+        Predicts the values of the paths provided from the weights on
+        the `non-special' edges of the DAG.
+
+        Precondition: The edge weights have been estimated.
+
+        Parameters:
+            paths: List[List[str]] :
+                Paths, each of which is a list of the nodes along the path,
+                in order of traversal.
+
+        Returns:
+            Array whose element i is the predicted value of path i.
+        """
+        return self.path_encoder.sparse_rows(paths) @ self.reduced_edge_weights
 
     def generate_paths(self, *args, **kwargs):
         return PathGenerator.generate_paths(self, *args, **kwargs)
@@ -962,6 +1326,223 @@ class Analyzer(object):
             p: Path = self.basis_paths[i]
             self.measure_path(p, f"basis_path{i}")
 
+    def _replace_rows_speculatively(
+        self,
+        basis_paths: List[Path],
+        infeasible: List[List[Tuple[str, str]]],
+        current_row: int = 0,
+        attempt: int = 0,
+    ) -> int:
+        """
+        Replaces the rows of the basis matrix with feasible paths, like
+        the first loop of ``generate_basis_paths``, but finds candidate paths
+        for up to ``NUM_JOBS`` rows at a time, against the same basis matrix,
+        and checks their feasibility concurrently in a pool of processes.
+
+        The candidates are then committed in row order. Once a row has
+        been replaced, or moved to the bottom, the candidates after it
+        were found against an older basis matrix, so the candidate path of
+        each one is found again against the current matrix, which is much
+        cheaper than checking its feasibility. A candidate that differs
+        from the one found again, or an infeasible candidate, ends
+        the batch, and the next batch starts from the first row that
+        was not committed, so that the rows are replaced with the same
+        paths as in the first loop of ``generate_basis_paths``.
+        The results of feasibility checks are kept across batches,
+        so that a candidate that is found again is not checked again.
+
+        Paths are measured one at a time, in this process, so that
+        measurements do not interfere with one another.
+
+        Parameters:
+            basis_paths: List[Path] :
+                List of basis paths, to which the feasible candidates
+                are appended.
+            infeasible: List[List[Tuple[str, str]]] :
+                List of the edges of infeasible paths, to which
+                the infeasible candidates are appended.
+            current_row: int :
+                Index of the first row to replace.
+            attempt: int :
+                Number of candidate paths checked so far, which is used
+                to name the paths.
+
+        Returns:
+            Index of the first row after the rows that were replaced,
+            which is also the index of the first `bad' row.
+        """
+        num_jobs = self.project_config.NUM_JOBS
+        DETERMINANT_THRESHOLD = self.project_config.DETERMINANT_THRESHOLD
+        MAX_INFEASIBLE_PATHS = self.project_config.MAX_INFEASIBLE_PATHS
+
+        # Number of infeasible candidates found for each row, keyed by
+        # the storage position of the row in the basis matrix, which,
+        # unlike its index, does not change when rows are moved.
+        num_paths_unsat = {}
+        # Feasibility checks submitted so far, keyed by the nodes of
+        # the candidate path, with the objects needed to measure it.
+        checks = {}
+
+        def is_bad(sign: float, log_det: float) -> bool:
+            return (sign == 0 and log_det == float("-inf")) or exp(
+                log_det
+            ) < DETERMINANT_THRESHOLD
+
+        def save_checkpoint():
+            self._save_basis_checkpoint(
+                "initial",
+                basis_paths,
+                infeasible,
+                current_row=current_row,
+                num_paths_unsat=0,
+                attempt=attempt,
+            )
+
+        def submit_check(row: int, candidate_path_nodes: List[str], ilp_problem):
+            nonlocal attempt
+            key = tuple(candidate_path_nodes)
+            if key in checks:
+                return
+            result_path = Path(ilp_problem=ilp_problem, nodes=candidate_path_nodes)
+            path_name = f"gen-basis-path-row{row}-attempt{attempt}"
+            attempt += 1
+            path_analyzer = PathAnalyzer(
+                self.preprocessed_path,
+                self.project_config,
+                self.dag,
+                result_path,
+                path_name,
+            )
+            future = path_analyzer.submit_feasibility_check(executor)
+            checks[key] = (result_path, path_name, path_analyzer, future)
+
+        with ProcessPoolExecutor(max_workers=num_jobs) as executor:
+            while current_row < (self.path_dimension - self.num_bad_rows):
+                last_row = min(
+                    current_row + num_jobs, self.path_dimension - self.num_bad_rows
+                )
+                logger.info(
+                    "Currently at rows %d to %d..." % (current_row + 1, last_row)
+                )
+                logger.info(
+                    "So far, the bottom %d rows of the basis matrix are `bad'."
+                    % self.num_bad_rows
+                )
+                logger.info("")
+
+                logger.info(
+                    "Finding candidate paths for %d rows..." % (last_row - current_row)
+                )
+                candidates = []
+                for row in range(current_row, last_row):
+                    self.dag.reset_edge_weights()
+                    self.dag.edge_weights = self._calculate_subdets(row)
+                    candidate_path_nodes, ilp_problem = pulp_helper.find_extreme_path(
+                        self
+                    )
+                    candidates.append((row, candidate_path_nodes, ilp_problem))
+
+                    if ilp_problem.obj_val is None:
+                        continue
+                    sign, log_det = self.basis_matrix.replacement_log_det(
+                        row, self.path_encoder.dense(candidate_path_nodes)
+                    )
+                    if not is_bad(sign, log_det):
+                        submit_check(row, candidate_path_nodes, ilp_problem)
+                logger.info("Checking feasibility of the candidates concurrently...")
+                logger.info("")
+
+                for index, (row, candidate_path_nodes, ilp_problem) in enumerate(
+                    candidates
+                ):
+                    # Every candidate before this one either replaced its row,
+                    # or was moved to the bottom, so this candidate is for
+                    # the row at the current index.
+                    position = self.basis_matrix.order[current_row]
+                    unsat = num_paths_unsat.get(position, 0)
+
+                    if index > 0:
+                        # The basis matrix has changed since the candidate
+                        # was found, so the candidate that the row gets
+                        # from the current matrix is found again.
+                        self.dag.reset_edge_weights()
+                        self.dag.edge_weights = self._calculate_subdets(current_row)
+                        current_nodes, current_problem = pulp_helper.find_extreme_path(
+                            self
+                        )
+                        if (current_problem.obj_val is None) != (
+                            ilp_problem.obj_val is None
+                        ) or current_nodes != candidate_path_nodes:
+                            logger.info("Basis matrix has changed; retrying the row.")
+                            break
+                        ilp_problem = current_problem
+
+                    if ilp_problem.obj_val is None:
+                        logger.info(
+                            "Unable to find a candidate path to replace row %d."
+                            % (current_row + 1)
+                        )
+                        logger.info(
+                            "Moving the bad row to the bottom of the basis matrix."
+                        )
+                        self.basis_matrix.move_row_to_bottom(current_row)
+                        self.num_bad_rows += 1
+                        save_checkpoint()
+                        continue
+
+                    compressed_path = self.path_encoder.dense(candidate_path_nodes)
+                    sign, log_det = self.basis_matrix.replacement_log_det(
+                        current_row, compressed_path
+                    )
+                    logger.info(
+                        "Absolute value of the new determinant for row %d: %g"
+                        % (current_row + 1, exp(log_det))
+                    )
+                    if is_bad(sign, log_det) or unsat >= MAX_INFEASIBLE_PATHS:
+                        logger.info(
+                            "Moving the bad row to the bottom of the basis matrix."
+                        )
+                        self.basis_matrix.move_row_to_bottom(current_row)
+                        self.num_bad_rows += 1
+                        save_checkpoint()
+                        continue
+
+                    # A candidate that was too small to be checked against
+                    # the older basis matrix may be large enough now.
+                    submit_check(current_row, candidate_path_nodes, ilp_problem)
+                    result_path, path_name, path_analyzer, future = checks[
+                        tuple(candidate_path_nodes)
+                    ]
+                    path_analyzer.set_feasibility(future.result())
+                    if path_analyzer.is_valid:
+                        logger.info("Replacement is feasible.")
+                        result_path.path_analyzer = path_analyzer
+                        result_path.name = path_name
+                        value = path_analyzer.measure_path(self.backend)
+                        result_path.set_measured_value(
+                            max(result_path.measured_value, value)
+                        )
+                        logger.info("Row %d replaced." % (current_row + 1))
+                        self.basis_matrix.replace_row(current_row, compressed_path)
+                        basis_paths.append(result_path)
+                        current_row += 1
+                        save_checkpoint()
+                    else:
+                        logger.info("Replacement is infeasible.")
+                        logger.info("Adding a constraint to exclude these edges...")
+                        candidate_path_edges = Dag.get_edges(candidate_path_nodes)
+                        self.add_path_exclusive_constraint(candidate_path_edges)
+                        infeasible.append(candidate_path_edges)
+                        logger.info("Constraint added.")
+                        num_paths_unsat[position] = unsat + 1
+                        save_checkpoint()
+                        # The candidates after this one were found without
+                        # the new constraint, and against a row that has
+                        # not been replaced.
+                        break
+                logger.info("")
+        return current_row
+
     def measure_path(self, path: Path, output_name: str) -> int:
         """
         Measure the Path if never measured before. If no name was set, the parameter output_name is used.
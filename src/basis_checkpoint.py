@@ -0,0 +1,232 @@
+#!/usr/bin/env python
+
+"""Exposes functions to save the state of basis generation to a file, and
+to restore it from the file, so that an interrupted generation of
+the basis paths can be resumed without repeating the feasibility checks
+and measurements that were already done.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import collections
+import hashlib
+import json
+import os
+
+import scipy.sparse
+
+from defaults import logger
+from incremental_basis import block_hashes
+from nx_helper import Dag
+from path import Path
+
+#: Version of the format of checkpoint files. Checkpoints of
+#: a different version are ignored.
+CHECKPOINT_VERSION = 3
+
+
+class NodeIdentities(object):
+    """
+    Identifies the nodes of a DAG independently of their names, so that
+    a checkpoint saved for the DAG of one run of GameTime can be restored
+    for the DAG of another run on the same code. The names of the nodes
+    that ``opt`` writes are the addresses of the basic blocks in memory,
+    which change every time that the code is preprocessed again.
+
+    A node is identified by the hash of its normalized basic block, as
+    computed by `block_hashes` of the ``incremental_basis`` module,
+    followed by the number of nodes with the same hash that come before it
+    in the DAG, in the order in which they appear in the DOT file, which
+    tells apart identical blocks, such as those of an unrolled loop.
+
+    Parameters:
+        dag: Dag :
+            DAG whose nodes are identified.
+    """
+
+    def __init__(self, dag: Dag):
+        hashes = block_hashes(dag)
+        counts = collections.Counter()
+
+        #: DAG whose nodes are identified.
+        self.dag: Dag = dag
+
+        #: Dictionary that maps each node of the DAG to its identifier.
+        self.ids: Dict[str, str] = {}
+        for node in dag.nodes:
+            self.ids[node] = "%s:%d" % (hashes[node], counts[hashes[node]])
+            counts[hashes[node]] += 1
+
+        #: Dictionary that maps each identifier to the node of the DAG
+        #: that it identifies.
+        self.nodes: Dict[str, str] = {
+            node_id: node for node, node_id in self.ids.items()
+        }
+
+        #: Hash of the identifiers of the nodes and of the edges of the DAG,
+        #: and of the order of its `non-special' edges, which determines
+        #: the columns of the basis matrix. A checkpoint is only valid for
+        #: a DAG with the same fingerprint as the DAG it was saved for.
+        self.fingerprint: str = hashlib.sha256(
+            json.dumps(
+                [
+                    sorted(self.ids.values()),
+                    sorted(self.edges_to_list(dag.all_edges)),
+                    self.edges_to_list(dag.edges_reduced),
+                ]
+            ).encode()
+        ).hexdigest()
+
+    def edges_to_list(self, edges: Iterable[Tuple[str, str]]) -> List[List[str]]:
+        """
+        Parameters:
+            edges: Iterable[Tuple[str, str]] :
+                Edges to save.
+
+        Returns:
+            List of edges, each of which is a list of the identifiers of
+            its nodes, which can be written to a JSON file.
+        """
+        return [[self.ids[source], self.ids[sink]] for source, sink in edges]
+
+    def edges_from_list(self, edges: List[List[str]]) -> List[Tuple[str, str]]:
+        """
+        Parameters:
+            edges: List[List[str]] :
+                List returned by `edges_to_list`.
+
+        Returns:
+            List of edges of the DAG, each of which is a tuple.
+        """
+        return [(self.nodes[source], self.nodes[sink]) for source, sink in edges]
+
+    def path_to_dict(self, path: Path) -> Dict[str, Any]:
+        """
+        Parameters:
+            path: Path :
+                Path to save.
+
+        Returns:
+            Dictionary with the name, the identifiers of the nodes and
+            the values of the path, which can be written to a JSON file.
+        """
+        return {
+            "name": path.name,
+            "nodes": [self.ids[node] for node in path.nodes],
+            "measured_value": path.measured_value,
+            "predicted_value": path.predicted_value,
+        }
+
+    def path_from_dict(self, path_dict: Dict[str, Any]) -> Path:
+        """
+        Parameters:
+            path_dict: Dict[str, Any] :
+                Dictionary returned by `path_to_dict`.
+
+        Returns:
+            Path through the DAG with the name, nodes and values saved in
+            the dictionary.
+        """
+        path = Path(
+            nodes=[self.nodes[node_id] for node_id in path_dict["nodes"]],
+            measured_value=path_dict["measured_value"],
+            predicted_value=path_dict["predicted_value"],
+        )
+        path.name = path_dict["name"]
+        return path
+
+
+def sparse_to_dict(matrix: scipy.sparse.csr_matrix) -> Dict[str, Any]:
+    """
+    Parameters:
+        matrix: scipy.sparse.csr_matrix :
+            Sparse matrix to save, such as the basis matrix.
+
+    Returns:
+        Dictionary with the shape and the compressed rows of the matrix,
+        which can be written to a JSON file. Its size is proportional to
+        the number of nonzero entries of the matrix.
+    """
+    return {
+        "shape": list(matrix.shape),
+        "data": matrix.data.tolist(),
+        "indices": matrix.indices.tolist(),
+        "indptr": matrix.indptr.tolist(),
+    }
+
+
+def sparse_from_dict(matrix_dict: Dict[str, Any]) -> scipy.sparse.csr_matrix:
+    """
+    Parameters:
+        matrix_dict: Dict[str, Any] :
+            Dictionary returned by `sparse_to_dict`.
+
+    Returns:
+        Sparse matrix saved in the dictionary.
+    """
+    return scipy.sparse.csr_matrix(
+        (matrix_dict["data"], matrix_dict["indices"], matrix_dict["indptr"]),
+        shape=tuple(matrix_dict["shape"]),
+    )
+
+
+def write_checkpoint(location: str, checkpoint: Dict[str, Any]) -> None:
+    """
+    Writes a checkpoint to a JSON file. The file is replaced atomically,
+    so that an interruption while writing leaves the previous
+    checkpoint intact.
+
+    Parameters:
+        location: str :
+            Location of the file to write.
+        checkpoint: Dict[str, Any] :
+            Checkpoint to write. The current checkpoint version is added.
+    """
+    checkpoint = dict(checkpoint, version=CHECKPOINT_VERSION)
+    temp_location = "%s.tmp" % location
+    with open(temp_location, "w") as checkpoint_file:
+        json.dump(checkpoint, checkpoint_file)
+    os.replace(temp_location, location)
+
+
+def read_checkpoint(
+    location: str, identities: NodeIdentities
+) -> Optional[Dict[str, Any]]:
+    """
+    Reads a checkpoint from a JSON file written by `write_checkpoint`.
+
+    Parameters:
+        location: str :
+            Location of the file to read.
+        identities: NodeIdentities :
+            Identities of the nodes of the DAG for which the checkpoint
+            is needed.
+
+    Returns:
+        Checkpoint read from the file, or None if there is no file,
+        or if the checkpoint in the file was saved by a different version
+        of GameTime or for a different DAG.
+    """
+    if not os.path.exists(location):
+        logger.info("No checkpoint found at %s." % location)
+        return None
+    try:
+        with open(location, "r") as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+    except (OSError, ValueError) as e:
+        logger.warning("Unable to read the checkpoint at %s: %s" % (location, e))
+        return None
+
+    if checkpoint.get("version") != CHECKPOINT_VERSION:
+        logger.warning("Ignoring checkpoint with a different version: %s" % location)
+        return None
+    if checkpoint.get("dag_fingerprint") != identities.fingerprint:
+        logger.warning("Ignoring checkpoint for a different DAG: %s" % location)
+        return None
+    return checkpoint
@@ -0,0 +1,585 @@
+#!/usr/bin/env python
+
+"""Exposes classes to maintain a factorization of the basis matrix, so that
+the subdeterminants used as edge weights during basis generation can be
+computed without recomputing a determinant for every minor. The matrix
+can be stored either densely, or, for large path dimensions, sparsely.
+"""
+
+from typing import List, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import warnings
+
+import numpy as np
+import scipy.sparse
+
+from numpy.linalg import det, slogdet
+from scipy.linalg import LinAlgWarning, lu_factor, lu_solve
+from scipy.sparse.linalg import splu
+
+
+def minor_cofactors(matrix: np.ndarray, row: int) -> np.ndarray:
+    """
+    Computes the cofactors of a row of the matrix provided directly from
+    the minors of the matrix, with one determinant per column. This is
+    slow, but works even if the matrix is singular.
+
+    Parameters:
+        matrix: np.ndarray :
+            Square matrix whose cofactors are needed.
+        row: int :
+            Row whose cofactors are needed.
+
+    Returns:
+        Array whose element j is the cofactor of the matrix at (row, j).
+    """
+    dimension = matrix.shape[0]
+    row_list = [i for i in range(dimension) if i != row]
+    cofactors = np.ones(dimension)
+    for j in range(dimension):
+        col_list = [i for i in range(dimension) if i != j]
+        sub_matrix = matrix[row_list][:, col_list]
+        if sub_matrix.size != 0:
+            subdet = det(sub_matrix)
+            cofactors[j] = -subdet if ((row + j) % 2) == 1 else subdet
+    return cofactors
+
+
+def permutation_sign(permutation: np.ndarray) -> float:
+    """
+    Parameters:
+        permutation: np.ndarray :
+            Permutation of the integers from 0 to n - 1.
+
+    Returns:
+        Sign of the permutation, which is (-1)^(n - c), where c is
+        the number of cycles of the permutation.
+    """
+    num_cycles, visited = 0, np.zeros(len(permutation), dtype=bool)
+    for start in range(len(permutation)):
+        if not visited[start]:
+            num_cycles += 1
+            position = start
+            while not visited[position]:
+                visited[position] = True
+                position = permutation[position]
+    return -1.0 if (len(permutation) - num_cycles) % 2 == 1 else 1.0
+
+
+class BasisMatrix(object):
+    """
+    Maintains the basis matrix, whose rows are the 0-1 vectors of
+    the basis paths, together with an LU factorization of the matrix,
+    the rank-one (Sherman-Morrison) corrections for the rows that have
+    been replaced since the matrix was last factorized, and the logarithm
+    of the absolute value of its determinant.
+
+    The cofactors of row ``r`` are the entries of column ``r`` of
+    the adjugate, that is, ``det(M) * inv(M)[:, r]``. All of them are
+    obtained from a single solve against the factorization, instead of
+    one determinant per minor. By the matrix determinant lemma, the same
+    solve also gives the determinant of the matrix with row ``r``
+    replaced, without touching the matrix.
+
+    The rows are stored, and factorized, in the order in which they were
+    first given. The order in which the rest of GameTime sees them is kept
+    in a separate permutation index, so that reordering rows is bookkeeping
+    on that index alone: neither the rows nor the factorization are moved.
+
+    Parameters:
+        matrix:
+            Initial value of the basis matrix. This object keeps
+            its own copy.
+        max_updates:
+            Number of rank-one updates after which the matrix is
+            refactorized from scratch, to bound both the cost of a solve
+            and the accumulation of rounding errors.
+    """
+
+    def __init__(self, matrix, max_updates: int = 32):
+        # Rows of the basis matrix, in storage order.
+        self._rows = self._as_rows(matrix)
+
+        #: Permutation index of the rows: row i of the basis matrix is
+        #: the row stored at position ``order[i]``.
+        self.order: np.ndarray = np.arange(self._rows.shape[0])
+
+        #: Number of rank-one updates after which to refactorize.
+        self.max_updates: int = max_updates
+
+        # Sign of the permutation in `order`.
+        self._order_sign: float = 1.0
+
+        # Sign of the determinant of the rows, in storage order.
+        self._sign: float = 0.0
+
+        # Natural logarithm of the absolute value of the determinant.
+        self._log_det: float = float("-inf")
+
+        # LU factorization of the rows, in storage order, at the time of
+        # the last refactorization, as returned by `_factorize`.
+        # None if the rows were singular.
+        self._lu = None
+
+        # Rank-one corrections applied since the last refactorization.
+        # Each element is a tuple (y, u, denominator), where the row update
+        # M' = M + e_r u^T has inv(M) e_r = y and 1 + u^T y = denominator.
+        self._updates: List[Tuple[np.ndarray, np.ndarray, float]] = []
+
+        # Whether the rows were changed in a way that the factorization
+        # does not account for, so that it must be refactorized before use.
+        self._stale: bool = True
+
+    @classmethod
+    def restore(cls, matrix, order: np.ndarray, max_updates: int = 32):
+        """
+        Creates a basis matrix from its rows and its permutation index,
+        such as those saved in a checkpoint, so that the rows are stored,
+        and factorized, in the same order as in the saved matrix.
+
+        Parameters:
+            matrix :
+                Value of the basis matrix, with its rows in order, as
+                a dense array or a sparse matrix.
+            order: np.ndarray :
+                Permutation index of the rows: row i of the matrix is
+                stored at position ``order[i]``.
+            max_updates: int :
+                Number of rank-one updates after which to refactorize.
+
+        Returns:
+            Basis matrix with the rows and the permutation index provided.
+        """
+        order = np.array(order, dtype=int)
+        # Row j of the stored rows is row i of the matrix, where order[i] = j.
+        rows = matrix[np.argsort(order)]
+        basis_matrix = cls(rows, max_updates)
+        basis_matrix.order = order
+        basis_matrix._order_sign = permutation_sign(order)
+        return basis_matrix
+
+    def __str__(self):
+        return str(self.matrix)
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Copy of the basis matrix, with its rows in order."""
+        return self._rows[self.order]
+
+    @property
+    def sparse_matrix(self) -> scipy.sparse.csr_matrix:
+        """Copy of the basis matrix, with its rows in order, as a sparse matrix."""
+        return scipy.sparse.csr_matrix(self.matrix)
+
+    @property
+    def dimension(self) -> int:
+        """Number of rows (and columns) of the matrix."""
+        return self._rows.shape[0]
+
+    @property
+    def sign(self) -> float:
+        """Sign of the determinant of the matrix: 1, -1 or 0."""
+        self._ensure_factorized()
+        return self._order_sign * self._sign
+
+    @property
+    def log_det(self) -> float:
+        """Natural logarithm of the absolute value of the determinant."""
+        self._ensure_factorized()
+        return self._log_det
+
+    @property
+    def is_singular(self) -> bool:
+        """`True` if, and only if, the matrix is singular."""
+        return self.sign == 0.0
+
+    def row(self, i: int) -> np.ndarray:
+        """
+        Parameters:
+            i: int :
+                Index of a row.
+
+        Returns:
+            Values of row ``i`` of the basis matrix.
+        """
+        return self._stored_row(self.order[i])
+
+    def _ensure_factorized(self):
+        """Refactorizes the matrix if the factorization is out of date."""
+        if self._stale:
+            self.refactor()
+
+    def refactor(self):
+        """
+        Recomputes the LU factorization of the matrix from scratch,
+        discarding any rank-one corrections.
+        """
+        self._updates = []
+        self._stale = False
+        if self.dimension == 0:
+            self._lu, self._sign, self._log_det = None, 1.0, 0.0
+            return
+        self._lu, self._sign, self._log_det = self._factorize()
+
+    @staticmethod
+    def _as_rows(matrix) -> np.ndarray:
+        """
+        Parameters:
+            matrix :
+                Value of a matrix, as a dense array or a sparse matrix.
+
+        Returns:
+            Copy of the matrix in the form in which rows are stored.
+        """
+        if scipy.sparse.issparse(matrix):
+            return matrix.toarray().astype(float)
+        return np.array(matrix, dtype=float)
+
+    def _stored_row(self, position: int) -> np.ndarray:
+        """
+        Parameters:
+            position: int :
+                Storage position of a row.
+
+        Returns:
+            Dense copy of the values of the row.
+        """
+        return self._rows[position].copy()
+
+    def _set_stored_row(self, position: int, values: np.ndarray):
+        """
+        Parameters:
+            position: int :
+                Storage position of a row.
+            values: np.ndarray :
+                New values of the row.
+        """
+        self._rows[position] = values
+
+    def _factorize(self) -> Tuple[object, float, float]:
+        """
+        Computes an LU factorization of the rows, in storage order.
+
+        Returns:
+            Tuple of the factorization, which is None if the rows are
+            singular, the sign of the determinant of the rows, and
+            the natural logarithm of its absolute value.
+        """
+        with np.errstate(divide="ignore", invalid="ignore"):
+            with warnings.catch_warnings():
+                # Singular matrices are detected below, from the diagonal of U.
+                warnings.simplefilter("ignore", LinAlgWarning)
+                lu, piv = lu_factor(self._rows, check_finite=False)
+        diagonal = np.diag(lu)
+        if not np.all(np.isfinite(diagonal)) or np.any(diagonal == 0.0):
+            return None, 0.0, float("-inf")
+        num_swaps = np.count_nonzero(piv != np.arange(self.dimension))
+        sign = float(np.prod(np.sign(diagonal)) * (-1) ** num_swaps)
+        log_det = float(np.sum(np.log(np.abs(diagonal))))
+        return (lu, piv), sign, log_det
+
+    def _lu_solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves a system against the factorization, without
+        the rank-one corrections.
+
+        Parameters:
+            b: np.ndarray :
+                Right-hand side of the system, in storage order.
+
+        Returns:
+            Solution of the system.
+        """
+        return lu_solve(self._lu, b, check_finite=False)
+
+    def _solve_stored(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves ``M x = b``, where ``M`` has the rows in storage order.
+
+        Parameters:
+            b: np.ndarray :
+                Right-hand side of the system, in storage order: either
+                a vector, or a matrix with one right-hand side per column.
+
+        Returns:
+            Solution of the system, with the same shape as ``b``.
+        """
+        self._ensure_factorized()
+        x = self._lu_solve(b)
+        for y, u, denominator in self._updates:
+            x = x - np.multiply.outer(y, np.dot(u, x) / denominator)
+        return x
+
+    def _stored_unit_solve(self, position: int) -> np.ndarray:
+        """
+        Parameters:
+            position: int :
+                Storage position of a row.
+
+        Returns:
+            Column ``position`` of the inverse of the rows in storage order.
+        """
+        unit = np.zeros(self.dimension)
+        unit[position] = 1.0
+        return self._solve_stored(unit)
+
+    def solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves ``M x = b`` for the current matrix ``M``, using
+        the factorization and the rank-one corrections. All of
+        the right-hand sides in the columns of ``b`` are solved for
+        at once, against the same factorization.
+
+        Precondition: The matrix is not singular.
+
+        Parameters:
+            b: np.ndarray :
+                Right-hand side of the system: either a vector, or
+                a matrix with one right-hand side per column.
+
+        Returns:
+            Solution of the system, with the same shape as ``b``.
+        """
+        b = np.asarray(b, dtype=float)
+        stored_b = np.empty(b.shape)
+        stored_b[self.order] = b
+        return self._solve_stored(stored_b)
+
+    def cofactors(self, row: int) -> np.ndarray:
+        """
+        Parameters:
+            row: int :
+                Row whose cofactors are needed.
+
+        Returns:
+            Array whose element j is the cofactor of the matrix at (row, j),
+            that is, the determinant of the matrix without row ``row`` and
+            column j, multiplied by (-1)^(row + j).
+        """
+        if self.is_singular:
+            return minor_cofactors(self.matrix, row)
+        return (
+            self.sign * np.exp(self._log_det) * self._stored_unit_solve(self.order[row])
+        )
+
+    def replacement_log_det(self, row: int, new_row: np.ndarray) -> Tuple[float, float]:
+        """
+        Computes the determinant that the matrix would have if a row were
+        replaced, without replacing it. By the matrix determinant lemma,
+        ``det(M + e_r u^T) = det(M) (1 + u^T inv(M) e_r)``, which needs only
+        one solve against the factorization.
+
+        Parameters:
+            row: int :
+                Index of the row to replace.
+            new_row: np.ndarray :
+                Values of the new row.
+
+        Returns:
+            Tuple whose first element is the sign of the determinant of
+            the matrix with the row replaced, and whose second element is
+            the natural logarithm of its absolute value, as returned by
+            :func:`~numpy.linalg.slogdet`.
+        """
+        new_row = np.asarray(new_row, dtype=float)
+        if self.is_singular:
+            candidate = self.matrix
+            candidate[row] = new_row
+            sign, log_det = slogdet(candidate)
+            return float(sign), float(log_det)
+
+        position = self.order[row]
+        u = new_row - self._stored_row(position)
+        denominator = 1.0 + np.dot(u, self._stored_unit_solve(position))
+        if denominator == 0.0:
+            return 0.0, float("-inf")
+        return (
+            self.sign * float(np.sign(denominator)),
+            self._log_det + float(np.log(np.abs(denominator))),
+        )
+
+    def replace_row(self, row: int, new_row: np.ndarray):
+        """
+        Replaces a row of the matrix and updates the factorization with
+        a Sherman-Morrison rank-one correction, rather than refactorizing.
+
+        Parameters:
+            row: int :
+                Index of the row to replace.
+            new_row: np.ndarray :
+                Values of the new row.
+        """
+        new_row = np.asarray(new_row, dtype=float)
+        position = self.order[row]
+        if self._stale or self.is_singular or len(self._updates) >= self.max_updates:
+            self._set_stored_row(position, new_row)
+            self.refactor()
+            return
+
+        u = new_row - self._stored_row(position)
+        y = self._stored_unit_solve(position)
+        denominator = 1.0 + np.dot(u, y)
+        self._set_stored_row(position, new_row)
+        if denominator == 0.0:
+            # The new matrix is singular: there is nothing to update.
+            self.refactor()
+            return
+        self._updates.append((y, u, denominator))
+        self._sign *= float(np.sign(denominator))
+        self._log_det += float(np.log(np.abs(denominator)))
+
+    def swap_rows(self, i: int, j: int):
+        """
+        Swaps two rows of the matrix, by swapping their entries in
+        the permutation index.
+
+        Parameters:
+            i: int :
+                Index of one row to swap.
+            j: int :
+                Index of other row to swap.
+        """
+        if i != j:
+            self.order[i], self.order[j] = self.order[j], self.order[i]
+            self._order_sign = -self._order_sign
+
+    def move_row_to_bottom(self, row: int):
+        """
+        Moves a row to the bottom of the matrix, shifting the rows below
+        it up by one, by rotating the tail of the permutation index.
+
+        Parameters:
+            row: int :
+                Index of the row to move.
+        """
+        # The rotation is a cycle of length (dimension - row), which is
+        # the product of (dimension - row - 1) transpositions.
+        self.order[row:] = np.roll(self.order[row:], -1)
+        if (self.dimension - row - 1) % 2 == 1:
+            self._order_sign = -self._order_sign
+
+
+class SparseBasisMatrix(BasisMatrix):
+    """
+    Maintains the basis matrix like ``BasisMatrix``, but stores its rows
+    in a sparse matrix and factorizes them with a sparse LU factorization
+    (SuperLU), rather than a dense one.
+
+    The rows of the basis matrix are the 0-1 vectors of basis paths,
+    which, for large functions, have few nonzero entries compared to
+    the path dimension. Then, the sparse factorization needs far less
+    memory and time than the dense one, which is quadratic in memory
+    and cubic in time in the path dimension. Rank-one corrections,
+    cofactors, solves and determinants work as in ``BasisMatrix``.
+
+    If the matrix is singular, which can only happen if rows are replaced
+    with rows that are linearly dependent on the others, the cofactors and
+    determinants are computed densely, as in ``BasisMatrix``.
+
+    Parameters:
+        matrix:
+            Initial value of the basis matrix, as a dense array or
+            a sparse matrix. This object keeps its own copy.
+        max_updates:
+            Number of rank-one updates after which the matrix is
+            refactorized from scratch.
+    """
+
+    def __str__(self):
+        return "%dx%d sparse basis matrix with %d nonzero entries" % (
+            self.dimension,
+            self.dimension,
+            self._rows.nnz,
+        )
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """Dense copy of the basis matrix, with its rows in order."""
+        return self.sparse_matrix.toarray()
+
+    @property
+    def sparse_matrix(self) -> scipy.sparse.csr_matrix:
+        """Copy of the basis matrix, with its rows in order, as a sparse matrix."""
+        return self._rows.tocsr()[self.order]
+
+    @staticmethod
+    def _as_rows(matrix) -> scipy.sparse.lil_matrix:
+        """
+        Parameters:
+            matrix :
+                Value of a matrix, as a dense array or a sparse matrix.
+
+        Returns:
+            Copy of the matrix in the form in which rows are stored,
+            which is a sparse matrix whose rows can be replaced cheaply.
+        """
+        return scipy.sparse.lil_matrix(matrix, dtype=float)
+
+    def _stored_row(self, position: int) -> np.ndarray:
+        """
+        Parameters:
+            position: int :
+                Storage position of a row.
+
+        Returns:
+            Dense copy of the values of the row.
+        """
+        return self._rows[position].toarray().ravel()
+
+    def _set_stored_row(self, position: int, values: np.ndarray):
+        """
+        Parameters:
+            position: int :
+                Storage position of a row.
+            values: np.ndarray :
+                New values of the row.
+        """
+        columns = np.flatnonzero(values)
+        self._rows.rows[position] = columns.tolist()
+        self._rows.data[position] = values[columns].tolist()
+
+    def _factorize(self) -> Tuple[object, float, float]:
+        """
+        Computes a sparse LU factorization of the rows, in storage order.
+
+        Returns:
+            Tuple of the factorization, which is None if the rows are
+            singular, the sign of the determinant of the rows, and
+            the natural logarithm of its absolute value.
+        """
+        try:
+            lu = splu(self._rows.tocsc())
+        except RuntimeError:
+            # SuperLU reports exactly singular matrices with a RuntimeError.
+            return None, 0.0, float("-inf")
+        diagonal = lu.U.diagonal()
+        if not np.all(np.isfinite(diagonal)) or np.any(diagonal == 0.0):
+            return None, 0.0, float("-inf")
+        # The factorization is Pr A Pc = L U, where L has a unit diagonal.
+        sign = float(
+            np.prod(np.sign(diagonal))
+            * permutation_sign(lu.perm_r)
+            * permutation_sign(lu.perm_c)
+        )
+        log_det = float(np.sum(np.log(np.abs(diagonal))))
+        return lu, sign, log_det
+
+    def _lu_solve(self, b: np.ndarray) -> np.ndarray:
+        """
+        Solves a system against the sparse factorization, without
+        the rank-one corrections.
+
+        Parameters:
+            b: np.ndarray :
+                Right-hand side of the system, in storage order.
+
+        Returns:
+            Solution of the system.
+        """
+        return self._lu.solve(b)
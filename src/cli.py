@@ -15,11 +15,13 @@ from typing import Optional
 # Add the src directory to the path to allow imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import pulp_helper
 from project_configuration import ProjectConfiguration
 from project_configuration_parser import YAMLConfigurationParser
 from analyzer import Analyzer
 from defaults import logger
 from gametime_error import GameTimeError
+from ilp_cache import save_ilp_caches
 from nx_helper import write_dag_to_dot_file
 
 
@@ -57,6 +59,9 @@ def run_gametime(
     clean_temp: bool = True,
     backend: str = None,
     visualize_weights: bool = False,
+    jobs: int = None,
+    resume: bool = False,
+    incremental: bool = False,
 ) -> int:
     """
     Run GameTime analysis on the specified configuration.
@@ -68,6 +73,17 @@ def run_gametime(
             Whether to clean temporary files before running (default: True)
         backend: str
             Override backend from config (default: None, use config value)
+        jobs: int
+            Override number of concurrent feasibility checks from config
+            (default: None, use config value)
+        resume: bool
+            Whether to resume basis generation from the checkpoint of
+            a previous, interrupted run (default: False). If True,
+            the temporary directory is not cleaned.
+        incremental: bool
+            Whether to reuse the basis paths of the previous incremental
+            analysis that go through unchanged code, and to save the basis
+            paths of this analysis for the next one (default: False)
 
     Returns:
         int: Exit code (0 for success, non-zero for failure)
@@ -84,6 +100,23 @@ def run_gametime(
             logger.info(f"Overriding backend with: {backend}")
             project_config.backend = backend
 
+        # Override number of jobs if specified
+        if jobs is not None:
+            if jobs < 1:
+                raise GameTimeError(
+                    "Number of jobs must be at least 1, not %d" % jobs
+                )
+            logger.info(f"Overriding number of jobs with: {jobs}")
+            project_config.NUM_JOBS = jobs
+
+        if resume:
+            logger.info("Resuming basis generation from the last checkpoint")
+            project_config.RESUME_BASIS_GENERATION = True
+
+        if incremental:
+            logger.info("Reusing the basis paths of the previous analysis")
+            project_config.INCREMENTAL_ANALYSIS = True
+
         # Check if backend is specified
         if not project_config.backend:
             # FIXME: Why does logger.error produce duplicate messages.
@@ -95,7 +128,11 @@ def run_gametime(
             return 1
 
         # Clean temporary directory if requested
-        if clean_temp and os.path.exists(project_config.location_temp_dir):
+        if (
+            clean_temp
+            and not resume
+            and os.path.exists(project_config.location_temp_dir)
+        ):
             logger.info(
                 f"Cleaning temporary directory: {project_config.location_temp_dir}"
             )
@@ -129,6 +166,9 @@ def run_gametime(
         logger.info("Generating additional paths for analysis...")
         generated_paths = analyzer.generate_paths()
         logger.info(f"Generated {len(generated_paths)} path(s)")
+        pulp_helper.log_ilp_solver_setup_savings()
+        num_cache_hits, num_cache_misses = pulp_helper.log_ilp_cache_statistics()
+        save_ilp_caches()
 
         # Collect results from already-measured paths
         logger.info("Collecting measurement results...")
@@ -148,6 +188,9 @@ def run_gametime(
         )
         logger.info(f"Number of basis paths: {len(basis_paths)}")
         logger.info(f"Number of generated paths: {len(generated_paths)}")
+        logger.info(
+            f"ILP cache: {num_cache_hits} hit(s), {num_cache_misses} miss(es)"
+        )
 
         logger.info("\nBasis Paths:")
         for i, path in enumerate(basis_paths):
@@ -191,6 +234,9 @@ def run_gametime(
             result_file.write(
                 f"Number of generated paths: {len(generated_paths)}\n"
             )
+            result_file.write(
+                f"ILP cache: {num_cache_hits} hit(s), {num_cache_misses} miss(es)\n"
+            )
             result_file.write("\nBasis Paths:\n")
             for i, path in enumerate(basis_paths):
                 result_file.write(
@@ -293,6 +339,15 @@ Examples:
 
   # Run analysis and generate weighted graph visualization
   gametime /path/to/test/folder --visualize-weights
+
+  # Run analysis, checking up to 8 candidate basis paths concurrently
+  gametime /path/to/test/folder --jobs 8
+
+  # Resume an interrupted analysis from its last checkpoint
+  gametime /path/to/test/folder --resume
+
+  # Reanalyze edited code, reusing the basis paths through unchanged code
+  gametime /path/to/test/folder --incremental
         """,
     )
 
@@ -314,6 +369,28 @@ Examples:
         help="Backend to use for execution (overrides config file)",
     )
 
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        help="Number of candidate basis paths to check for feasibility concurrently "
+        "(overrides config file)",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume basis generation from the checkpoint of an interrupted run "
+        "(implies --no-clean)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the basis paths of the previous incremental analysis that only "
+        "go through unchanged basic blocks",
+    )
+
     parser.add_argument("--version", action="version", version="GameTime 0.1.0")
 
     parser.add_argument(
@@ -344,6 +421,9 @@ Examples:
         clean_temp=not args.no_clean,
         backend=args.backend,
         visualize_weights=args.visualize_weights,
+        jobs=args.jobs,
+        resume=args.resume,
+        incremental=args.incremental,
     )
 
     return exit_code
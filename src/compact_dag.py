@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+
+"""Exposes a class that represents a directed acyclic graph whose
+branch-free chains of edges are collapsed into single edges, and
+a function that builds it once for each DAG.
+"""
+
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import weakref
+
+import networkx as nx
+import numpy as np
+
+from nx_helper import Dag
+
+
+class CompactDag(object):
+    """
+    Represents a ``Dag`` in which each branch-free chain of edges, that is,
+    each maximal sequence of edges whose inner nodes have exactly one
+    edge in and one edge out, is collapsed into a single edge, called
+    a `chain'. Every path through the DAG takes either all or none of
+    the edges of a chain, so problems over the paths of the DAG, such as
+    finding its extreme paths, need only one variable for each chain.
+
+    The mapping between the edges of the DAG and the chains is kept in
+    arrays: a forward array that maps the position of each edge, in
+    the list of all edges of the DAG, to its chain, and reverse arrays, in
+    compressed sparse row form, that list the positions of the edges of
+    each chain in order of traversal.
+
+    Parameters:
+        dag: Dag :
+            DAG to compact. It must be acyclic.
+    """
+
+    def __init__(self, dag: Dag):
+        #: DAG that this object compacts.
+        self.dag: Dag = dag
+
+        #: Number of edges of the DAG when this object was built.
+        self.num_edges: int = dag.num_edges
+
+        #: Nodes of the DAG that are not inner nodes of a chain, which are
+        #: the tails and the heads of the chains, in topological order.
+        self.nodes: List[str] = []
+
+        #: Node that each chain starts from.
+        self.chain_tails: List[str] = []
+
+        #: Node that each chain ends at.
+        self.chain_heads: List[str] = []
+
+        #: Dictionary that maps each node in ``nodes`` to the chains that
+        #: start from it.
+        self.out_chains: Dict[str, List[int]] = {}
+
+        #: Dictionary that maps each node in ``nodes`` to the chains that
+        #: end at it.
+        self.in_chains: Dict[str, List[int]] = {}
+
+        source, sink = dag.source, dag.sink
+
+        def is_inner(node: str) -> bool:
+            return (
+                node != source
+                and node != sink
+                and dag.in_degree(node) == 1
+                and dag.out_degree(node) == 1
+            )
+
+        edges_indices = dag.edges_indices
+        chain_edges = []
+        chain_offsets = [0]
+        for node in nx.topological_sort(dag):
+            if is_inner(node):
+                continue
+            self.nodes.append(node)
+            self.in_chains.setdefault(node, [])
+            out_chains = self.out_chains.setdefault(node, [])
+            for edge in dag.out_edges(node):
+                chain = len(self.chain_tails)
+                chain_edges.append(edges_indices[edge])
+                while is_inner(edge[1]):
+                    (edge,) = dag.out_edges(edge[1])
+                    chain_edges.append(edges_indices[edge])
+                chain_offsets.append(len(chain_edges))
+                self.chain_tails.append(node)
+                self.chain_heads.append(edge[1])
+                out_chains.append(chain)
+                self.in_chains.setdefault(edge[1], []).append(chain)
+
+        #: Number of chains.
+        self.num_chains: int = len(self.chain_tails)
+
+        #: Array whose element i is the position, in ``chain_edges``, of
+        #: the first edge of chain i, and whose last element is the number
+        #: of edges.
+        self.chain_offsets: np.ndarray = np.array(chain_offsets, dtype=np.intp)
+
+        #: Array of the positions, in the list of all edges of the DAG, of
+        #: the edges of each chain, in order of traversal, one chain after
+        #: the other.
+        self.chain_edges: np.ndarray = np.array(chain_edges, dtype=np.intp)
+
+        #: Array whose element j is the chain of the edge at position j in
+        #: the list of all edges of the DAG.
+        self.edge_chains: np.ndarray = np.empty(self.num_edges, dtype=np.intp)
+        self.edge_chains[self.chain_edges] = np.repeat(
+            np.arange(self.num_chains, dtype=np.intp), np.diff(self.chain_offsets)
+        )
+
+        # List of all edges of the DAG.
+        self._edges: List[Tuple[str, str]] = list(dag.all_edges)
+
+    def chain_weights(self, edge_weights: Sequence[float]) -> np.ndarray:
+        """
+        Parameters:
+            edge_weights: Sequence[float] :
+                Weights on all of the edges of the DAG, in the order of
+                the list of all edges.
+
+        Returns:
+            Array whose element i is the sum of the weights on the edges
+            of chain i.
+        """
+        return np.bincount(
+            self.edge_chains,
+            weights=np.asarray(edge_weights, dtype=float),
+            minlength=self.num_chains,
+        )
+
+    def chains_of(self, edges: Iterable[Tuple[str, str]]) -> List[int]:
+        """
+        Parameters:
+            edges: Iterable[Tuple[str, str]] :
+                Edges of the DAG.
+
+        Returns:
+            Chains that contain the edges, without repetitions, in
+            the order in which they are first reached.
+        """
+        edges_indices, edge_chains = self.dag.edges_indices, self.edge_chains
+        return list(
+            dict.fromkeys(int(edge_chains[edges_indices[edge]]) for edge in edges)
+        )
+
+    def edges_of(self, chains: Iterable[int]) -> List[Tuple[str, str]]:
+        """
+        Parameters:
+            chains: Iterable[int] :
+                Chains of the DAG.
+
+        Returns:
+            Edges of the chains, chain after chain, in order of traversal
+            within each chain.
+        """
+        offsets, chain_edges, edges = self.chain_offsets, self.chain_edges, self._edges
+        return [
+            edges[edge_index]
+            for chain in chains
+            for edge_index in chain_edges[offsets[chain] : offsets[chain + 1]]
+        ]
+
+    def edge_map(self) -> Dict[Tuple[str, str], int]:
+        """
+        Returns:
+            Dictionary that maps each edge of the DAG to its chain.
+        """
+        return dict(zip(self._edges, self.edge_chains.tolist()))
+
+
+# Dictionary that maps a DAG to its compacted form, which is discarded
+# along with the DAG.
+_compact_dags: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_compact_dag(dag: Dag) -> CompactDag:
+    """
+    Parameters:
+        dag: Dag :
+            DAG to compact. It must be acyclic.
+
+    Returns:
+        Compacted form of the DAG, which is built the first time that
+        it is needed, and again if the edges of the DAG have changed since.
+    """
+    compact_dag = _compact_dags.get(dag)
+    if compact_dag is None or compact_dag.num_edges != dag.num_edges:
+        compact_dag = CompactDag(dag)
+        _compact_dags[dag] = compact_dag
+    return compact_dag
@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+
+"""Exposes a class that stores path-exclusive constraints, keeping only
+the constraints that are not implied by the others.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import collections
+import itertools
+
+Edge = Tuple[str, str]
+
+# Source of the identifiers of the constraints, which are unique across
+# all pools, so that a constraint built for an identifier is never reused
+# for a different constraint after a pool is replaced.
+_constraint_ids = itertools.count()
+
+
+class ConstraintPool(object):
+    """
+    Stores path-exclusive constraints, each of which is a list of edges
+    that must not all be taken together along a path through the DAG.
+
+    If the edges of one constraint are a subset of the edges of another,
+    the other constraint is implied, or `dominated', by the first: a path
+    that does not take all of the edges of the subset cannot take all of
+    the edges of the superset. The pool keeps only the constraints that
+    are not dominated, and ignores constraints whose edges are the same
+    as those of a stored constraint. Each set of edges is hashed as
+    an integer with one bit for each edge, and both checks only compare
+    the constraints found through an index from each edge to
+    the constraints that contain it, rather than scan all of them.
+
+    Each stored constraint has an identifier, unique across all pools,
+    that does not change while it is stored, so that builders of integer
+    linear programs can keep the constraint that they built for it across
+    solves, and only build the constraints added since.
+
+    The pool can be used as the list of constraints that it replaces:
+    iterating over it gives the edge lists of the stored constraints, in
+    the order in which they were added.
+    """
+
+    def __init__(self, constraints: Iterable[Sequence[Edge]] = ()):
+        # Dictionary that maps the identifier of each stored constraint to
+        # its edges, in the order in which the constraints were added.
+        self._constraints: Dict[int, List[Edge]] = {}
+
+        # Dictionary that maps each edge seen to a bit, so that each set of
+        # edges is hashed as the integer whose bits are set for its edges,
+        # and subsets are found with bitwise operations.
+        self._bits: Dict[Edge, int] = {}
+
+        # Dictionary that maps the identifier of each stored constraint to
+        # the set of its edges, as an integer.
+        self._masks: Dict[int, int] = {}
+
+        # Dictionary that maps the set of edges of each stored constraint,
+        # as an integer, to its identifier.
+        self._ids: Dict[int, int] = {}
+
+        # Dictionary that maps each edge to the identifiers of the stored
+        # constraints that contain it.
+        self._index: Dict[Edge, Set[int]] = collections.defaultdict(set)
+
+        # Dictionary that maps each edge to the identifiers of the stored
+        # constraints for which it is the key edge: the edge of
+        # the constraint that was in the fewest constraints when
+        # the constraint was added. A constraint can only be a subset of
+        # a set of edges that contains its key edge.
+        self._keyed: Dict[Edge, Set[int]] = collections.defaultdict(set)
+
+        # Dictionary that maps the identifier of each stored constraint to
+        # its key edge.
+        self._keys: Dict[int, Edge] = {}
+
+        #: Number of constraints that were not stored, because their edges
+        #: were the same as, or a superset of, those of a stored constraint.
+        self.num_ignored: int = 0
+
+        #: Number of stored constraints that were removed, because
+        #: a constraint added later has a subset of their edges.
+        self.num_pruned: int = 0
+
+        for edges in constraints:
+            self.add(edges)
+
+    def _mask(self, edges: Iterable[Edge], assign: bool = False) -> int:
+        """
+        Parameters:
+            edges: Iterable[Edge] :
+                Edges.
+            assign: bool :
+                Whether to assign bits to the edges that have none. If
+                False, such edges are left out of the set, since they are
+                in no stored constraint.
+
+        Returns:
+            Set of the edges provided, as an integer.
+        """
+        bits, mask = self._bits, 0
+        for edge in edges:
+            bit = bits.get(edge)
+            if bit is None:
+                if not assign:
+                    continue
+                bit = bits[edge] = len(bits)
+            mask |= 1 << bit
+        return mask
+
+    def add(self, edges: Sequence[Edge]) -> bool:
+        """
+        Adds a constraint to the pool, unless it is dominated by a stored
+        constraint, and removes the stored constraints that it dominates.
+
+        Parameters:
+            edges: Sequence[Edge] :
+                Edges that must not all be taken together.
+
+        Returns:
+            True if the constraint was stored, and False if it was ignored.
+        """
+        edges = [tuple(edge) for edge in edges]
+        edge_set = set(edges)
+        mask = self._mask(edge_set, assign=True)
+        if mask in self._ids or self._find_subset(edge_set, mask):
+            self.num_ignored += 1
+            return False
+
+        for constraint_id in self._find_supersets(edge_set, mask):
+            self._remove(constraint_id)
+            self.num_pruned += 1
+
+        constraint_id = next(_constraint_ids)
+        key = min(edge_set, key=lambda edge: len(self._index.get(edge, ())))
+        self._constraints[constraint_id] = edges
+        self._masks[constraint_id] = mask
+        self._ids[mask] = constraint_id
+        self._keys[constraint_id] = key
+        self._keyed[key].add(constraint_id)
+        for edge in edge_set:
+            self._index[edge].add(constraint_id)
+        return True
+
+    def excludes(self, edges: Iterable[Edge]) -> bool:
+        """
+        Parameters:
+            edges: Iterable[Edge] :
+                Edges, such as the edges along a path.
+
+        Returns:
+            True if the edges of a stored constraint are a subset of
+            the edges provided, so that the edges provided cannot all be
+            taken together.
+        """
+        edge_set = set(edges)
+        return self._find_subset(edge_set, self._mask(edge_set))
+
+    def _find_subset(self, edge_set: Set[Edge], mask: int) -> bool:
+        """
+        Parameters:
+            edge_set: Set[Edge] :
+                Set of edges.
+            mask: int :
+                Same set of edges, as an integer.
+
+        Returns:
+            True if the edges of a stored constraint are a subset of
+            the edges provided.
+        """
+        masks, keyed = self._masks, self._keyed
+        for edge in edge_set:
+            for constraint_id in keyed.get(edge, ()):
+                if masks[constraint_id] & ~mask == 0:
+                    return True
+        return False
+
+    def _find_supersets(self, edge_set: Set[Edge], mask: int) -> List[int]:
+        """
+        Parameters:
+            edge_set: Set[Edge] :
+                Set of edges.
+            mask: int :
+                Same set of edges, as an integer.
+
+        Returns:
+            Identifiers of the stored constraints whose edges are
+            a superset of the edges provided.
+        """
+        if not edge_set:
+            return []
+        masks = self._masks
+        candidates = min((self._index.get(edge, ()) for edge in edge_set), key=len)
+        return [
+            constraint_id
+            for constraint_id in candidates
+            if masks[constraint_id] & mask == mask
+        ]
+
+    def _remove(self, constraint_id: int):
+        """
+        Removes a stored constraint from the pool.
+
+        Parameters:
+            constraint_id: int :
+                Identifier of the constraint.
+        """
+        edges = self._constraints.pop(constraint_id)
+        del self._ids[self._masks.pop(constraint_id)]
+        key = self._keys.pop(constraint_id)
+        self._keyed[key].discard(constraint_id)
+        if not self._keyed[key]:
+            del self._keyed[key]
+        for edge in set(edges):
+            self._index[edge].discard(constraint_id)
+            if not self._index[edge]:
+                del self._index[edge]
+
+    def items(self) -> Iterator[Tuple[int, List[Edge]]]:
+        """
+        Returns:
+            Iterator over tuples of the identifier and the edges of each
+            stored constraint, in the order in which they were added.
+        """
+        return iter(self._constraints.items())
+
+    def __iter__(self) -> Iterator[List[Edge]]:
+        return iter(self._constraints.values())
+
+    def __len__(self) -> int:
+        return len(self._constraints)
+
+    def __contains__(self, edges: Sequence[Edge]) -> bool:
+        edges = [tuple(edge) for edge in edges]
+        return (
+            all(edge in self._bits for edge in edges) and self._mask(edges) in self._ids
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ConstraintPool):
+            other = list(other)
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return "ConstraintPool(%r)" % list(self)
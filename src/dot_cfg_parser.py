@@ -0,0 +1,206 @@
+#!/usr/bin/env python
+
+"""Exposes a function that reads the control-flow graphs that
+the ``opt -passes=dot-cfg`` pass of LLVM writes in DOT format,
+without the Graphviz library.
+"""
+
+import re
+from typing import Dict, Iterable
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import networkx as nx
+
+# Regular expression that matches an identifier of the DOT language:
+# a name, a number, or a quoted string, in which any character can be
+# escaped.
+_ID = (
+    r"[A-Za-z_\x80-\U0010ffff][\w\x80-\U0010ffff]*"
+    r"|-?(?:\.[0-9]+|[0-9]+(?:\.[0-9]*)?)"
+    r'|"[^"\\]*(?:\\.[^"\\]*)*"'
+)
+
+# Regular expression that matches an attribute in an attribute list,
+# with its name and its value.
+_ATTRIBUTE_RE = re.compile(r"\s*(%s)\s*=\s*(%s)\s*[,;]?\s*" % (_ID, _ID), re.DOTALL)
+
+# Regular expressions that match each line of the dialect of DOT that
+# ``opt`` writes: the header of the graph, an attribute of the graph,
+# the attributes of a node, an edge, whose ends can name ports of
+# the record shapes of the nodes, and the end of the graph. Each line
+# holds one statement. The contents of attribute lists are checked as
+# they are read, so that each label is scanned only once.
+_HEADER_RE = re.compile(r"\s*(?i:strict\s+)?(?i:digraph)\s*(%s)?\s*\{\s*" % _ID)
+_GRAPH_ATTRIBUTE_RE = re.compile(r"\s*(%s)\s*=\s*(%s)\s*;?\s*" % (_ID, _ID))
+_NODE_RE = re.compile(r"\s*(%s)\s*\[(.*)\]\s*;?\s*" % _ID, re.DOTALL)
+_EDGE_RE = re.compile(
+    r"\s*(%s)(?:\s*:\s*(%s))?\s*->\s*(%s)(?:\s*:\s*(%s))?\s*(?:\[(.*)\])?\s*;?\s*"
+    % (_ID, _ID, _ID, _ID),
+    re.DOTALL,
+)
+_FOOTER_RE = re.compile(r"\s*\}\s*")
+
+# Keywords of the DOT language that start statements outside the dialect
+# that ``opt`` writes: attribute defaults and subgraphs.
+_STATEMENT_KEYWORDS = {"node", "edge", "graph", "subgraph"}
+
+
+class _UnsupportedDotError(Exception):
+    """
+    Raised when the DOT file uses a construct outside the dialect
+    that ``opt`` writes, or is malformed.
+    """
+
+
+def _unquote(identifier: str) -> str:
+    """
+    Parameters:
+        identifier: str :
+            Identifier of the DOT language.
+
+    Returns:
+        Value of the identifier, as Graphviz reads it: for a quoted
+        string, the only escaped character is the double quote, and
+        escaped newlines are removed, while every other backslash is kept.
+    """
+    if not identifier.startswith('"'):
+        return identifier
+    return identifier[1:-1].replace('\\"', '"').replace("\\\n", "")
+
+
+def _attributes(attribute_list: str) -> Dict[str, str]:
+    """
+    Parameters:
+        attribute_list: str :
+            Contents of an attribute list, without the brackets.
+
+    Returns:
+        Dictionary that maps the name of each attribute in the list to
+        its value.
+    """
+    attributes = {}
+    position = 0
+    for match in _ATTRIBUTE_RE.finditer(attribute_list):
+        if match.start() != position:
+            raise _UnsupportedDotError(attribute_list)
+        position = match.end()
+        attributes[_unquote(match.group(1))] = _unquote(match.group(2))
+    if attribute_list[position:].strip():
+        raise _UnsupportedDotError(attribute_list)
+    return attributes
+
+
+def _parse(lines: Iterable[str], graph: nx.DiGraph):
+    """
+    Parses the lines of a DOT file in the dialect that ``opt`` writes
+    into the graph provided.
+
+    Parameters:
+        lines: Iterable[str] :
+            Lines of the DOT file.
+        graph: nx.DiGraph :
+            Empty graph to add the nodes and the edges of the file to.
+    """
+    lines = iter(lines)
+    for line in lines:
+        if line.strip():
+            match = _HEADER_RE.fullmatch(line)
+            if match is None:
+                raise _UnsupportedDotError(line)
+            if match.group(1) is not None:
+                graph.graph["name"] = _unquote(match.group(1))
+            break
+    else:
+        raise _UnsupportedDotError("empty file")
+
+    graph_attributes = {}
+    for line in lines:
+        match = _EDGE_RE.fullmatch(line)
+        if match is not None:
+            tail, tail_port, head, head_port, attribute_list = match.groups()
+            if {tail.lower(), head.lower()} & _STATEMENT_KEYWORDS:
+                raise _UnsupportedDotError(line)
+            edge_attributes = _attributes(attribute_list) if attribute_list else {}
+            if tail_port is not None:
+                edge_attributes["tailport"] = _unquote(tail_port)
+            if head_port is not None:
+                edge_attributes["headport"] = _unquote(head_port)
+            graph.add_edge(_unquote(tail), _unquote(head), **edge_attributes)
+            continue
+
+        match = _NODE_RE.fullmatch(line)
+        if match is not None:
+            name, attribute_list = match.groups()
+            if name.lower() in _STATEMENT_KEYWORDS:
+                raise _UnsupportedDotError(line)
+            graph.add_node(_unquote(name), **_attributes(attribute_list))
+            continue
+
+        match = _GRAPH_ATTRIBUTE_RE.fullmatch(line)
+        if match is not None:
+            graph_attributes[_unquote(match.group(1))] = _unquote(match.group(2))
+            continue
+
+        if _FOOTER_RE.fullmatch(line):
+            break
+        if line.strip():
+            raise _UnsupportedDotError(line)
+    else:
+        raise _UnsupportedDotError("end of file")
+
+    for line in lines:
+        if line.strip():
+            raise _UnsupportedDotError(line)
+
+    # The attributes of the graph are stored as ``read_dot`` of
+    # the NetworkX package stores them.
+    graph.graph.update(graph_attributes)
+    graph.graph["graph"] = graph_attributes
+    graph.graph["node"] = {}
+    graph.graph["edge"] = {}
+
+
+def parse_dot_cfg(lines: Iterable[str], graph: nx.DiGraph) -> bool:
+    """
+    Reads a control-flow graph written in DOT format by
+    the ``opt -passes=dot-cfg`` pass of LLVM into the graph provided,
+    in a single pass over the lines of the file. Unlike ``read_dot`` of
+    the NetworkX package, it does not need the Graphviz library, and it
+    does not build an intermediate graph, which matters for the large
+    labels of the nodes, each of which holds a whole basic block.
+
+    The dialect that ``opt`` writes has one statement on each line:
+    the header of the graph, attributes of the graph, the attributes
+    of a node, an edge, and the end of the graph. The nodes are added in
+    the order in which they first appear in the file, and the edges in
+    the order in which they appear, so that the nodes and the edges of
+    the graph are in the same order as with ``read_dot``. Parallel edges,
+    which a ``DiGraph`` cannot hold, are merged into one.
+
+    Parameters:
+        lines: Iterable[str] :
+            Lines of the DOT file, such as an open file.
+        graph: nx.DiGraph :
+            Empty graph to add the nodes and the edges of the file to,
+            such as a ``Dag`` object.
+
+    Returns:
+        bool:
+            `True` if the file was read into the graph, or `False` if
+            the file uses constructs of the DOT language outside
+            the dialect that ``opt`` writes, such as subgraphs, default
+            attributes, or statements that span lines, in which case
+            the graph is left empty, and the file should be read with
+            ``read_dot`` instead.
+    """
+    try:
+        _parse(lines, graph)
+    except _UnsupportedDotError:
+        graph.clear()
+        return False
+    return True
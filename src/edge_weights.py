@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+"""Exposes a class that maintains the weights on the edges of a DAG,
+as estimated from one or more sets of values of the basis paths.
+"""
+
+from typing import List, Optional, Sequence, Union
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import numpy as np
+
+from gametime_error import GameTimeError
+from path_encoding import PathEncoder
+
+
+class EdgeWeights(object):
+    """
+    Maintains a matrix of weights on the edges of a DAG, with one column
+    for each set of values of the basis paths that the weights were
+    estimated from, such as the values of each repetition of
+    a measurement, of each backend, or of each metric.
+
+    Only the weights on the `non-special' edges are stored. The weights
+    on all of the edges, in the order of the list of all edges of the DAG,
+    which is the form that ``Dag.edge_weights`` and
+    ``pulp_helper.find_extreme_path`` use, are produced one column at
+    a time, on demand.
+
+    Parameters:
+        reduced_weights:
+            Matrix whose column j is the vector of weights on
+            the `non-special' edges estimated from the values in column j.
+        path_encoder:
+            ``PathEncoder`` object that maps the `non-special' edges of
+            the DAG to the rows of ``reduced_weights``.
+        labels:
+            Labels of the columns, such as the names of the backends or
+            the metrics. By default, the columns are not labeled.
+    """
+
+    def __init__(
+        self,
+        reduced_weights: np.ndarray,
+        path_encoder: PathEncoder,
+        labels: Optional[List[str]] = None,
+    ):
+        reduced_weights = np.asarray(reduced_weights, dtype=float)
+        if reduced_weights.ndim == 1:
+            reduced_weights = reduced_weights.reshape(-1, 1)
+
+        #: Matrix whose column j is the vector of weights on
+        #: the `non-special' edges estimated from the values in column j.
+        self.reduced_weights: np.ndarray = reduced_weights
+
+        #: Encoder of paths through the DAG.
+        self.path_encoder: PathEncoder = path_encoder
+
+        #: Labels of the columns, if any.
+        self.labels: Optional[List[str]] = labels
+
+        if labels is not None and len(labels) != self.num_columns:
+            err_msg = "Expected %d labels of columns of edge weights, got %d" % (
+                self.num_columns,
+                len(labels),
+            )
+            raise GameTimeError(err_msg)
+
+    @property
+    def num_columns(self) -> int:
+        """Number of columns of edge weights."""
+        return self.reduced_weights.shape[1]
+
+    def _column_index(self, column: Union[int, str]) -> int:
+        """
+        Parameters:
+            column: Union[int, str] :
+                Index or label of a column.
+
+        Returns:
+            Index of the column.
+        """
+        if isinstance(column, str):
+            if self.labels is None or column not in self.labels:
+                raise GameTimeError("No column of edge weights is labeled %s" % column)
+            return self.labels.index(column)
+        return column
+
+    def reduced_column(self, column: Union[int, str] = 0) -> np.ndarray:
+        """
+        Parameters:
+            column: Union[int, str] :
+                Index or label of a column.
+
+        Returns:
+            Weights on the `non-special' edges in the column.
+        """
+        return self.reduced_weights[:, self._column_index(column)]
+
+    def column(self, column: Union[int, str] = 0) -> List[float]:
+        """
+        Parameters:
+            column: Union[int, str] :
+                Index or label of a column.
+
+        Returns:
+            Weights on all of the edges of the DAG in the column, in
+            the order of the list of all edges, where the special edges
+            have weight 0. This list can be assigned to ``Dag.edge_weights``,
+            or passed to ``pulp_helper.find_extreme_path``.
+        """
+        return self.path_encoder.expand(self.reduced_column(column))
+
+    def predict(self, paths: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Parameters:
+            paths: Sequence[Sequence[str]] :
+                Paths, each of which is a list of the nodes along
+                the path, in order of traversal.
+
+        Returns:
+            Matrix whose element (i, j) is the value of path i predicted
+            by the weights in column j.
+        """
+        return self.path_encoder.sparse_rows(paths) @ self.reduced_weights
@@ -97,9 +97,8 @@ def remove_all_except(patterns: List[str], dir_location: str) -> None:
     files: list[str]
     for root, dirs, files in os.walk(dir_location):
         for filename in files:
-            for pattern in patterns:
-                if not re.search(pattern, filename):
-                    os.unlink(os.path.join(root, filename))
+            if not any(re.search(pattern, filename) for pattern in patterns):
+                os.unlink(os.path.join(root, filename))
         for dirname in dirs:
             shutil.rmtree(os.path.join(root, dirname))
 
@@ -114,6 +114,9 @@ class GametimeConfiguration(object):
         self.TEMP_CASE: str = ""
 
         self.TEMP_BASIS_MATRIX: str = ""
+        self.TEMP_BASIS_CHECKPOINT: str = ""
+        self.TEMP_INCREMENTAL_FOLDER: str = ""
+        self.TEMP_ILP_CACHE_FOLDER: str = ""
         self.TEMP_MEASUREMENT: str = ""
         self.TEMP_BASIS_VALUES: str = ""
         self.TEMP_DAG_WEIGHTS: str = ""
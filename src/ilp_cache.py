@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+
+"""Exposes a class that caches, on disk, the solutions of the integer
+linear programs that find extreme paths, keyed by a hash of the programs,
+so that later analyses of the same code need not solve them again.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from basis_checkpoint import NodeIdentities
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import atexit
+import collections
+import hashlib
+import json
+import os
+import threading
+import time
+
+from defaults import logger
+from file_helper import create_dir
+from interval import Interval
+from nx_helper import Dag
+
+#: Version of the format of the cached solutions. Solutions of a different
+#: version have different keys, and are never found.
+ILP_CACHE_VERSION = 2
+
+#: Name of the file, in the directory of a cache, that holds its solutions.
+ILP_CACHE_FILE = "solutions.json"
+
+Edge = Tuple[str, str]
+
+#: Solution of a program: the identifiers of the nodes along the path,
+#: in order of traversal, the value of the objective function, and
+#: the sense of the program that found the path.
+Solution = Tuple[List[str], Optional[float], Optional[int]]
+
+
+class IlpCache(object):
+    """
+    Caches the solutions of the integer linear programs of
+    ``pulp_helper.find_extreme_path`` in a file in a directory, keyed by
+    the hash of a canonical description of the program that each solves:
+    the edges of the DAG, the weights on the edges, the path-exclusive and
+    the path-bundled constraints, the interval of values, the extremum and
+    the solver. The nodes are described by their ``NodeIdentities``, not
+    by their names, which change every time that the code is preprocessed,
+    so programs that are the same have the same hash, whichever run,
+    analysis, or backend, they were solved for.
+
+    The solutions are read from the file the first time that the cache is
+    used, and are kept in memory, in order of last use. New solutions are
+    only written to the file by ``save``, which merges them with those
+    that other runs wrote in the meantime. The cache holds at most
+    a given number of solutions, and the least recently used solutions are
+    evicted first.
+
+    Parameters:
+        location: str :
+            Location of the directory of the cache.
+        max_entries: int :
+            Largest number of solutions kept in the cache.
+    """
+
+    def __init__(self, location: str, max_entries: int):
+        #: Location of the directory of the cache.
+        self.location: str = location
+
+        #: Largest number of solutions kept in the cache.
+        self.max_entries: int = max_entries
+
+        #: Number of solutions found in the cache.
+        self.num_hits: int = 0
+
+        #: Number of solutions not found in the cache.
+        self.num_misses: int = 0
+
+        #: Number of solutions evicted from the cache.
+        self.num_evictions: int = 0
+
+        # Dictionary that maps the hash of each cached program to its
+        # solution, ordered from the least to the most recently used,
+        # or None until the file of the cache is read.
+        self._entries: Optional[collections.OrderedDict] = None
+
+        # Whether solutions were stored since the file was last written.
+        self._is_modified: bool = False
+
+        # Lock that guards the counters and the solutions of the cache.
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(
+        identities: "NodeIdentities",
+        dag: Dag,
+        edge_weights: Sequence[float],
+        exclusive_constraints: Iterable[Sequence[Edge]],
+        bundled_constraints: Iterable[Sequence[Edge]],
+        interval: Interval,
+        extremum: int,
+        ilp_solver_name: str,
+    ) -> str:
+        """
+        Parameters:
+            identities: NodeIdentities :
+                Identities of the nodes of the DAG.
+            dag: Dag :
+                DAG whose paths the program finds.
+            edge_weights: Sequence[float] :
+                Weights on all of the edges of the DAG, in the order of
+                the list of all edges.
+            exclusive_constraints: Iterable[Sequence[Edge]] :
+                Path-exclusive constraints of the program.
+            bundled_constraints: Iterable[Sequence[Edge]] :
+                Path-bundled constraints of the program.
+            interval: Interval :
+                Interval of values that the path can have.
+            extremum: int :
+                Extremum of the path, an element of
+                the ``pulp_helper.Extremum`` class.
+            ilp_solver_name: str :
+                Name of the solver, since solvers can choose different
+                paths of the same value.
+
+        Returns:
+            Hash of a canonical description of the program, which does not
+            depend on the names of the nodes of the DAG, or on the order
+            of its edges, or of the constraints, or of the edges of
+            a path-exclusive constraint.
+        """
+        ids = identities.ids
+        description = {
+            "version": ILP_CACHE_VERSION,
+            "source": ids[dag.source],
+            "sink": ids[dag.sink],
+            "edges": sorted(
+                identities.edges_to_list([edge])[0] + [float(edge_weight)]
+                for edge, edge_weight in zip(dag.all_edges, edge_weights)
+            ),
+            "exclusive": sorted(
+                sorted(identities.edges_to_list(edges))
+                for edges in exclusive_constraints
+            ),
+            # The first edge of a path-bundled constraint is the one whose
+            # flow the others follow, so only the others are sorted.
+            "bundled": sorted(
+                identities.edges_to_list(edges[:1])
+                + sorted(identities.edges_to_list(edges[1:]))
+                for edges in bundled_constraints
+                if edges
+            ),
+            "interval": [interval.lower_bound, interval.upper_bound],
+            "extremum": extremum,
+            "solver": ilp_solver_name,
+        }
+        encoded = json.dumps(description, separators=(",", ":")).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _file_location(self) -> str:
+        return os.path.join(self.location, ILP_CACHE_FILE)
+
+    def _read_entries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns:
+            Dictionary that maps the hash of each program in the file of
+            the cache to its solution, which is empty if the file is
+            missing, unreadable, or of another version.
+        """
+        try:
+            with open(self._file_location(), "r") as cache_file:
+                contents = json.load(cache_file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(
+                "Unable to read the cached solutions at %s: %s"
+                % (self._file_location(), e)
+            )
+            return {}
+        if contents.get("version") != ILP_CACHE_VERSION:
+            return {}
+        return contents.get("entries", {})
+
+    def _load(self) -> collections.OrderedDict:
+        if self._entries is None:
+            entries = self._read_entries()
+            self._entries = collections.OrderedDict(
+                sorted(entries.items(), key=lambda item: item[1]["used"])
+            )
+            self._evict()
+        return self._entries
+
+    def get(self, key: str) -> Optional[Solution]:
+        """
+        Parameters:
+            key: str :
+                Hash of a program, from ``make_key``.
+
+        Returns:
+            Tuple of the identifiers of the nodes along the path that
+            solves the program, in order of traversal, the value of
+            the objective function, and the sense of the program that
+            found the path, or None if the solution is not in the cache.
+            If no path is feasible, the list of identifiers is empty, and
+            the value and the sense are None.
+        """
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                self.num_misses += 1
+                return None
+            self.num_hits += 1
+            # Mark the solution as the most recently used.
+            entry["used"] = time.time()
+            entries.move_to_end(key)
+            self._is_modified = True
+        return entry["nodes"], entry["obj_val"], entry["sense"]
+
+    def put(
+        self,
+        key: str,
+        nodes: List[str],
+        obj_val: Optional[float],
+        sense: Optional[int],
+    ) -> None:
+        """
+        Stores the solution of a program in the cache, and evicts
+        the least recently used solutions, if there are too many.
+
+        Parameters:
+            key: str :
+                Hash of the program, from ``make_key``.
+            nodes: List[str] :
+                Identifiers of the nodes along the path that solves
+                the program, in order of traversal, or an empty list if
+                no path is feasible.
+            obj_val: Optional[float] :
+                Value of the objective function, or None if no path
+                is feasible.
+            sense: Optional[int] :
+                Sense of the program that found the path, or None if
+                no path is feasible.
+        """
+        with self._lock:
+            entries = self._load()
+            entries[key] = {
+                "nodes": nodes,
+                "obj_val": obj_val,
+                "sense": sense,
+                "used": time.time(),
+            }
+            entries.move_to_end(key)
+            self._is_modified = True
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used solutions from the cache, until it
+        holds at most ``max_entries`` solutions.
+        """
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.num_evictions += 1
+
+    def save(self) -> None:
+        """
+        Writes the solutions stored since the file of the cache was last
+        written to the file, along with the solutions in the file that
+        were stored by other runs in the meantime, keeping at most
+        ``max_entries`` of the most recently used solutions.
+        """
+        with self._lock:
+            if not self._is_modified:
+                return
+            location = self._file_location()
+            try:
+                create_dir(self.location)
+                entries = self._read_entries()
+                entries.update(self._entries)
+                kept = sorted(entries.items(), key=lambda item: item[1]["used"])
+                kept = kept[max(len(kept) - self.max_entries, 0) :]
+                # Write to a temporary file first, so that an interrupted
+                # write does not leave a partial file in the cache.
+                temp_location = "%s.%d.tmp" % (location, os.getpid())
+                with open(temp_location, "w") as cache_file:
+                    json.dump(
+                        {"version": ILP_CACHE_VERSION, "entries": dict(kept)},
+                        cache_file,
+                    )
+                os.replace(temp_location, location)
+                self._is_modified = False
+            except OSError as e:
+                logger.warning(
+                    "Unable to cache the solutions at %s: %s" % (location, e)
+                )
+
+
+# Dictionary that maps the location of the directory of a cache to
+# the cache, so that the counters of each cache cover the whole process.
+_ilp_caches: Dict[str, IlpCache] = {}
+_ilp_caches_lock = threading.Lock()
+
+
+def get_ilp_cache(location: str, max_entries: int) -> Optional[IlpCache]:
+    """
+    Parameters:
+        location: str :
+            Location of the directory of the cache.
+        max_entries: int :
+            Largest number of solutions kept in the cache.
+
+    Returns:
+        Cache of the solutions in the directory, or None if the cache is
+        not used, because no directory, or no room for solutions,
+        is provided.
+    """
+    if not location or max_entries <= 0:
+        return None
+    with _ilp_caches_lock:
+        ilp_cache = _ilp_caches.get(location)
+        if ilp_cache is None:
+            ilp_cache = IlpCache(location, max_entries)
+            _ilp_caches[location] = ilp_cache
+        ilp_cache.max_entries = max_entries
+        return ilp_cache
+
+
+def save_ilp_caches() -> None:
+    """
+    Writes the solutions stored in each cache of the process to the file
+    of the cache. This is also done when the process exits.
+    """
+    with _ilp_caches_lock:
+        caches = list(_ilp_caches.values())
+    for ilp_cache in caches:
+        ilp_cache.save()
+
+
+atexit.register(save_ilp_caches)
+
+
+def get_ilp_cache_statistics() -> Tuple[int, int, int]:
+    """
+    Returns:
+        Tuple of the numbers of hits, misses and evictions of all of
+        the caches of the process.
+    """
+    with _ilp_caches_lock:
+        caches = list(_ilp_caches.values())
+    return (
+        sum(ilp_cache.num_hits for ilp_cache in caches),
+        sum(ilp_cache.num_misses for ilp_cache in caches),
+        sum(ilp_cache.num_evictions for ilp_cache in caches),
+    )
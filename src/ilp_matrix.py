@@ -0,0 +1,236 @@
+#!/usr/bin/env python
+
+"""Exposes a class that builds the integer linear program that finds
+an extreme path through a DAG in matrix form, and solves it with
+the HiGHS solver provided with the SciPy package.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import numpy as np
+import scipy.optimize
+import scipy.sparse
+
+from compact_dag import CompactDag, get_compact_dag
+from constraint_pool import ConstraintPool
+from interval import Interval
+from nx_helper import Dag
+
+Edge = Tuple[str, str]
+
+# Row of a constraint matrix, as a tuple of the columns of its nonzero
+# coefficients, the coefficients, the lower bound and the upper bound.
+_Row = Tuple[np.ndarray, np.ndarray, float, float]
+
+
+class ExtremePathMatrix(object):
+    """
+    Maintains the integer linear program that finds the longest or
+    the shortest path through a DAG in matrix form: one binary variable
+    for the flow through each chain of the compacted DAG, and
+    the flow-conservation constraints as a sparse matrix in compressed
+    sparse row form, assembled directly from the nodes that each chain
+    starts from and ends at, rather than term by term.
+
+    The flow-conservation matrix has one row for each node of
+    the compacted DAG and one column for each chain. A chain has
+    a coefficient of 1 in the row of the node that it ends at, and
+    a coefficient of -1 in the row of the node that it starts from,
+    or 1 if that node is the source: the flow out of the source and
+    the flow into the sink are 1, and the flow into every other node
+    equals the flow out of it.
+
+    The rows of the path-exclusive and the path-bundled constraints are
+    built the first time that they are used, and kept for later solves,
+    as are those of ``_ExtremePathModel`` in the ``pulp_helper`` module.
+
+    Parameters:
+        dag: Dag :
+            DAG whose paths the integer linear program finds.
+    """
+
+    def __init__(self, dag: Dag):
+        #: DAG whose paths the integer linear program finds.
+        self.dag: Dag = dag
+
+        #: Number of edges of the DAG when this model was built.
+        self.num_edges: int = dag.num_edges
+
+        #: Compacted form of the DAG.
+        self.compact_dag: CompactDag = get_compact_dag(dag)
+
+        compact_dag = self.compact_dag
+        num_chains = compact_dag.num_chains
+        node_rows = {node: row for row, node in enumerate(compact_dag.nodes)}
+        tail_rows = np.fromiter(
+            (node_rows[tail] for tail in compact_dag.chain_tails),
+            dtype=np.intp,
+            count=num_chains,
+        )
+        head_rows = np.fromiter(
+            (node_rows[head] for head in compact_dag.chain_heads),
+            dtype=np.intp,
+            count=num_chains,
+        )
+        source_row, sink_row = node_rows[dag.source], node_rows[dag.sink]
+        tail_coeffs = np.where(tail_rows == source_row, 1.0, -1.0)
+        columns = np.arange(num_chains, dtype=np.intp)
+
+        #: Flow-conservation matrix, with one row for each node of
+        #: the compacted DAG and one column for each chain.
+        self.flow_matrix: scipy.sparse.csr_matrix = scipy.sparse.csr_matrix(
+            (
+                np.concatenate([tail_coeffs, np.ones(num_chains)]),
+                (
+                    np.concatenate([tail_rows, head_rows]),
+                    np.concatenate([columns, columns]),
+                ),
+            ),
+            shape=(len(node_rows), num_chains),
+        )
+
+        #: Right-hand side of the flow-conservation constraints, which is
+        #: 1 for the source and the sink, and 0 for every other node.
+        self.flow_rhs: np.ndarray = np.zeros(len(node_rows))
+        self.flow_rhs[[source_row, sink_row]] = 1.0
+
+        # Dictionary that maps the identifier of a path-exclusive constraint
+        # in a ``ConstraintPool`` to the row of the constraint, built
+        # the first time that the constraint is used.
+        self._exclusive_rows: Dict[int, _Row] = {}
+
+        # Dictionary that maps the edges of a path-bundled constraint, as
+        # a tuple, to the row of the constraint, built the first time that
+        # the constraint is used.
+        self._bundled_rows: Dict[Tuple[Edge, ...], _Row] = {}
+
+    def exclusive_rows(self, pool: ConstraintPool) -> List[_Row]:
+        """
+        Parameters:
+            pool: ConstraintPool :
+                Pool of the path-exclusive constraints, each of which is
+                a list of edges that must not be taken together.
+
+        Returns:
+            List of the rows of the constraints in the pool. Only
+            the constraints added to the pool since the last call are
+            built, and the constraints that were removed from the pool
+            are forgotten.
+        """
+        built = {}
+        for constraint_id, edges in pool.items():
+            row = self._exclusive_rows.get(constraint_id)
+            if row is None:
+                # The total flow through the chains of the edges must be
+                # at least one unit less than the number of the chains.
+                chains = np.array(self.compact_dag.chains_of(edges), dtype=np.intp)
+                row = (chains, np.ones(len(chains)), -np.inf, len(chains) - 1.0)
+            built[constraint_id] = row
+        self._exclusive_rows = built
+        return list(built.values())
+
+    def bundled_row(self, edges: Sequence[Edge]) -> _Row:
+        """
+        Parameters:
+            edges: Sequence[Edge] :
+                Edges that must be taken together, if the first is taken.
+
+        Returns:
+            Row of the path-bundled constraint for the edges, which is
+            built the first time that it is needed.
+        """
+        key = tuple(tuple(edge) for edge in edges)
+        row = self._bundled_rows.get(key)
+        if row is None:
+            # The flow through the chains of the other edges must sum up
+            # to the flow through the chain of the first edge, scaled by
+            # the number of the other chains.
+            first_chain, *rest_chains = self.compact_dag.chains_of(edges)
+            row = (
+                np.array([first_chain] + rest_chains, dtype=np.intp),
+                np.array([-float(len(rest_chains))] + [1.0] * len(rest_chains)),
+                0.0,
+                0.0,
+            )
+            self._bundled_rows[key] = row
+        return row
+
+    def solve(
+        self,
+        chain_weights: np.ndarray,
+        maximize: bool,
+        rows: List[_Row],
+        interval: Interval,
+    ) -> Tuple[Optional[List[int]], Optional[float]]:
+        """
+        Solves the integer linear program with the rows of
+        the path-exclusive and the path-bundled constraints provided, and
+        with the values of the path bounded by the interval provided.
+
+        Parameters:
+            chain_weights: np.ndarray :
+                Array whose element i is the sum of the weights on the edges
+                of chain i.
+            maximize: bool :
+                Whether to find the longest path, rather than the shortest.
+            rows: List[_Row] :
+                Rows of the path-exclusive and the path-bundled constraints.
+            interval: Interval :
+                ``Interval`` object that represents the interval of values
+                that the path can have.
+
+        Returns:
+            Tuple of the list of the chains along the extreme path and
+            the value of the path, or a tuple of two None values, if no
+            path is feasible.
+        """
+        rows = list(rows)
+        if interval.has_finite_lower_bound() or interval.has_finite_upper_bound():
+            lower_bound = (
+                interval.lower_bound if interval.has_finite_lower_bound() else -np.inf
+            )
+            upper_bound = (
+                interval.upper_bound if interval.has_finite_upper_bound() else np.inf
+            )
+            nonzero = np.flatnonzero(chain_weights)
+            rows.append((nonzero, chain_weights[nonzero], lower_bound, upper_bound))
+
+        constraints = [
+            scipy.optimize.LinearConstraint(
+                self.flow_matrix, self.flow_rhs, self.flow_rhs
+            )
+        ]
+        if rows:
+            lengths = [len(columns) for columns, _, _, _ in rows]
+            side_matrix = scipy.sparse.csr_matrix(
+                (
+                    np.concatenate([coeffs for _, coeffs, _, _ in rows]),
+                    np.concatenate([columns for columns, _, _, _ in rows]),
+                    np.concatenate([[0], np.cumsum(lengths)]),
+                ),
+                shape=(len(rows), self.compact_dag.num_chains),
+            )
+            constraints.append(
+                scipy.optimize.LinearConstraint(
+                    side_matrix,
+                    np.array([lower for _, _, lower, _ in rows]),
+                    np.array([upper for _, _, _, upper in rows]),
+                )
+            )
+
+        result = scipy.optimize.milp(
+            -chain_weights if maximize else chain_weights,
+            integrality=np.ones(self.compact_dag.num_chains),
+            bounds=scipy.optimize.Bounds(0, 1),
+            constraints=constraints,
+        )
+        if result.status != 0:
+            return None, None
+        chains = np.flatnonzero(result.x > 0.5)
+        return chains.tolist(), float(chain_weights[chains].sum())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+
+"""Exposes functions to save the basis paths of an analysis, and to find
+the basis paths of a previous analysis that are still paths through
+the DAG of the code after it was edited, so that their feasibility checks
+and measurements can be reused, and only the rows of the basis matrix
+that span the changed region of the code need to be searched for.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import collections
+import hashlib
+import json
+import os
+import re
+import shutil
+
+import numpy as np
+import scipy.linalg
+
+from defaults import logger
+from file_helper import create_dir
+from nx_helper import Dag
+from path import Path
+
+#: Version of the format of the files of saved basis paths. Files of
+#: a different version are ignored.
+INCREMENTAL_STATE_VERSION = 1
+
+#: Name of the file, in the directory of saved basis paths, that describes
+#: the DAG and the basis paths.
+STATE_FILENAME = "basis-paths.json"
+
+#: Pattern of the names of the files, in the output folder of a path,
+#: that hold the inputs that drive the program along the path.
+INPUT_FILE_PATTERN = r"^klee_input_.*\.txt$"
+
+# Pattern of the numbered local values of LLVM IR, such as `%5', whose
+# numbers change whenever an instruction is added to, or removed from,
+# an earlier basic block of the function.
+_NUMBERED_VALUE_PATTERN = re.compile(r"%\d+\b")
+
+
+def normalize_label(label: str) -> str:
+    """
+    Parameters:
+        label: str :
+            Label of a node of the DAG, which is the LLVM IR of
+            a basic block.
+
+    Returns:
+        Label in which the numbered local values are renumbered in
+        the order in which they first appear in the label, so that
+        a basic block whose instructions did not change has the same
+        label even if the values of the blocks before it were renumbered.
+    """
+    numbers = {}
+
+    def renumber(match: re.Match) -> str:
+        return "%%%d" % numbers.setdefault(match.group(0), len(numbers))
+
+    return _NUMBERED_VALUE_PATTERN.sub(renumber, label)
+
+
+def block_hashes(dag: Dag) -> Dict[str, str]:
+    """
+    Parameters:
+        dag: Dag :
+            DAG whose nodes are basic blocks.
+
+    Returns:
+        Dictionary that maps each node of the DAG to the hash of
+        the normalized content of its basic block.
+    """
+    return {
+        node: hashlib.sha256(
+            normalize_label(dag.get_node_label(dag.nodes_indices[node])).encode()
+        ).hexdigest()
+        for node in dag.all_nodes
+    }
+
+
+def _unique_hashes(hashes: Dict[str, str]) -> Dict[str, str]:
+    """
+    Parameters:
+        hashes: Dict[str, str] :
+            Dictionary that maps nodes to the hashes of their basic blocks.
+
+    Returns:
+        Dictionary that maps each hash that only one node has to that node.
+    """
+    counts = collections.Counter(hashes.values())
+    return {
+        block_hash: node
+        for node, block_hash in hashes.items()
+        if counts[block_hash] == 1
+    }
+
+
+def save_basis_paths(
+    location: str, dag: Dag, basis_paths: List[Path], temp_dir: str
+) -> None:
+    """
+    Saves the DAG and the basis paths of an analysis to a directory, so
+    that a later analysis of the edited code can reuse the basis paths.
+    Each basis path is saved as the hashes of the basic blocks along it,
+    with its measured value and the inputs that drive the program along it,
+    which are copied from its output folder. Any basis paths saved before
+    are replaced.
+
+    Parameters:
+        location: str :
+            Location of the directory to save the basis paths to.
+        dag: Dag :
+            DAG that the basis paths are paths through.
+        basis_paths: List[Path] :
+            Basis paths to save.
+        temp_dir: str :
+            Location of the temporary directory that contains
+            the output folders of the basis paths.
+    """
+    if os.path.exists(location):
+        shutil.rmtree(location)
+    create_dir(location)
+
+    hashes = block_hashes(dag)
+    saved_paths = []
+    for path in basis_paths:
+        if not path.name:
+            continue
+        output_folder = os.path.join(temp_dir, path.name)
+        saved_folder = os.path.join(location, path.name)
+        create_dir(saved_folder)
+        if os.path.isdir(output_folder):
+            for filename in os.listdir(output_folder):
+                if re.search(INPUT_FILE_PATTERN, filename):
+                    shutil.copy(os.path.join(output_folder, filename), saved_folder)
+        saved_paths.append(
+            {
+                "name": path.name,
+                "blocks": [hashes[node] for node in path.nodes],
+                "measured_value": path.measured_value,
+            }
+        )
+
+    state = {
+        "version": INCREMENTAL_STATE_VERSION,
+        "blocks": sorted(hashes.values()),
+        "edges": sorted([hashes[source], hashes[sink]] for source, sink in dag.edges),
+        "basis_paths": saved_paths,
+    }
+    temp_location = os.path.join(location, "%s.tmp" % STATE_FILENAME)
+    with open(temp_location, "w") as state_file:
+        json.dump(state, state_file)
+    os.replace(temp_location, os.path.join(location, STATE_FILENAME))
+    logger.info("Saved %d basis paths to %s." % (len(saved_paths), location))
+
+
+def read_basis_paths(location: str) -> Optional[Dict[str, Any]]:
+    """
+    Parameters:
+        location: str :
+            Location of the directory that basis paths were saved to
+            by `save_basis_paths`.
+
+    Returns:
+        Description of the DAG and of the basis paths saved in
+        the directory, or None if there are none, or if they were saved
+        by a different version of GameTime.
+    """
+    state_location = os.path.join(location, STATE_FILENAME)
+    if not os.path.exists(state_location):
+        logger.info("No basis paths of a previous analysis found at %s." % location)
+        return None
+    try:
+        with open(state_location, "r") as state_file:
+            state = json.load(state_file)
+    except (OSError, ValueError) as e:
+        logger.warning("Unable to read the basis paths at %s: %s" % (location, e))
+        return None
+    if state.get("version") != INCREMENTAL_STATE_VERSION:
+        logger.warning("Ignoring basis paths with a different version: %s" % location)
+        return None
+    return state
+
+
+def match_basis_paths(
+    state: Dict[str, Any], dag: Dag
+) -> List[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Finds the saved basis paths that only go through basic blocks that
+    did not change. A basic block did not change if exactly one node of
+    the previous DAG and exactly one node of the current DAG have its hash,
+    and a saved path is kept if each of its blocks did not change and each
+    of its edges is still an edge of the current DAG.
+
+    Parameters:
+        state: Dict[str, Any] :
+            Description of the previous DAG and of its basis paths,
+            as returned by `read_basis_paths`.
+        dag: Dag :
+            Current DAG.
+
+    Returns:
+        List of tuples, each of which contains the description of a saved
+        basis path that is kept, and the nodes of the current DAG along it.
+    """
+    previous_counts = collections.Counter(state["blocks"])
+    current_nodes = _unique_hashes(block_hashes(dag))
+    unchanged = {
+        block_hash: node
+        for block_hash, node in current_nodes.items()
+        if previous_counts[block_hash] == 1
+    }
+    logger.info(
+        "%d of the %d basic blocks are unchanged since the previous analysis."
+        % (len(unchanged), dag.num_nodes)
+    )
+
+    kept = []
+    for saved_path in state["basis_paths"]:
+        if not all(block_hash in unchanged for block_hash in saved_path["blocks"]):
+            continue
+        nodes = [unchanged[block_hash] for block_hash in saved_path["blocks"]]
+        if nodes[0] != dag.source or nodes[-1] != dag.sink:
+            continue
+        if all(dag.has_edge(source, sink) for source, sink in Dag.get_edges(nodes)):
+            kept.append((saved_path, nodes))
+    logger.info(
+        "%d of the %d basis paths of the previous analysis are kept."
+        % (len(kept), len(state["basis_paths"]))
+    )
+    return kept
+
+
+def restore_inputs(location: str, path_name: str, output_folder: str) -> None:
+    """
+    Copies the saved inputs of a basis path to its new output folder.
+
+    Parameters:
+        location: str :
+            Location of the directory that the basis path was saved to.
+        path_name: str :
+            Name of the basis path when it was saved.
+        output_folder: str :
+            Location of the new output folder of the basis path.
+    """
+    saved_folder = os.path.join(location, path_name)
+    for filename in os.listdir(saved_folder):
+        shutil.copy(os.path.join(saved_folder, filename), output_folder)
+
+
+def select_basis_rows(rows: np.ndarray) -> Tuple[List[int], List[int]]:
+    """
+    Selects a maximal set of linearly independent rows from the rows
+    provided, and the columns that rows of the identity matrix must cover
+    to complete the selected rows into a nonsingular square matrix.
+    The selection uses QR factorizations with column pivoting: one of
+    the transpose of the rows provided, to pick the rows, and one of
+    the picked rows, to pick the columns that they already cover.
+
+    Parameters:
+        rows: np.ndarray :
+            Matrix whose rows are the vectors of candidate rows.
+
+    Returns:
+        Tuple of the indices of the rows that were selected, in order, and
+        the indices of the columns whose rows of the identity matrix,
+        placed after the selected rows, complete them into
+        a nonsingular matrix.
+    """
+    dimension = rows.shape[1]
+    if rows.shape[0] == 0:
+        return [], list(range(dimension))
+
+    def rank(r: np.ndarray) -> int:
+        diagonal = np.abs(np.diag(r))
+        if diagonal.size == 0 or diagonal[0] == 0:
+            return 0
+        tolerance = diagonal[0] * max(r.shape) * np.finfo(float).eps
+        return int(np.count_nonzero(diagonal > tolerance))
+
+    _, r, row_pivots = scipy.linalg.qr(rows.T, mode="economic", pivoting=True)
+    selected = sorted(row_pivots[: rank(r)].tolist())
+    if not selected:
+        return [], list(range(dimension))
+
+    _, _, column_pivots = scipy.linalg.qr(
+        rows[selected], mode="economic", pivoting=True
+    )
+    return selected, sorted(column_pivots[len(selected) :].tolist())
@@ -3,7 +3,7 @@
 """Exposes classes and functions to supplement those provided by
 the NetworkX graph package.
 """
-from typing import List, Dict, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 """See the LICENSE file, located in the root directory of
 the source distribution and
@@ -11,6 +11,7 @@ at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
 for details on the GameTime license and authors.
 """
 
+import functools
 import os
 
 from random import randrange
@@ -18,6 +19,7 @@ from random import randrange
 import networkx as nx
 
 from defaults import logger
+from dot_cfg_parser import parse_dot_cfg
 from gametime_error import GameTimeError
 
 
@@ -37,7 +39,62 @@ def find_root_node(G):
     return None
 
 
-def remove_back_edges_to_make_dag(G, root):
+def find_back_edges(G, root=None, first_only: bool = False) -> List[Tuple[str, str]]:
+    """
+    Finds the back edges of G, that is, the edges from a node to one of
+    its ancestors in a depth-first search of G, in a single iterative
+    depth-first search, in time linear in the size of G. G has cycles
+    if, and only if, it has back edges, and removing them makes it acyclic.
+
+    Parameters:
+        G :
+            The graph to find back edges in
+        root :
+            The node of G to start the depth-first search with, if any.
+            The nodes not reached from it are searched afterwards.
+        first_only: bool :
+            Whether to stop at the first back edge found, which suffices
+            to tell whether G has cycles.
+
+    Returns:
+        List of the back edges of G, in the order in which they are found.
+    """
+    visited = set()
+    # Nodes on the current path of the search, which are the ancestors of
+    # the node at the top of the stack.
+    on_stack = set()
+    back_edges = []
+    start_nodes = ([root] if root is not None else []) + list(G.nodes())
+    for start_node in start_nodes:
+        if start_node in visited:
+            continue
+        # Iteratively perform DFS on unvisited nodes
+        stack = [(start_node, iter(G.neighbors(start_node)))]
+        visited.add(start_node)
+        on_stack.add(start_node)
+
+        while stack:
+            parent, children = stack[-1]
+            try:
+                child = next(children)
+                if child not in visited:
+                    visited.add(child)
+                    on_stack.add(child)
+                    stack.append((child, iter(G.neighbors(child))))
+                elif child in on_stack:
+                    # If child is in stack, it's an ancestor, and (parent, child) is a back edge
+                    back_edges.append((parent, child))
+                    if first_only:
+                        return back_edges
+            except StopIteration:
+                stack.pop()
+                on_stack.discard(parent)
+    return back_edges
+
+
+def remove_back_edges_to_make_dag(
+    G, root, back_edges: Optional[Iterable[Tuple[str, str]]] = None
+):
     """
     Remove all back edges from G to make it a DAG. Assuming G is connected and rooted at ROOT.
 
@@ -46,29 +103,16 @@ def remove_back_edges_to_make_dag(G, root):
             The graph to remove root edges
         root :
             The root node of G to start DFS with
+        back_edges: Optional[Iterable[Tuple[str, str]]] :
+            Back edges of G, as found by ``find_back_edges``, if they
+            were found already; otherwise, they are found here.
 
     Returns:
         DAG version of G with all back edges removed.
     """
-    visited = {node: False for node in G.nodes()}
-    back_edges = []
-    start_node = root
-    # Iteratively perform DFS on unvisited nodes
-    stack = [(start_node, iter(G.neighbors(start_node)))]
-    visited[start_node] = True
-
-    while stack:
-        parent, children = stack[-1]
-        try:
-            child = next(children)
-            if not visited[child]:
-                visited[child] = True
-                stack.append((child, iter(G.neighbors(child))))
-            elif child in [node for node, _ in stack]:
-                # If child is in stack, it's an ancestor, and (parent, child) is a back edge
-                back_edges.append((parent, child))
-        except StopIteration:
-            stack.pop()
+    if back_edges is None:
+        back_edges = find_back_edges(G, root)
+    back_edges = list(back_edges)
 
     # Find original sink before removing back edges.
     original_sink = [node for node in G.nodes() if G.out_degree(node) == 0][0]
@@ -93,6 +137,27 @@ def remove_back_edges_to_make_dag(G, root):
     return G
 
 
+def _invalidates_acyclicity(method):
+    """
+    Parameters:
+        method :
+            Method of `~networkx.DiGraph` that changes the nodes or
+            the edges of the graph.
+
+    Returns:
+        Method that calls the method provided, and then forgets whether
+        the ``Dag`` has cycles, since that may have changed.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        self._has_cycles = None
+        return result
+
+    return wrapper
+
+
 class Dag(nx.DiGraph):
     """
     Maintains information about the directed acyclic graph (DAG)
@@ -170,6 +235,25 @@ class Dag(nx.DiGraph):
         #: in the same order as the edges are in the list of all_temp_files edges.
         self.edge_weights: List[int] = []
 
+        # Whether the DAG has cycles, found by ``has_cycles`` the first
+        # time that it is needed, and forgotten whenever the nodes or
+        # the edges of the DAG change.
+        self._has_cycles: Optional[bool] = None
+
+    # The methods that change the nodes or the edges of the DAG forget
+    # whether it has cycles. The other methods of `~networkx.DiGraph`
+    # that change them, such as ``update``, call these.
+    add_node = _invalidates_acyclicity(nx.DiGraph.add_node)
+    add_nodes_from = _invalidates_acyclicity(nx.DiGraph.add_nodes_from)
+    remove_node = _invalidates_acyclicity(nx.DiGraph.remove_node)
+    remove_nodes_from = _invalidates_acyclicity(nx.DiGraph.remove_nodes_from)
+    add_edge = _invalidates_acyclicity(nx.DiGraph.add_edge)
+    add_edges_from = _invalidates_acyclicity(nx.DiGraph.add_edges_from)
+    remove_edge = _invalidates_acyclicity(nx.DiGraph.remove_edge)
+    remove_edges_from = _invalidates_acyclicity(nx.DiGraph.remove_edges_from)
+    clear = _invalidates_acyclicity(nx.DiGraph.clear)
+    clear_edges = _invalidates_acyclicity(nx.DiGraph.clear_edges)
+
     def initialize_dictionaries(self):
         """ """
         self.num_nodes = self.number_of_nodes()
@@ -232,18 +316,20 @@ class Dag(nx.DiGraph):
         to keep track of these special edges.
 
         """
-        self.edges_reduced = list(self.all_edges)
-
+        special_edges = set()
         for node in self.nodes_except_source_sink:
             out_edges = self.out_edges(node)
             out_edges = list(out_edges)
             if len(out_edges) > 0:
                 # By default, we pick the first edge as 'special'.
                 self.special_edges[node] = out_edges[0]
-                self.edges_reduced.remove(out_edges[0])
+                special_edges.add(out_edges[0])
 
+        self.edges_reduced = [
+            edge for edge in self.all_edges if edge not in special_edges
+        ]
         for edge in self.edges_reduced:
-            self.edges_reduced_indices[edge] = list(self.all_edges).index(edge)
+            self.edges_reduced_indices[edge] = self.edges_indices[edge]
 
     @staticmethod
     def get_edges(nodes: List[str]) -> List[Tuple[str, str]]:
@@ -357,9 +443,15 @@ def construct_dag(location: str) -> tuple[Dag, bool]:
             Object that represents the directed acyclic graph.
 
     """
+    # The file is read into a ``Dag`` object directly, in a single pass, if
+    # it is in the dialect of DOT that ``opt -passes=dot-cfg`` writes, and
+    # with ``read_dot``, which needs the Graphviz library, otherwise.
     try:
         with open(location, "r") as f:
-            graph_from_dot: nx.Graph = nx.nx_agraph.read_dot(f)
+            graph_from_dot: nx.Graph = Dag()
+            if not parse_dot_cfg(f, graph_from_dot):
+                f.seek(0)
+                graph_from_dot = nx.nx_agraph.read_dot(f)
 
     except EnvironmentError as e:
         err_msg: str = (
@@ -381,15 +473,20 @@ def construct_dag(location: str) -> tuple[Dag, bool]:
     if len(sink_nodes) != 1:
         raise GameTimeError("The number of sink nodes don't equal to 1.")
 
+    # The graph has cycles if, and only if, the depth-first search finds
+    # back edges, which are then the edges to remove.
     modified = False
-    if len(list(nx.simple_cycles(graph_from_dot))) > 0:
+    back_edges = find_back_edges(graph_from_dot, root)
+    if back_edges:
         logger.warning(
             "The control-flow graph has cycles. Trying to remove them by removing back edges."
         )
-        graph_from_dot = remove_back_edges_to_make_dag(graph_from_dot, root)
+        graph_from_dot = remove_back_edges_to_make_dag(graph_from_dot, root, back_edges)
         modified = True
 
-    dag: Dag = Dag(graph_from_dot)
+    dag: Dag = (
+        graph_from_dot if isinstance(graph_from_dot, Dag) else Dag(graph_from_dot)
+    )
     dag.load_variables()
     return dag, modified
 
@@ -482,7 +579,13 @@ def has_cycles(dag: Dag) -> bool:
 
     Returns:
         bool:
-            `True` if, and only if, the DAG provided has cycles.
+            `True` if, and only if, the DAG provided has cycles. This is
+            found in time linear in the size of the DAG, and, for
+            a ``Dag`` object, only once until the DAG changes.
 
     """
-    return len(list(nx.simple_cycles(dag))) > 0
+    if not isinstance(dag, Dag):
+        return len(find_back_edges(dag, first_only=True)) > 0
+    if dag._has_cycles is None:
+        dag._has_cycles = len(find_back_edges(dag, first_only=True)) > 0
+    return dag._has_cycles
@@ -11,6 +11,7 @@ from ast import literal_eval
 
 from pulp import PulpError
 
+from defaults import logger
 from gametime_error import GameTimeError
 from index_expression import (
     VariableIndexExpression,
@@ -103,30 +104,33 @@ class Path(object):
     def write_ilp_problem_to_lp_file(self, location) -> None:
         """
         Writes, to an LP file, the integer linear programming problem that,
-        when solved, produced this path.
+        when solved, produced this path. Paths that were not produced by
+        an integer linear program built with PuLP, such as the candidate
+        paths that are enumerated, or found by dynamic programming, in
+        the cache of solutions, or with the program in matrix form, have
+        no program to write: they are skipped with a log message.
 
         Parameters:
             location :
                 Location of the file
 
         """
-        if self.ilp_problem is not None:
-            _, extension = os.path.splitext(location)
-            if extension.lower() != ".lp":
-                location += ".lp"
-            try:
-                self.ilp_problem.writeLP(location)
-            except (PulpError, EnvironmentError) as e:
-                err_msg = (
-                    "Error writing the integer linear programming "
-                    "problem to an LP file: %s"
-                ) % e
-                raise GameTimeError(err_msg)
-        else:
-            err_msg = (
-                "This path is not associated with an integer linear "
-                "programming problem."
+        if self.ilp_problem is None or not self.ilp_problem.holds_program:
+            logger.info(
+                "Path %s was not produced by an integer linear program in PuLP: "
+                "no LP file is written." % self.name
             )
+            return
+        _, extension = os.path.splitext(location)
+        if extension.lower() != ".lp":
+            location += ".lp"
+        try:
+            self.ilp_problem.writeLP(location)
+        except (PulpError, EnvironmentError) as e:
+            err_msg = (
+                "Error writing the integer linear programming "
+                "problem to an LP file: %s"
+            ) % e
             raise GameTimeError(err_msg)
 
     def get_nodes(self) -> str:
@@ -1,5 +1,7 @@
 import os
 import re
+from concurrent.futures import Executor, Future
+
 import file_helper
 from nx_helper import Dag
 from path import Path
@@ -95,6 +97,40 @@ class PathAnalyzer(object):
             )
         return self.is_valid
 
+    def submit_feasibility_check(self, executor: Executor) -> Future:
+        """
+        Submits the feasibility check of the path to the executor provided,
+        so that it can run concurrently with other checks. The result of
+        the returned future must be passed to `set_feasibility` before
+        the path is measured.
+
+        Parameters:
+            executor: Executor :
+                Executor, such as a process pool, to run the check in
+
+        Returns:
+            Future whose result is True if the path is feasible,
+            and False otherwise.
+        """
+        return executor.submit(
+            run_smt,
+            self.project_config,
+            self.labels_file,
+            self.output_folder,
+            self.total_num_labels,
+        )
+
+    def set_feasibility(self, is_valid: bool) -> None:
+        """
+        Records the result of a feasibility check that was run elsewhere,
+        such as by `submit_feasibility_check`.
+
+        Parameters:
+            is_valid: bool :
+                True if the path is feasible, and False otherwise.
+        """
+        self.is_valid = is_valid
+
     def measure_path(self, backend: Backend) -> int:
         """
         run the entire simulation on the given path
@@ -0,0 +1,153 @@
+#!/usr/bin/env python
+
+"""Exposes a class to encode paths through a directed acyclic graph as
+vectors over the 'non-special' edges of the graph, which are the vectors
+that make up the rows of the basis matrix.
+"""
+
+from typing import Dict, List, Sequence, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import numpy as np
+import scipy.sparse
+
+from nx_helper import Dag
+
+
+class PathEncoder(object):
+    """
+    Encodes paths through a ``Dag`` as 0-1 vectors that are 1 at
+    the position of a 'non-special' edge along the path, and 0 otherwise.
+
+    The 'non-special' edges are mapped to integer columns once, when this
+    object is created, so that encoding a path costs one dictionary lookup
+    per edge along the path, rather than one list scan per 'non-special'
+    edge of the graph.
+
+    Parameters:
+        dag:
+            ``Dag`` object whose paths are encoded. Its special edges
+            must have been initialized.
+    """
+
+    def __init__(self, dag: Dag):
+        #: Number of columns of an encoded path, which is the number of
+        #: `non-special' edges in the DAG.
+        self.num_columns: int = len(dag.edges_reduced)
+
+        #: Number of edges in the DAG.
+        self.num_edges: int = dag.num_edges
+
+        #: Dictionary that maps each `non-special' edge to its column.
+        self.edge_columns: Dict[Tuple[str, str], int] = {
+            edge: column for column, edge in enumerate(dag.edges_reduced)
+        }
+
+        #: Array whose element j is the position, in the list of all edges
+        #: of the DAG, of the `non-special' edge in column j.
+        self.edge_positions: np.ndarray = np.array(
+            [dag.edges_reduced_indices[edge] for edge in dag.edges_reduced],
+            dtype=np.intp,
+        )
+
+    def encode_edges(self, edges: Sequence[Tuple[str, str]]) -> np.ndarray:
+        """
+        Parameters:
+            edges: Sequence[Tuple[str, str]] :
+                Edges along a path.
+
+        Returns:
+            Sorted array of the columns of the `non-special' edges
+            along the path.
+        """
+        edge_columns = self.edge_columns
+        columns = [edge_columns[edge] for edge in edges if edge in edge_columns]
+        return np.unique(np.array(columns, dtype=np.intp))
+
+    def encode(self, nodes: Sequence[str]) -> np.ndarray:
+        """
+        Parameters:
+            nodes: Sequence[str] :
+                Nodes along a path, in order of traversal.
+
+        Returns:
+            Sorted array of the columns of the `non-special' edges
+            along the path.
+        """
+        return self.encode_edges(Dag.get_edges(list(nodes)))
+
+    def bitset(self, nodes: Sequence[str]) -> bytes:
+        """
+        Parameters:
+            nodes: Sequence[str] :
+                Nodes along a path, in order of traversal.
+
+        Returns:
+            Encoding of the path as a packed bitset, which can be hashed
+            and compared to detect paths with the same encoding.
+        """
+        return np.packbits(self.dense(nodes).astype(np.uint8)).tobytes()
+
+    def dense(self, nodes: Sequence[str]) -> np.ndarray:
+        """
+        Parameters:
+            nodes: Sequence[str] :
+                Nodes along a path, in order of traversal.
+
+        Returns:
+            0-1 vector that is 1 if a `non-special' edge is along the path,
+            and 0 otherwise.
+        """
+        row = np.zeros(self.num_columns)
+        row[self.encode(nodes)] = 1.0
+        return row
+
+    def sparse_rows(self, paths: Sequence[Sequence[str]]) -> scipy.sparse.csr_matrix:
+        """
+        Parameters:
+            paths: Sequence[Sequence[str]] :
+                Paths, each of which is a list of the nodes along
+                the path, in order of traversal.
+
+        Returns:
+            Sparse matrix whose row i is the encoding of path i.
+        """
+        encoded = [self.encode(nodes) for nodes in paths]
+        indptr = np.zeros(len(encoded) + 1, dtype=np.intp)
+        indptr[1:] = np.cumsum([len(columns) for columns in encoded])
+        indices = np.concatenate(encoded) if encoded else np.zeros(0, dtype=np.intp)
+        data = np.ones(len(indices))
+        return scipy.sparse.csr_matrix(
+            (data, indices, indptr), shape=(len(encoded), self.num_columns)
+        )
+
+    def dense_rows(self, paths: Sequence[Sequence[str]]) -> np.ndarray:
+        """
+        Parameters:
+            paths: Sequence[Sequence[str]] :
+                Paths, each of which is a list of the nodes along
+                the path, in order of traversal.
+
+        Returns:
+            Matrix whose row i is the encoding of path i.
+        """
+        return self.sparse_rows(paths).toarray()
+
+    def expand(self, reduced_values: Sequence[float]) -> List[float]:
+        """
+        Parameters:
+            reduced_values: Sequence[float] :
+                Values of the `non-special' edges, in column order.
+
+        Returns:
+            List of values of all of the edges of the DAG, in the order of
+            the list of all edges, where the special edges have value 0.
+        """
+        values = np.zeros(self.num_edges)
+        values[self.edge_positions] = reduced_values
+        return values.tolist()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python
+
+"""Exposes a class to lazily enumerate the paths through a weighted
+directed acyclic graph in order of value, and a function to enumerate them
+in the order in which ``pulp_helper.find_extreme_path`` would find them,
+if each path found were excluded before the next one is found.
+"""
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+"""See the LICENSE file, located in the root directory of
+the source distribution and
+at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
+for details on the GameTime license and authors.
+"""
+
+import heapq
+import itertools
+
+import networkx as nx
+
+from gametime_error import GameTimeError
+from nx_helper import Dag
+
+
+class _HeapNode(object):
+    """
+    Node of a persistent leftist heap. Nodes are never modified after they
+    are created, so heaps that are made by inserting into a heap share all
+    but a logarithmic number of nodes with it.
+
+    Parameters:
+        key: float :
+            Key of the node.
+        item: str :
+            Item stored at the node.
+        left: Optional[_HeapNode] :
+            Left subheap.
+        right: Optional[_HeapNode] :
+            Right subheap.
+    """
+
+    __slots__ = ("key", "item", "left", "right", "rank")
+
+    def __init__(
+        self,
+        key: float,
+        item: str,
+        left: Optional["_HeapNode"] = None,
+        right: Optional["_HeapNode"] = None,
+    ):
+        self.key = key
+        self.item = item
+        self.left = left
+        self.right = right
+        self.rank = (right.rank if right is not None else 0) + 1
+
+
+def _merge_heaps(
+    first: Optional[_HeapNode], second: Optional[_HeapNode]
+) -> Optional[_HeapNode]:
+    """
+    Parameters:
+        first: Optional[_HeapNode] :
+            Persistent leftist heap.
+        second: Optional[_HeapNode] :
+            Persistent leftist heap.
+
+    Returns:
+        Persistent leftist heap that contains the items of both heaps,
+        which are left unchanged.
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    if second.key < first.key:
+        first, second = second, first
+    left, right = first.left, _merge_heaps(first.right, second)
+    if left is None or left.rank < right.rank:
+        left, right = right, left
+    return _HeapNode(first.key, first.item, left, right)
+
+
+class PathEnumerator(object):
+    """
+    Lazily enumerates the paths from the source to the sink of a ``Dag``,
+    in decreasing order of value, for the longest paths, or in increasing
+    order of value, for the shortest paths, where the value of a path is
+    the sum of the weights on the edges along it.
+
+    The enumeration follows Eppstein's algorithm. The extreme paths from
+    each node to the sink form a tree, and every other path is the path
+    along the tree, from the source, that takes a sequence of `sidetrack'
+    edges off the tree. Each sidetrack edge costs the difference between
+    the extreme value of the path from its tail and the value of the path
+    that starts with it. The sidetracks that can follow each node are kept
+    in a persistent heap, which is built once, so each path is generated
+    from the path before it in logarithmic time. Enumerating k paths takes
+    O(E log V + k log k) time, for a DAG with E edges and V nodes, in
+    addition to the time to list the nodes along each path.
+
+    Parameters:
+        dag: Dag :
+            DAG whose paths are enumerated.
+        edge_weights: Sequence[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges, such as ``Dag.edge_weights``.
+        longest: bool :
+            True if the paths are enumerated from the longest to
+            the shortest, and False if they are enumerated from
+            the shortest to the longest.
+    """
+
+    def __init__(self, dag: Dag, edge_weights: Sequence[float], longest: bool = True):
+        #: DAG whose paths are enumerated.
+        self.dag: Dag = dag
+
+        #: Weights on all of the edges of the DAG, in the order of
+        #: the list of all edges.
+        self.edge_weights: Sequence[float] = edge_weights
+
+        #: True if the paths are enumerated from the longest to the shortest.
+        self.longest: bool = longest
+
+        sign = -1 if longest else 1
+        edges_indices = dag.edges_indices
+
+        # Smallest cost of a path from each node to the sink, where
+        # the cost of a path is its value for the shortest paths, and
+        # the negation of its value for the longest paths, and the edge
+        # from each node along the path of smallest cost.
+        costs: Dict[str, float] = {dag.sink: 0}
+        self._tree_edges: Dict[str, Tuple[str, str]] = {}
+        # Sidetrack edges from each node, with their costs, in increasing
+        # order of cost.
+        self._sidetracks: Dict[str, List[Tuple[float, Tuple[str, str]]]] = {}
+        # Persistent heap of the first sidetrack edges from the nodes along
+        # the path of smallest cost from each node to the sink.
+        self._tree_heaps: Dict[str, Optional[_HeapNode]] = {dag.sink: None}
+
+        for node in reversed(list(nx.topological_sort(dag))):
+            out_edges = [
+                (sign * edge_weights[edges_indices[edge]] + costs[edge[1]], edge)
+                for edge in dag.out_edges(node)
+                if edge[1] in costs
+            ]
+            if not out_edges:
+                continue
+            out_edges.sort(key=lambda out_edge: out_edge[0])
+            cost, tree_edge = out_edges[0]
+            costs[node] = cost
+            self._tree_edges[node] = tree_edge
+
+            tree_heap = self._tree_heaps[tree_edge[1]]
+            sidetracks = [(edge_cost - cost, edge) for edge_cost, edge in out_edges[1:]]
+            if sidetracks:
+                self._sidetracks[node] = sidetracks
+                tree_heap = _merge_heaps(tree_heap, _HeapNode(sidetracks[0][0], node))
+            self._tree_heaps[node] = tree_heap
+
+        self._costs = costs
+
+    def _nodes_along(self, sidetracks: Optional[tuple]) -> List[str]:
+        """
+        Parameters:
+            sidetracks: Optional[tuple] :
+                Sidetrack edges taken by a path, as a linked list of pairs
+                whose first element is the last sidetrack edge, and whose
+                second element is the list of the sidetrack edges before it.
+
+        Returns:
+            Nodes along the path, in order of traversal.
+        """
+        ordered_sidetracks = []
+        while sidetracks is not None:
+            edge, sidetracks = sidetracks
+            ordered_sidetracks.append(edge)
+        ordered_sidetracks.reverse()
+
+        tree_edges = self._tree_edges
+        node = self.dag.source
+        nodes = [node]
+        for tail, head in ordered_sidetracks:
+            while node != tail:
+                node = tree_edges[node][1]
+                nodes.append(node)
+            node = head
+            nodes.append(node)
+        while node != self.dag.sink:
+            node = tree_edges[node][1]
+            nodes.append(node)
+        return nodes
+
+    def _value(self, nodes: List[str]) -> float:
+        """
+        Parameters:
+            nodes: List[str] :
+                Nodes along a path, in order of traversal.
+
+        Returns:
+            Sum of the weights on the edges along the path.
+        """
+        edges_indices = self.dag.edges_indices
+        return sum(
+            self.edge_weights[edges_indices[edge]] for edge in Dag.get_edges(nodes)
+        )
+
+    def __iter__(self) -> Iterator[Tuple[List[str], float]]:
+        """
+        Returns:
+            Iterator over tuples, each of which contains the nodes along
+            a path, in order of traversal, and the value of the path.
+        """
+        source = self.dag.source
+        if source not in self._costs:
+            return
+
+        nodes = self._nodes_along(None)
+        yield nodes, self._value(nodes)
+
+        # Each entry of the queue is a path, described by its cost,
+        # the position of its last sidetrack edge, either in a tree heap
+        # or in the list of sidetrack edges from a node, and the sidetrack
+        # edges before the last one.
+        sidetracks = self._sidetracks
+        tree_heaps = self._tree_heaps
+        counter = itertools.count()
+        queue = []
+
+        def push_tree_heap(cost, heap_node, previous):
+            if heap_node is not None:
+                heapq.heappush(
+                    queue,
+                    (cost + heap_node.key, next(counter), heap_node, None, 0, previous),
+                )
+
+        def push_sidetrack(cost, node, index, previous):
+            if index < len(sidetracks[node]):
+                heapq.heappush(
+                    queue,
+                    (
+                        cost + sidetracks[node][index][0],
+                        next(counter),
+                        None,
+                        node,
+                        index,
+                        previous,
+                    ),
+                )
+
+        push_tree_heap(self._costs[source], tree_heaps[source], None)
+        while queue:
+            cost, _, heap_node, node, index, previous = heapq.heappop(queue)
+            if heap_node is not None:
+                node = heap_node.item
+            sidetrack_cost, sidetrack = sidetracks[node][index]
+            path_sidetracks = (sidetrack, previous)
+
+            nodes = self._nodes_along(path_sidetracks)
+            yield nodes, self._value(nodes)
+
+            # Replace the last sidetrack edge with the next one in the heap
+            # or in the list that it was taken from.
+            base_cost = cost - sidetrack_cost
+            if heap_node is not None:
+                push_tree_heap(base_cost, heap_node.left, previous)
+                push_tree_heap(base_cost, heap_node.right, previous)
+            push_sidetrack(base_cost, node, index + 1, previous)
+            # Take one more sidetrack edge after the last one.
+            push_tree_heap(cost, tree_heaps[sidetrack[1]], path_sidetracks)
+
+
+def can_enumerate_extreme_paths(
+    edge_weights: Sequence[float], longest: bool = True
+) -> bool:
+    """
+    Parameters:
+        edge_weights: Sequence[float] :
+            Weights on all of the edges of a DAG.
+        longest: bool :
+            True if the paths with the largest absolute values are
+            needed first, and False if the paths with the smallest
+            absolute values are needed first.
+
+    Returns:
+        True if ``extreme_paths`` can enumerate the paths with these
+        weights. The paths with the smallest absolute values can only be
+        enumerated if no two edge weights have different signs.
+    """
+    return (
+        longest
+        or all(edge_weight >= 0 for edge_weight in edge_weights)
+        or all(edge_weight <= 0 for edge_weight in edge_weights)
+    )
+
+
+def extreme_paths(
+    dag: Dag, edge_weights: Sequence[float], longest: bool = True
+) -> Iterator[Tuple[List[str], float]]:
+    """
+    Lazily enumerates the paths through a DAG in the order in which
+    ``pulp_helper.find_extreme_path`` would find them, if each path found
+    were excluded by an exclusive path constraint before the next one is
+    found: in decreasing order of absolute value, for the longest paths,
+    and in increasing order of absolute value, for the shortest paths.
+
+    The paths with nonnegative values, in decreasing order of value, and
+    the paths with negative values, in increasing order of value, are
+    enumerated separately, and merged.
+
+    Parameters:
+        dag: Dag :
+            DAG whose paths are enumerated.
+        edge_weights: Sequence[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges. If the paths with the smallest absolute
+            values are needed first, no two weights can have different
+            signs; refer to ``can_enumerate_extreme_paths``.
+        longest: bool :
+            True if the paths with the largest absolute values are needed
+            first, and False if the paths with the smallest absolute
+            values are needed first.
+
+    Returns:
+        Iterator over tuples, each of which contains the nodes along
+        a path, in order of traversal, and the absolute value of the path.
+    """
+    nonnegative = all(edge_weight >= 0 for edge_weight in edge_weights)
+    nonpositive = all(edge_weight <= 0 for edge_weight in edge_weights)
+    if nonnegative or nonpositive:
+        enumerator = PathEnumerator(dag, edge_weights, longest == nonnegative)
+        for nodes, value in enumerator:
+            yield nodes, abs(value)
+        return
+
+    if not longest:
+        raise GameTimeError(
+            "Paths cannot be enumerated in increasing order of absolute value "
+            "when the edge weights have different signs."
+        )
+
+    positive_paths = itertools.takewhile(
+        lambda path: path[1] >= 0, PathEnumerator(dag, edge_weights, True)
+    )
+    negative_paths = (
+        (nodes, -value)
+        for nodes, value in itertools.takewhile(
+            lambda path: path[1] < 0, PathEnumerator(dag, edge_weights, False)
+        )
+    )
+    positive, negative = next(positive_paths, None), next(negative_paths, None)
+    while positive is not None or negative is not None:
+        if negative is None or (positive is not None and positive[1] >= negative[1]):
+            yield positive
+            positive = next(positive_paths, None)
+        else:
+            yield negative
+            negative = next(negative_paths, None)
@@ -11,9 +11,14 @@ at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
 for details on the GameTime license and authors.
 """
 
+import collections
+import contextlib
+import itertools
 import time
+from concurrent.futures import ProcessPoolExecutor
 
 import nx_helper
+import path_enumeration
 import pulp_helper
 
 from defaults import logger
@@ -22,6 +27,10 @@ from nx_helper import Dag
 from path import Path
 from path_analyzer import PathAnalyzer
 
+# Largest number of worst-case or best-case candidate paths that are found
+# at once, and whose feasibility is checked concurrently.
+MAX_CANDIDATE_BATCH_SIZE = 64
+
 
 class PathType(object):
     """Represents the type of paths that can be generated."""
@@ -285,76 +294,274 @@ class PathGenerator(object):
         else:
             analyzer.estimate_edge_weights()
 
+        candidate_paths = PathGenerator._enumerate_candidate_paths(
+            analyzer, extremum, interval, use_ob_extraction
+        )
+        # The worst-case and the best-case candidate paths are found in
+        # batches, whose feasibility is checked concurrently. The candidate
+        # paths for the overcomplete basis extraction algorithm, and
+        # the random candidate paths, are found one at a time.
+        batched = extremum is not None and not use_ob_extraction
+        candidate_batch = collections.deque()
+
         result_paths = []
         current_path_num, num_paths_unsat, num_candidate_paths = 0, 0, 0
-        while (
-            current_path_num < num_paths
-            and num_candidate_paths < analyzer.dag.num_paths
-        ):
-            logger.info("Currently generating path %d..." % (current_path_num + 1))
-            logger.info(
-                "So far, %d candidate paths were found to be "
-                "unsatisfiable." % num_paths_unsat
-            )
-
-            if analyzer.path_dimension == 1:
-                warn_msg = (
-                    "Basis matrix has dimensions 1x1. "
-                    "There is only one path through the function "
-                    "under analysis."
+        num_jobs = analyzer.project_config.NUM_JOBS
+        # The feasibility checks of a batch run in a process pool only if
+        # more than one of them can run at a time; otherwise, each check
+        # runs in this process when its candidate path is reached.
+        with (
+            ProcessPoolExecutor(max_workers=num_jobs)
+            if batched and num_jobs > 1
+            else contextlib.nullcontext()
+        ) as executor:
+            while (
+                current_path_num < num_paths
+                and num_candidate_paths < analyzer.dag.num_paths
+            ):
+                logger.info("Currently generating path %d..." % (current_path_num + 1))
+                logger.info(
+                    "So far, %d candidate paths were found to be "
+                    "unsatisfiable." % num_paths_unsat
                 )
-                logger.warning(warn_msg)
-
-            logger.info(
-                "Finding a candidate path using an integer " "linear program..."
-            )
-            logger.info("")
 
-            if extremum is None:
-                source, sink = analyzer.dag.source, analyzer.dag.sink
-                candidate_path_nodes = nx_helper.get_random_path(
-                    analyzer.dag, source, sink
-                )
+                if analyzer.path_dimension == 1:
+                    warn_msg = (
+                        "Basis matrix has dimensions 1x1. "
+                        "There is only one path through the function "
+                        "under analysis."
+                    )
+                    logger.warning(warn_msg)
+
+                path_analyzer, future = None, None
+                if batched:
+                    if not candidate_batch:
+                        candidate_batch.extend(
+                            PathGenerator._find_candidate_batch(
+                                analyzer,
+                                min(
+                                    num_paths - current_path_num,
+                                    MAX_CANDIDATE_BATCH_SIZE,
+                                ),
+                                num_candidate_paths,
+                                extremum,
+                                interval,
+                                candidate_paths,
+                                executor,
+                            )
+                        )
+                        if not candidate_batch:
+                            logger.info("Unable to find a new candidate path.")
+                            break
+                    (
+                        candidate_path_nodes,
+                        ilp_problem,
+                        path_name,
+                        path_analyzer,
+                        future,
+                    ) = candidate_batch.popleft()
+                else:
+                    logger.info(
+                        "Finding a candidate path using an integer linear program..."
+                    )
+                    logger.info("")
+
+                    if extremum is None:
+                        source, sink = analyzer.dag.source, analyzer.dag.sink
+                        candidate_path_nodes = nx_helper.get_random_path(
+                            analyzer.dag, source, sink
+                        )
+                        candidate_path_edges = Dag.get_edges(candidate_path_nodes)
+                        analyzer.add_path_bundled_constraint(candidate_path_edges)
+
+                    if use_ob_extraction:
+                        candidate_path_nodes, ilp_problem = (
+                            pulp_helper.find_longest_path_with_delta(
+                                analyzer, analyzer.basis_paths, mu_max, extremum
+                            )
+                        )
+                    else:
+                        candidate_path_nodes, ilp_problem = (
+                            pulp_helper.find_extreme_path(
+                                analyzer,
+                                (
+                                    extremum
+                                    if extremum is not None
+                                    else pulp_helper.Extremum.LONGEST
+                                ),
+                                interval,
+                            )
+                        )
+                    logger.info("")
+
+                    if ilp_problem.obj_val is None:
+                        if (
+                            extremum is not None
+                            or num_candidate_paths == analyzer.dag.num_paths
+                        ):
+                            logger.info("Unable to find a new candidate path.")
+                            break
+                        elif extremum is None:
+                            analyzer.add_path_exclusive_constraint(candidate_path_nodes)
+                            analyzer.reset_path_bundled_constraints()
+                            num_candidate_paths = len(
+                                analyzer.path_exclusive_constraints
+                            )
+                            continue
+
+                logger.info("Candidate path found.")
                 candidate_path_edges = Dag.get_edges(candidate_path_nodes)
-                analyzer.add_path_bundled_constraint(candidate_path_edges)
+                if use_ob_extraction:
+                    candidate_path_value = ilp_problem.obj_val
+                else:
+                    # The integer linear programs report the absolute value
+                    # of the path, which is kept as the predicted value.
+                    candidate_path_value = abs(
+                        float(analyzer.predict_path_values([candidate_path_nodes])[0])
+                    )
 
-            if use_ob_extraction:
-                candidate_path_nodes, ilp_problem = (
-                    pulp_helper.find_longest_path_with_delta(
-                        analyzer, analyzer.basis_paths, mu_max, extremum
+                # Check path feasibility using KLEE/SMT solver
+                logger.info("Checking feasibility...")
+                if path_analyzer is None:
+                    result_path = Path(
+                        ilp_problem=ilp_problem, nodes=candidate_path_nodes
                     )
-                )
-            else:
-                candidate_path_nodes, ilp_problem = pulp_helper.find_extreme_path(
-                    analyzer,
-                    extremum if extremum is not None else pulp_helper.Extremum.LONGEST,
-                    interval,
-                )
-            logger.info("")
-
-            if ilp_problem.obj_val is None:
-                if (
-                    extremum is not None
-                    or num_candidate_paths == analyzer.dag.num_paths
-                ):
-                    logger.info("Unable to find a new candidate path.")
-                    break
-                elif extremum is None:
-                    analyzer.add_path_exclusive_constraint(candidate_path_nodes)
+                    path_name = f"feasible-path{current_path_num}"
+                    path_analyzer = PathAnalyzer(
+                        analyzer.preprocessed_path,
+                        analyzer.project_config,
+                        analyzer.dag,
+                        result_path,
+                        path_name,
+                    )
+                    is_feasible = path_analyzer.check_feasibility()
+                else:
+                    result_path = path_analyzer.path
+                    if future is not None:
+                        path_analyzer.set_feasibility(future.result())
+                    is_feasible = path_analyzer.check_feasibility()
+                result_path.set_predicted_value(candidate_path_value)
+
+                if is_feasible:
+                    logger.info("Candidate path is feasible.")
+
+                    # Measure the path (now that we know it's feasible)
+                    logger.info("Measuring run time...")
+                    result_path.path_analyzer = path_analyzer
+                    result_path.name = path_name
+                    value = path_analyzer.measure_path(analyzer.backend)
+                    result_path.set_measured_value(value)
+                    result_paths.append(result_path)
+
+                    logger.info("Path %d generated." % (current_path_num + 1))
+                    if not batched:
+                        analyzer.add_path_exclusive_constraint(candidate_path_edges)
+                    current_path_num += 1
+                    num_paths_unsat = 0
+                else:
+                    logger.info("Candidate path is infeasible.")
+                    result_path.set_measured_value(float("inf"))
+                    if not batched:
+                        analyzer.add_path_exclusive_constraint(candidate_path_edges)
+                        logger.info("Constraint added.")
+                    num_paths_unsat += 1
+
+                num_candidate_paths += 1
+                if extremum is None:
                     analyzer.reset_path_bundled_constraints()
-                    num_candidate_paths = len(analyzer.path_exclusive_constraints)
-                    continue
 
-            logger.info("Candidate path found.")
-            candidate_path_edges = Dag.get_edges(candidate_path_nodes)
-            candidate_path_value = ilp_problem.obj_val
+        analyzer.reset_path_exclusive_constraints()
 
-            result_path = Path(ilp_problem=ilp_problem, nodes=candidate_path_nodes)
-            result_path.set_predicted_value(candidate_path_value)
+        logger.info(
+            "Time taken to generate paths: %.2f seconds."
+            % (time.perf_counter() - start_time)
+        )
+        return result_paths
+
+    @staticmethod
+    def _find_candidate_batch(
+        analyzer,
+        batch_size,
+        first_candidate_num,
+        extremum,
+        interval=None,
+        candidate_paths=None,
+        executor=None,
+    ):
+        """
+        Helper static method for the ``_generate_paths`` static method.
+        Finds a batch of worst-case or best-case candidate paths, in
+        the order in which they would be found one at a time, and submits
+        the feasibility checks of all of them to the executor provided,
+        if any, so that the checks of the batch run concurrently.
+
+        The candidate paths are taken from the iterator provided, if any,
+        and are otherwise found with integer linear programs, by
+        ``pulp_helper.find_extreme_paths``, which adds each of them to
+        the exclusive path constraints.
 
-            # Check path feasibility using KLEE/SMT solver
-            logger.info("Checking feasibility...")
-            path_name = f"feasible-path{current_path_num}"
+        Parameters:
+            analyzer:
+                ``Analyzer`` object that maintains information about
+                the code being analyzed.
+            batch_size:
+                Upper bound on the number of candidate paths to find.
+            first_candidate_num:
+                Number of the candidate paths found before this batch,
+                which is used to name the candidate paths of the batch.
+            extremum:
+                Type of paths to calculate (longest or shortest),
+                represented by an element of the ``Extremum`` class in
+                the ``pulpHelper`` module.
+            interval:
+                ``Interval`` object that represents the interval of
+                values that the candidate paths can have.
+            candidate_paths:
+                Iterator over the candidate paths returned by
+                ``_enumerate_candidate_paths``, or None if the candidate
+                paths have to be found with integer linear programs.
+            executor:
+                Executor, such as a process pool, to run the feasibility
+                checks in, or None if each check is to run when its
+                candidate path is reached.
+
+        Returns:
+            List of tuples, one for each candidate path, in order of
+            value, whose elements are the list of the nodes along
+            the candidate path, the integer linear programming problem that
+            was solved to obtain it, or None if it was enumerated,
+            the name of the candidate path, the ``PathAnalyzer`` object of
+            the candidate path, and the future of its feasibility check,
+            or None if there is no executor. The list is empty if no other
+            candidate path is feasible.
+
+        """
+        if candidate_paths is not None:
+            logger.info(
+                "Finding the next %d candidate paths in order of value..." % batch_size
+            )
+            candidates = [
+                (candidate_path_nodes, None)
+                for candidate_path_nodes in itertools.islice(
+                    candidate_paths, batch_size
+                )
+            ]
+        else:
+            logger.info(
+                "Finding %d candidate paths using an integer "
+                "linear program..." % batch_size
+            )
+            candidates = pulp_helper.find_extreme_paths(
+                analyzer, batch_size, extremum, interval
+            )
+        logger.info("")
+
+        candidate_batch = []
+        for candidate_num, (candidate_path_nodes, ilp_problem) in enumerate(
+            candidates, first_candidate_num
+        ):
+            result_path = Path(ilp_problem=ilp_problem, nodes=candidate_path_nodes)
+            path_name = f"feasible-path{candidate_num}"
             path_analyzer = PathAnalyzer(
                 analyzer.preprocessed_path,
                 analyzer.project_config,
@@ -362,38 +569,81 @@ class PathGenerator(object):
                 result_path,
                 path_name,
             )
-            is_feasible = path_analyzer.check_feasibility()
-
-            if is_feasible:
-                logger.info("Candidate path is feasible.")
-
-                # Measure the path (now that we know it's feasible)
-                logger.info("Measuring run time...")
-                result_path.path_analyzer = path_analyzer
-                result_path.name = path_name
-                value = path_analyzer.measure_path(analyzer.backend)
-                result_path.set_measured_value(value)
-                result_paths.append(result_path)
-
-                logger.info("Path %d generated." % (current_path_num + 1))
-                analyzer.add_path_exclusive_constraint(candidate_path_edges)
-                current_path_num += 1
-                num_paths_unsat = 0
-            else:
-                logger.info("Candidate path is infeasible.")
-                result_path.set_measured_value(float("inf"))
-                analyzer.add_path_exclusive_constraint(candidate_path_edges)
-                logger.info("Constraint added.")
-                num_paths_unsat += 1
-
-            num_candidate_paths += 1
-            if extremum is None:
-                analyzer.reset_path_bundled_constraints()
+            future = (
+                path_analyzer.submit_feasibility_check(executor)
+                if executor is not None
+                else None
+            )
+            candidate_batch.append(
+                (candidate_path_nodes, ilp_problem, path_name, path_analyzer, future)
+            )
+        if candidate_batch and executor is not None:
+            logger.info(
+                "Checking feasibility of %d candidate paths concurrently..."
+                % len(candidate_batch)
+            )
+        return candidate_batch
 
-        analyzer.reset_path_exclusive_constraints()
+    @staticmethod
+    def _enumerate_candidate_paths(
+        analyzer, extremum, interval=None, use_ob_extraction=False
+    ):
+        """
+        Helper static method for the ``_generate_paths`` static method.
+        Enumerates the candidate paths in the order in which
+        ``pulp_helper.find_extreme_path`` would find them, if each
+        candidate path were excluded by an exclusive path constraint
+        after it is found, without solving an integer linear program for
+        each candidate path. The candidate paths that contain all of
+        the edges of an exclusive path constraint are skipped.
 
-        logger.info(
-            "Time taken to generate paths: %.2f seconds."
-            % (time.perf_counter() - start_time)
+        The candidate paths can only be enumerated in this way if no
+        constraint other than an exclusive path constraint applies to them.
+
+        Parameters:
+            analyzer:
+                ``Analyzer`` object that maintains information about
+                the code being analyzed.
+            extremum:
+                Type of paths to calculate (longest or shortest),
+                represented by an element of the ``Extremum`` class in
+                the ``pulpHelper`` module, or None for random paths.
+            interval:
+                ``Interval`` object that represents the interval of
+                values that the generated paths can have.
+            use_ob_extraction:
+                Boolean value specifiying whether to use overcomplete
+                basis extraction algorithm
+
+        Returns:
+            Iterator over the candidate paths, each of which is a list
+            of the nodes along the path, in order of traversal, or None
+            if the candidate paths cannot be enumerated, and have to be
+            found with integer linear programs.
+
+        """
+        longest = extremum is pulp_helper.Extremum.LONGEST
+        edge_weights = analyzer.dag.edge_weights
+        if (
+            extremum is None
+            or use_ob_extraction
+            or analyzer.path_bundled_constraints
+            or (
+                interval is not None
+                and (
+                    interval.has_finite_lower_bound()
+                    or interval.has_finite_upper_bound()
+                )
+            )
+            or not path_enumeration.can_enumerate_extreme_paths(edge_weights, longest)
+        ):
+            return None
+
+        exclusive_constraints = analyzer.path_exclusive_constraints
+        return (
+            nodes
+            for nodes, _ in path_enumeration.extreme_paths(
+                analyzer.dag, edge_weights, longest
+            )
+            if not exclusive_constraints.excludes(Dag.get_edges(nodes))
         )
-        return result_paths
@@ -2,8 +2,9 @@
 
 import os
 
+import pulp_helper
 from gametime_error import GameTimeError
-from defaults import config
+from defaults import config, logger
 
 
 class DebugConfiguration(object):
@@ -94,6 +95,10 @@ class ProjectConfiguration(object):
         gametime_file_path="",
         compile_flags=[],
         backend="",
+        num_jobs=1,
+        sparse_basis_threshold=1000,
+        ilp_cache_size=1000,
+        location_ilp_cache_dir="",
     ):
         ### FILE INFORMATION ###
         # Location of the directory that contains the file to be analyzed.
@@ -126,6 +131,17 @@ class ProjectConfiguration(object):
         # without the extension.
         self.location_temp_no_extension = ""
 
+        # Location of the directory that stores the basis paths of
+        # the last incremental analysis of the function, so that the next
+        # incremental analysis can reuse them.
+        self.location_incremental_dir = ""
+
+        # Location of the directory that caches the solutions of the integer
+        # linear programs solved by previous analyses, so that the same
+        # programs need not be solved again. If empty, the directory is
+        # in the cache directory of the user.
+        self.location_ilp_cache_dir = location_ilp_cache_dir
+
         # Name of the temporary file that will be analyzed by GameTime.
         self.name_temp_file = ""
 
@@ -192,8 +208,34 @@ class ProjectConfiguration(object):
         # a 2-barycentric spanner.
         self.PREVENT_BASIS_REFINEMENT = prevent_basis_refinement
 
+        # Number of candidate basis paths whose feasibility is checked
+        # concurrently. If greater than 1, candidates for this many rows of
+        # the basis matrix are generated at once, speculatively.
+        self.NUM_JOBS = num_jobs
+
+        # Path dimension at or above which the basis matrix is stored
+        # and factorized sparsely, rather than densely.
+        self.SPARSE_BASIS_THRESHOLD = sparse_basis_threshold
+
+        # Largest number of solutions of integer linear programs kept in
+        # the cache of solutions. If 0, the cache is not used.
+        self.ILP_CACHE_SIZE = ilp_cache_size
+
         # TODO: comment here
         self.OVER_COMPLETE_BASIS = False
+
+        # Whether to resume the generation of basis paths from the checkpoint
+        # saved in the temporary directory by a previous, interrupted run,
+        # instead of starting over. The checkpoint is kept when
+        # the temporary directory is cleaned.
+        self.RESUME_BASIS_GENERATION = False
+
+        # Whether to reuse the basis paths of the previous incremental
+        # analysis of the function that only go through basic blocks
+        # that did not change since, and to save the basis paths of
+        # this analysis for the next one.
+        self.INCREMENTAL_ANALYSIS = False
+
         self.OB_EXTRACTION = False
 
         # PuLP solver object that represents the integer linear
@@ -230,6 +272,28 @@ class ProjectConfiguration(object):
         # GameTime stores its temporary files during its toolflow.
         self.location_temp_dir = f"{self.location_orig_dir}/{config.TEMP_FOLDER}"
 
+        # Infer the name of the directory where GameTime saves the basis
+        # paths of an incremental analysis of the function. It is outside
+        # the temporary directory, which is cleaned before each run.
+        self.location_incremental_dir = os.path.join(
+            self.location_orig_dir, config.TEMP_INCREMENTAL_FOLDER, self.func
+        )
+
+        # Infer the name of the directory where GameTime caches
+        # the solutions of integer linear programs, if none is provided.
+        # It is in the cache directory of the user, rather than next to
+        # the code, so that later analyses of any code, such as with
+        # another backend, can reuse the solutions.
+        if not self.location_ilp_cache_dir:
+            location_user_cache_dir = os.environ.get("XDG_CACHE_HOME")
+            if not location_user_cache_dir:
+                location_user_cache_dir = os.path.join(
+                    os.path.expanduser("~"), ".cache"
+                )
+            self.location_ilp_cache_dir = os.path.join(
+                location_user_cache_dir, "gametime", config.TEMP_ILP_CACHE_FOLDER
+            )
+
         # Create the temporary directory, if not already present.
         location_temp_dir = self.location_temp_dir
         if not os.path.exists(location_temp_dir):
@@ -285,8 +349,21 @@ class ProjectConfiguration(object):
                 ILP solver name to use
 
         """
-        # TODO: Make it real
-        self.ilp_solver = ilp_solver_name.lower()
+        ilp_solver_name = ilp_solver_name.lower()
+        if not pulp_helper.is_ilp_solver_name(ilp_solver_name):
+            err_msg = "Unrecognized ILP solver: %s. Supported solvers: %s" % (
+                ilp_solver_name,
+                ", ".join(pulp_helper.get_ilp_solver_names()),
+            )
+            raise GameTimeError(err_msg)
+        # The solver is checked for availability once, here, and the result
+        # is reused by every solver object handed out for the analysis.
+        if not pulp_helper.is_ilp_solver_available(ilp_solver_name):
+            logger.warning(
+                "ILP solver %s is not available; the default solver of "
+                "the PuLP package will be used instead." % ilp_solver_name
+            )
+        self.ilp_solver = ilp_solver_name
 
     def get_temp_filename_with_extension(self, extension: str, name: str = None) -> str:
         """
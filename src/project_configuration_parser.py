@@ -92,6 +92,10 @@ class YAMLConfigurationParser(ConfigurationParser):
         gametime_flexpret_path, gametime_path, gametime_file_path = "", "", ""
         compile_flags = []
         backend = ""
+        num_jobs = 1
+        sparse_basis_threshold = 1000
+        ilp_cache_size = 1000
+        location_ilp_cache_dir = ""
 
         # Process information about the file to be analyzed.
         file_configs: dict[str, Any] = raw_config.get("file", {})
@@ -170,6 +174,20 @@ class YAMLConfigurationParser(ConfigurationParser):
                     gametime_file_path = analysis_config[key]
                 case "backend":
                     backend = analysis_config[key]
+                case "jobs":
+                    num_jobs = int(analysis_config[key])
+                    if num_jobs < 1:
+                        err_msg = "Number of jobs must be at least 1, not %d" % num_jobs
+                        raise GameTimeError(err_msg)
+                case "sparse-basis-threshold":
+                    sparse_basis_threshold = int(analysis_config[key])
+                case "ilp-cache-size":
+                    ilp_cache_size = int(analysis_config[key])
+                case "ilp-cache-dir":
+                    if analysis_config[key]:
+                        location_ilp_cache_dir = os.path.normpath(
+                            os.path.join(project_config_dir, analysis_config[key])
+                        )
                 case _:
                     warnings.warn("Unrecognized tag : %s" % key, GameTimeWarning)
 
@@ -240,6 +258,10 @@ class YAMLConfigurationParser(ConfigurationParser):
             gametime_file_path,
             compile_flags,
             backend,
+            num_jobs,
+            sparse_basis_threshold,
+            ilp_cache_size,
+            location_ilp_cache_dir,
         )
         logger.info("Successfully loaded project.")
         logger.info("")
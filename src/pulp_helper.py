@@ -12,16 +12,33 @@ if TYPE_CHECKING:
     from project_configuration import ProjectConfiguration
     from analyzer import Analyzer
 
+import inspect
 import os
-
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 import pulp
 
+from compact_dag import CompactDag, get_compact_dag
+from constraint_pool import ConstraintPool
 from defaults import logger
-from file_helper import move_files, remove_files
+from file_helper import create_dir
+from ilp_cache import IlpCache, get_ilp_cache, get_ilp_cache_statistics
+from ilp_matrix import ExtremePathMatrix
 from interval import Interval
 
 from nx_helper import Dag
 
+try:
+    import highspy
+except ImportError:
+    highspy = None
+
 """See the LICENSE file, located in the root directory of
 the source distribution and
 at http://verifun.eecs.berkeley.edu/gametime/about/LICENSE,
@@ -44,8 +61,11 @@ _LP_NAME = "FindExtremePath"
 #: Dictionary that maps the name of an integer linear programming solver to
 #: a list of the PuLP solver classes that can interface with the solver.
 _name_ilp_solver_map = {
-    # Default integer linear programming solver of the PuLP package.
-    "": ([pulp.LpSolverDefault.__class__] if pulp.LpSolverDefault is not None else []),
+    # HiGHS, solved in the same process through its Python interface, if
+    # it is installed, or else the default integer linear programming
+    # solver of the PuLP package.
+    "": [pulp.HiGHS]
+    + ([pulp.LpSolverDefault.__class__] if pulp.LpSolverDefault is not None else []),
     # CBC mixed integer linear programming solver.
     "cbc": [pulp.COIN_CMD],
     # Version of CBC provided with the PuLP package.
@@ -56,6 +76,14 @@ _name_ilp_solver_map = {
     "glpk": [pulp.GLPK, pulp.PYGLPK],
     # Gurobi Optimizer.
     "gurobi": [pulp.GUROBI_CMD, pulp.GUROBI],
+    # HiGHS optimization solver, preferably through its Python interface.
+    "highs": [pulp.HiGHS, pulp.HiGHS_CMD],
+    # Version of HiGHS provided with the SciPy package, which is given
+    # the integer linear program that finds extreme paths in matrix form.
+    # The other integer linear programs are solved by the same solver as
+    # the default one.
+    "highs-scipy": [pulp.HiGHS]
+    + ([pulp.LpSolverDefault.__class__] if pulp.LpSolverDefault is not None else []),
     # FICO Xpress Optimizer.
     "xpress": [pulp.XPRESS],
 }
@@ -68,9 +96,18 @@ _proper_name_map = {
     "cplex": "CPLEX",
     "glpk": "GLPK",
     "gurobi": "Gurobi",
+    "highs": "HiGHS",
+    "highs-scipy": "HiGHS (provided with the SciPy package)",
     "xpress": "Xpress",
 }
 
+# Dictionary that maps each project configuration to the private directory
+# where the solvers that run as separate processes write their files.
+_ilp_files_dirs: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+# Lock that guards the creation of the private directories.
+_ilp_files_dirs_lock = threading.Lock()
+
 
 def is_ilp_solver_name(name: str) -> bool:
     """
@@ -98,7 +135,10 @@ def get_ilp_solver_names() -> List[str]:
 
 
 def get_ilp_solver(
-    ilp_solver_name: str, project_config: ProjectConfiguration
+    ilp_solver_name: str,
+    project_config: ProjectConfiguration,
+    warm_start: bool = False,
+    instance: Optional[int] = None,
 ) -> Optional[pulp.LpSolver]:
     """
 
@@ -107,6 +147,15 @@ def get_ilp_solver(
             Name of the integer linear programming solver
         project_config: ProjectConfiguration :
             ProjectConfiguration object that represents the configuration of a GameTime project
+        warm_start: bool :
+            Whether the solver should start from the current values of
+            the variables of the problem, if it supports warm starts.
+            (Default value = False)
+        instance: Optional[int] :
+            Key that tells apart the solver objects for the same solver
+            and configuration, so that problems that are solved at
+            the same time each use their own solver object.
+            (Default value = None)
 
     Returns:
         PuLP solver object that can interface with the integer
@@ -116,15 +165,260 @@ def get_ilp_solver(
     """
     if not is_ilp_solver_name(ilp_solver_name):
         return None
+    return _ilp_solver_registry.get_solver(
+        ilp_solver_name, project_config, warm_start, instance
+    )
+
+
+def is_ilp_solver_available(ilp_solver_name: str) -> bool:
+    """
+    Parameters:
+        ilp_solver_name: str :
+            Name of the integer linear programming solver
+
+    Returns:
+        bool:
+            `True` if, and only if, the name provided is the name of
+            a supported integer linear programming solver that is
+            available on this machine. The availability of each solver
+            is only checked once per process.
+
+    """
+    return (
+        is_ilp_solver_name(ilp_solver_name)
+        and _ilp_solver_registry.resolve(ilp_solver_name) is not None
+    )
+
+
+def log_ilp_solver_setup_savings() -> None:
+    """
+    Logs how many times the solver objects were reused, rather than
+    created and checked for availability again, and about how much time
+    that saved.
+
+    """
+    num_reuses, time_saved = _ilp_solver_registry.setup_savings()
+    logger.info(
+        "Reused integer linear programming solvers %d time(s), saving about "
+        "%.3f seconds of solver setup." % (num_reuses, time_saved)
+    )
+
+
+def log_ilp_cache_statistics() -> Tuple[int, int]:
+    """
+    Logs how many solutions of integer linear programs were found in
+    the cache of solutions, rather than solved again, and how many were
+    not.
+
+    Returns:
+        Tuple of the numbers of hits and misses of the cache.
+    """
+    num_hits, num_misses, num_evictions = get_ilp_cache_statistics()
+    logger.info(
+        "Integer linear program cache: %d hit(s), %d miss(es), %d eviction(s)."
+        % (num_hits, num_misses, num_evictions)
+    )
+    return num_hits, num_misses
+
+
+class _IlpSolverRegistry(object):
+    """
+    Maintains, for the whole process, the PuLP solver classes that can
+    interface with each integer linear programming solver, and the solver
+    objects handed out for each project configuration, so that each
+    solver is checked for availability, which can search for or run
+    its executable, only once, and each solver object is made only once.
+
+    The solver objects are reused across threads: PuLP creates
+    the problem files, or the in-process model, anew for each solve.
+    """
+
+    def __init__(self):
+        # Lock that guards the dictionaries below.
+        self._lock = threading.Lock()
+
+        # Dictionary that maps the name of a solver to the first of
+        # its PuLP solver classes that is available, or None, if none is.
+        self._classes: Dict[str, Optional[type]] = {}
+
+        # Dictionary that maps the name of a solver to the time, in seconds,
+        # taken to find its available PuLP solver class.
+        self._setup_times: Dict[str, float] = {}
+
+        # Dictionary that maps the name of a solver to the number of times
+        # that a solver object was reused, rather than made again.
+        self._num_reuses: Dict[str, int] = {}
+
+        # Dictionary that maps each project configuration to the solver
+        # objects handed out for it, keyed by the name of the solver,
+        # whether the solver starts from the current values of the variables,
+        # and the key of the solver object among the others.
+        self._solvers: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _resolve(self, ilp_solver_name: str) -> Optional[type]:
+        """
+        Finds the first available PuLP solver class for the solver, if it
+        was not found before. The lock must be held.
+
+        Parameters:
+            ilp_solver_name: str :
+                Name of the integer linear programming solver
+
+        Returns:
+            First PuLP solver class for the solver that is available,
+            or None, if none is.
+        """
+        if ilp_solver_name not in self._classes:
+            start_time = time.perf_counter()
+            self._classes[ilp_solver_name] = next(
+                (
+                    ilp_solver_class
+                    for ilp_solver_class in _name_ilp_solver_map[ilp_solver_name]
+                    if ilp_solver_class(msg=False).available()
+                ),
+                None,
+            )
+            self._setup_times[ilp_solver_name] = time.perf_counter() - start_time
+            self._num_reuses[ilp_solver_name] = 0
+        return self._classes[ilp_solver_name]
+
+    def resolve(self, ilp_solver_name: str) -> Optional[type]:
+        """
+        Parameters:
+            ilp_solver_name: str :
+                Name of the integer linear programming solver
+
+        Returns:
+            First PuLP solver class for the solver that is available,
+            or None, if none is.
+        """
+        with self._lock:
+            return self._resolve(ilp_solver_name)
+
+    def get_solver(
+        self,
+        ilp_solver_name: str,
+        project_config: ProjectConfiguration,
+        warm_start: bool = False,
+        instance: Optional[int] = None,
+    ) -> Optional[pulp.LpSolver]:
+        """
+        Parameters:
+            ilp_solver_name: str :
+                Name of the integer linear programming solver
+            project_config: ProjectConfiguration :
+                ProjectConfiguration object that represents the configuration of a GameTime project
+            warm_start: bool :
+                Whether the solver should start from the current values of
+                the variables of the problem, if it supports warm starts.
+            instance: Optional[int] :
+                Key that tells apart the solver objects for the same solver
+                and configuration.
+
+        Returns:
+            PuLP solver object for the solver and the project configuration
+            provided, which is made the first time that it is needed, or
+            None, if the solver is not available.
+        """
+        with self._lock:
+            ilp_solver_class = self._resolve(ilp_solver_name)
+            if ilp_solver_class is None:
+                return None
+
+            solvers = self._solvers.setdefault(project_config, {})
+            key = (ilp_solver_name, warm_start, instance)
+            ilp_solver = solvers.get(key)
+            if ilp_solver is not None:
+                self._num_reuses[ilp_solver_name] += 1
+            else:
+                options = {}
+                parameters = inspect.signature(ilp_solver_class).parameters
+                if warm_start and "warmStart" in parameters:
+                    options["warmStart"] = True
+                ilp_solver = ilp_solver_class(
+                    msg=project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT, **options
+                )
+                solvers[key] = ilp_solver
+
+        if isinstance(ilp_solver, pulp.LpSolver_CMD):
+            # The files that the solver reads and writes are placed in
+            # a directory private to the analysis, rather than in
+            # the working directory, and are removed by PuLP.
+            ilp_solver.tmpDir = _get_ilp_files_dir(project_config)
+        return ilp_solver
+
+    def setup_savings(self) -> Tuple[int, float]:
+        """
+        Returns:
+            Tuple of the number of times that a solver object was reused,
+            and an estimate of the time, in seconds, that was saved by
+            not making the solver object and checking the availability
+            of the solver again each time.
+        """
+        with self._lock:
+            return (
+                sum(self._num_reuses.values()),
+                sum(
+                    self._setup_times[name] * num_reuses
+                    for name, num_reuses in self._num_reuses.items()
+                ),
+            )
+
+
+# Registry of the integer linear programming solvers of the process.
+_ilp_solver_registry = _IlpSolverRegistry()
+
+
+def _get_ilp_files_dir(project_config: ProjectConfiguration) -> str:
+    """
+    Parameters:
+        project_config: ProjectConfiguration :
+            ProjectConfiguration object that represents the configuration of a GameTime project
+
+    Returns:
+        Location of the directory, private to the analysis whose
+        configuration is provided, where the integer linear programming
+        solvers that run as separate processes write their files. It is
+        created in the temporary directory of the analysis when it is
+        needed, and removed when the configuration is.
+    """
+    with _ilp_files_dirs_lock:
+        location = _ilp_files_dirs.get(project_config)
+        if location is None or not os.path.isdir(location):
+            temp_dir = project_config.location_temp_dir or None
+            if temp_dir is not None:
+                create_dir(temp_dir)
+            location = tempfile.mkdtemp(prefix="ilp-", dir=temp_dir)
+            _ilp_files_dirs[project_config] = location
+            weakref.finalize(project_config, shutil.rmtree, location, True)
+        return location
+
+
+def _save_ilp_problem(problem: pulp.LpProblem, project_config: ProjectConfiguration):
+    """
+    Writes the integer linear program provided to an LP file in
+    the temporary directory of the analysis, if the output of
+    the integer linear programming solver is kept for debugging.
+    An ``IlpProblem`` object that does not hold its program, because its
+    solution was found without PuLP, is skipped with a log message.
 
-    keep_ilp_solver_output = project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT
-    for ilp_solver_class in _name_ilp_solver_map[ilp_solver_name]:
-        ilp_solver = ilp_solver_class(
-            keepFiles=keep_ilp_solver_output, msg=keep_ilp_solver_output
+    Parameters:
+        problem: pulp.LpProblem :
+            Integer linear program that was solved.
+        project_config: ProjectConfiguration :
+            ProjectConfiguration object that represents the configuration of a GameTime project
+    """
+    if not project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT:
+        return
+    if isinstance(problem, IlpProblem) and not problem.holds_program:
+        logger.info(
+            "The path was found without an integer linear program in PuLP: "
+            "no LP file is written."
+        )
+    else:
+        problem.writeLP(
+            os.path.join(project_config.location_temp_dir, "%s-pulp.lp" % problem.name)
         )
-        if ilp_solver.available():
-            return ilp_solver
-    return None
 
 
 def get_ilp_solver_name(ilp_solver: pulp.LpSolver) -> Optional[str]:
@@ -191,6 +485,25 @@ class IlpProblem(pulp.LpProblem):
         #: Value of the objective function, stored for efficiency purposes.
         self.obj_val = None
 
+        #: Wall-clock time, in seconds, that the solver took to solve
+        #: this problem, together with any problems solved alongside it,
+        #: such as the problem for the opposite extremum, stored for
+        #: profiling purposes.
+        self.solve_time = 0.0
+
+        #: Number of problems solved by the solver to obtain the solution of
+        #: this problem, which is 0 if the solution was found without
+        #: a solver.
+        self.num_solves = 0
+
+        #: Whether this object holds the integer linear program whose
+        #: solution it describes. It does not if the solution was found
+        #: without building the program with PuLP: by dynamic programming,
+        #: in the cache of solutions, or with the program in matrix form.
+        #: Such an object only holds the value of the objective function,
+        #: and cannot be written to an LP file.
+        self.holds_program = True
+
 
 def _get_edge_flow_var(
     analyzer: Analyzer,
@@ -246,6 +559,196 @@ def _get_edge_flow_vars(
     return [_get_edge_flow_var(analyzer, edge_flow_vars, edge) for edge in edges]
 
 
+class MuMaxEstimator(object):
+    """
+    Maintains the linear program that finds the least delta, in
+    the underlying graph of the ``Analyzer`` object provided, that is
+    compatible with a set of measured paths: the least bound on how far
+    the measured value of each path can be from the sum of nonnegative
+    weights on its edges. The program is kept between updates, and only
+    gains two rows for each measured path that is added, so the delta is
+    updated as measurements arrive, rather than found from scratch.
+
+    If the ``highspy`` package is installed, the program is kept in
+    a HiGHS model, which keeps the optimal basis of the last solve, so
+    that the dual simplex method restarts from it after rows are added.
+    Otherwise, the program is kept as a PuLP problem, which is solved
+    again by the integer linear programming solver of the project
+    configuration after rows are added.
+
+    Parameters:
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+    """
+
+    def __init__(self, analyzer: Analyzer):
+        #: ``Analyzer`` object whose underlying graph is used.
+        self.analyzer: Analyzer = analyzer
+
+        #: DAG whose edges have weights in the program.
+        self.dag: Dag = analyzer.dag
+
+        #: Number of edges of the DAG when the program was built.
+        self.num_edges: int = analyzer.dag.num_edges
+
+        #: Measured paths whose rows are in the program, in the order in
+        #: which they were added.
+        self.paths: List = []
+
+        #: Least delta compatible with the measured paths, as of the last
+        #: update, or None if the program was not solved to optimality.
+        self.mu_max: Optional[float] = None
+
+        #: Time taken by each update, in seconds, in order.
+        self.update_times: List[float] = []
+
+        # HiGHS model of the program, whose columns are the edge weights,
+        # followed by the delta, or None if the ``highspy`` package is
+        # not installed.
+        self._highs = None
+        # PuLP problem of the program, and its variables, if the ``highspy``
+        # package is not installed.
+        self._problem: Optional[IlpProblem] = None
+        self._edge_weights: Dict[int, pulp.LpVariable] = {}
+        self._delta: Optional[pulp.LpVariable] = None
+
+        if highspy is not None:
+            highs = highspy.Highs()
+            highs.setOptionValue("output_flag", False)
+            for _ in range(self.num_edges):
+                highs.addCol(0.0, 0.0, highspy.kHighsInf, 0, [], [])
+            highs.addCol(1.0, 0.0, highspy.kHighsInf, 0, [], [])
+            self._highs = highs
+        else:
+            problem = IlpProblem(_LP_NAME)
+            # Each edge weight is restricted to be a nonnegative real number.
+            self._edge_weights = pulp.LpVariable.dicts("we", range(self.num_edges), 0)
+            self._delta = pulp.LpVariable("delta", 0)
+            # Optimize for the least delta.
+            problem += self._delta
+            problem.sense = pulp.LpMinimize
+            self._problem = problem
+
+    def is_current(self, analyzer: Analyzer) -> bool:
+        """
+        Parameters:
+            analyzer: Analyzer :
+                ``Analyzer`` object that maintains information about
+                the code being analyzed.
+
+        Returns:
+            True if the program of this object is over the edges of
+            the current DAG of the ``Analyzer`` object provided.
+        """
+        return analyzer.dag is self.dag and self.dag.num_edges == self.num_edges
+
+    def add_paths(self, paths) -> Optional[float]:
+        """
+        Adds the rows for measured paths to the program, and solves it
+        again.
+
+        Parameters:
+            paths:
+                List of measured paths to add, each an object of
+                the ``Path`` class.
+
+        Returns:
+            Least delta compatible with all of the measured paths added
+            so far, or None if the program was not solved to optimality.
+        """
+        start_time = time.perf_counter()
+        edges_indices = self.dag.edges_indices
+        for path in paths:
+            indices = [edges_indices[edge] for edge in self.dag.get_edges(path.nodes)]
+            measured_value = path.measured_value
+            if self._highs is not None:
+                delta_index = self.num_edges
+                num_nz = len(indices) + 1
+                row_indices = np.array(indices + [delta_index], dtype=np.int32)
+                self._highs.addRow(
+                    -highspy.kHighsInf,
+                    measured_value,
+                    num_nz,
+                    row_indices,
+                    np.array([1.0] * len(indices) + [-1.0]),
+                )
+                self._highs.addRow(
+                    measured_value,
+                    highspy.kHighsInf,
+                    num_nz,
+                    row_indices,
+                    np.array([1.0] * num_nz),
+                )
+            else:
+                path_weight = pulp.lpSum(self._edge_weights[index] for index in indices)
+                self._problem += path_weight <= self._delta + measured_value
+                self._problem += path_weight >= -self._delta + measured_value
+            self.paths.append(path)
+
+        logger.info(
+            "Finding the minimum value of the objective function for %d paths..."
+            % len(self.paths)
+        )
+        if self._highs is not None:
+            self._highs.run()
+            if self._highs.getModelStatus() == highspy.HighsModelStatus.kOptimal:
+                self.mu_max = self._highs.getSolution().col_value[self.num_edges]
+            else:
+                self.mu_max = None
+        else:
+            project_config = self.analyzer.project_config
+            problem_status = self._problem.solve(
+                solver=get_ilp_solver(project_config.ilp_solver, project_config)
+            )
+            if problem_status == pulp.LpStatusOptimal:
+                self.mu_max = pulp.value(self._delta)
+            else:
+                self.mu_max = None
+            _save_ilp_problem(self._problem, project_config)
+
+        update_time = time.perf_counter() - start_time
+        self.update_times.append(update_time)
+        logger.info(
+            "Updated the least compatible delta with %d new path(s) "
+            "in %.3f ms." % (len(paths), update_time * 1000)
+        )
+        return self.mu_max
+
+
+# Dictionary that maps an ``Analyzer`` object to the ``MuMaxEstimator``
+# object that was last used for it, which is discarded along with it.
+_mu_max_estimators: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_mu_max_estimator(analyzer: Analyzer, paths) -> MuMaxEstimator:
+    """
+    Parameters:
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+        paths:
+            List of measured paths, each an object of the ``Path`` class.
+
+    Returns:
+        ``MuMaxEstimator`` object for the ``Analyzer`` object provided,
+        which is the one that was last used for it, if its program is
+        over the current DAG and its paths are among the paths provided,
+        so that only the rows for the other paths need to be added, and
+        a new one otherwise.
+    """
+    estimator = _mu_max_estimators.get(analyzer)
+    path_ids = {id(path) for path in paths}
+    if (
+        estimator is None
+        or not estimator.is_current(analyzer)
+        or any(id(path) not in path_ids for path in estimator.paths)
+    ):
+        estimator = MuMaxEstimator(analyzer)
+        _mu_max_estimators[analyzer] = estimator
+    return estimator
+
+
 def find_least_compatible_mu_max(analyzer: Analyzer, paths):
     """
     This function returns the least dealta in the underlying graph, as
@@ -254,6 +757,10 @@ def find_least_compatible_mu_max(analyzer: Analyzer, paths):
     account which paths are feasible and which not; it considers all_temp_files the
     paths in the graph.
 
+    The linear program is kept by a ``MuMaxEstimator`` object between
+    calls for the same ``Analyzer`` object, so that a call with the paths
+    of a previous call, and more, only adds the rows for the new paths.
+
     Parameters:
         analyzer:
             ``Analyzer`` object that maintains information about
@@ -268,53 +775,17 @@ def find_least_compatible_mu_max(analyzer: Analyzer, paths):
             measurements
 
     """
-    dag = analyzer.dag
-    source = dag.source
-    sink = dag.sink
-    num_edges = dag.num_edges
-    edges = dag.edges()
-    num_paths = len(paths)
-
-    project_config = analyzer.project_config
-
-    nodes_except_source_sink = dag.nodes_except_source_sink
-
-    # Set up the linear programming problem.
-    logger.info("Number of paths: %d " % num_paths)
-    logger.info("Setting up the integer linear programming problem...")
-    problem = IlpProblem(_LP_NAME)
-
-    logger.info("Creating variables")
-    # Set up the variables that correspond to weights of each edge.
-    # Each edge is restricted to be a nonnegative real number
-    edge_weights = pulp.LpVariable.dicts("we", range(0, num_edges), 0)
-    # Create the variable that shall correspond to the least delta
-    delta = pulp.LpVariable("delta", 0)
-    for path in paths:
-        path_weights = _get_edge_flow_vars(
-            analyzer, edge_weights, dag.get_edges(path.nodes)
-        )
-        problem += pulp.lpSum(path_weights) <= delta + path.measured_value
-        problem += pulp.lpSum(path_weights) >= -delta + path.measured_value
-        print("LENGTH:", path.measured_value)
-
-    # Optimize for the least delta
-    problem += delta
-    logger.info("Finding the minimum value of the objective function...")
-
-    problem.sense = pulp.LpMinimize
-    problem_status = problem.solve(solver=project_config.ilp_solver)
-    if problem_status != pulp.LpStatusOptimal:
-        logger.info("Maximum value not found.")
+    logger.info("Number of paths: %d " % len(paths))
+    estimator = get_mu_max_estimator(analyzer, paths)
+    added_ids = {id(path) for path in estimator.paths}
+    obj_val_min = estimator.add_paths(
+        [path for path in paths if id(path) not in added_ids]
+    )
+    if obj_val_min is None:
+        logger.info("Minimum value not found.")
         return []
-    obj_val_min = pulp.value(delta)
 
     logger.info("Minimum compatible delta found: %g" % obj_val_min)
-
-    if project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT:
-        _move_ilp_files(os.getcwd(), project_config.location_temp_dir)
-    else:
-        _remove_temp_ilp_files()
     return obj_val_min
 
 
@@ -373,40 +844,11 @@ def make_compact(dag):
         A mapping (vertex, vertex) -> edge_number so that the edge
         (vertex, vertex) in the original graph 'dag' gets mapped to
         the edge with number 'edge_number'. All edges on a simple path
-        without branching get mapped to the same 'edge_number'
+        without branching get mapped to the same 'edge_number', which is
+        the chain of the edge in the ``CompactDag`` of the graph.
 
     """
-    processed = {}
-    result = Dag()
-    source = dag.source
-    different_edges = []
-    edge_map = {}
-
-    def dfs(node, edge_index):
-        if node in processed:
-            return node
-        processed[node] = node
-        index = node
-        neighbors = dag.neighbors(node)
-
-        if len(neighbors) == 0:
-            return
-        if (len(neighbors) == 1) and (len(dag.predecessors(node)) == 1):
-            # edge get compactified
-            edge_map[(node, neighbors[0])] = edge_index
-            dfs(neighbors[0], edge_index)
-            return
-
-        for to in dag.neighbors(node):
-            # start new edge
-            new_edge = len(different_edges)
-            different_edges.append(0)
-            edge_map[(node, to)] = new_edge
-            dfs(to, new_edge)
-        return
-
-    dfs(source, source)
-    return edge_map
+    return get_compact_dag(dag).edge_map()
 
 
 def generate_and_solve_core_problem(
@@ -423,6 +865,12 @@ def generate_and_solve_core_problem(
     in the graph specified by 'analyzer' using the set of measured paths given
     by 'paths'.
 
+    The variables and the constraints are kept by a model of the ILP,
+    which is reused by the next call for the same DAG, so that a call
+    only builds the rows for the measured paths and the exclusive path
+    constraints that are new since the last call, and the solver starts
+    from the last solution.
+
     Parameters:
         analyzer:
             ``Analyzer`` object that maintains information about
@@ -455,24 +903,13 @@ def generate_and_solve_core_problem(
         path and the ILP problem generated.
 
     """
+    start_time = time.perf_counter()
     dag = analyzer.dag
     dag.initialize_dictionaries()
-    source = dag.source
-    sink = dag.sink
     num_edges = dag.num_edges
-    edges = dag.edges()
     num_paths = len(paths)
-
-    # Use the compact representation of the DAG
-    # compact is now a mapping that for each edge of dag gives an index of an
-    # edge in the compact graph.
-    compact = make_compact(dag)
     project_config = analyzer.project_config
 
-    nodes_except_source_sink = dag.nodes_except_source_sink
-    path_exclusive_constraints = analyzer.path_exclusive_constraints
-    path_bundled_constraints = analyzer.path_bundled_constraints
-
     # Set up the linear programming problem.
     logger.info("Number of paths: %d " % num_paths)
     logger.info("Setting up the integer linear programming problem...")
@@ -485,96 +922,44 @@ def generate_and_solve_core_problem(
         m *= num_edges
 
     logger.info("Using value %.2f for M --- the maximum edge weight" % m)
-    logger.info("Creating variables")
-
-    values = set()
-    for key in compact:
-        values.add(compact[key])
-    new_edges = len(values)
-
-    # Set up the variables that correspond to the flow through each edge.
-    # Set each of the variables to be an integer binary variable.
-    edge_flows = pulp.LpVariable.dicts(
-        "EdgeFlow", range(0, new_edges), 0, 1, pulp.LpBinary
+    model = _get_core_problem_model(dag, m, weights_positive, extremum)
+    compact_dag = model.compact_dag
+    edge_flows, product_vars = model.edge_flows, model.product_vars
+
+    # Collect the constraints of the model: the flow constraints and
+    # the constraints on the products of the flows and the weights, which
+    # never change, the constraints on the lengths of the measured paths,
+    # and the constraints for the exclusive path constraints. Only
+    # the constraints that were not used in a previous call are built.
+    path_constraints, num_new_rows = model.path_constraints(
+        paths, path_function_upper, path_function_lower
     )
-    edge_weights = pulp.LpVariable.dicts(
-        "we", range(0, new_edges), 0 if weights_positive else -m, m
+    problem.extend(path_constraints)
+    problem.extend(model.flow_constraints)
+    problem.extend(model.exclusive_constraints(analyzer.path_exclusive_constraints))
+    problem.extend(model.product_constraints)
+    objective = model.objective
+    logger.info(
+        "Built %d new rows for the measured paths in %.3f seconds."
+        % (num_new_rows, time.perf_counter() - start_time)
     )
 
-    # for a given 'path' in the original DAG returns the edgeFlow variables
-    # corresponding to the edges along the same path in the compact DAG.
-    def get_new_indices(compact, edge_flows, path):
-        edges = [compact[edge] for edge in path]
-        path_weights = [edge_flows[edge] for edge in set(edges)]
-        return path_weights
-
-    for path in paths:
-        path_weights = get_new_indices(compact, edge_weights, dag.get_edges(path.nodes))
-        problem += pulp.lpSum(path_weights) <= path_function_upper(path)
-        problem += pulp.lpSum(path_weights) >= path_function_lower(path)
-
-    # Add a constraint for the flow from the source. The flow through all_temp_files of
-    # the edges out of the source should sum up to exactly 1.
-    edge_flows_from_source = get_new_indices(compact, edge_flows, dag.out_edges(source))
-    problem += pulp.lpSum(edge_flows_from_source) == 1, "Flows from source"
-
-    # Add constraints for the rest of the nodes (except sink). The flow
-    # through all_temp_files of the edges into a node should equal the flow through
-    # all_temp_files of the edges out of the node. Hence, for node n, if e_i and e_j
-    # enter a node, and e_k and e_l exit a node, the corresponding flow
-    # equation is e_i + e_j = e_k + e_l.
-    for node in nodes_except_source_sink:
-        if (dag.neighbors(node) == 1) and (dag.predecessors(node) == 1):
-            continue
-        edge_flows_to_node = get_new_indices(compact, edge_flows, dag.in_edges(node))
-        edge_flows_from_node = get_new_indices(compact, edge_flows, dag.out_edges(node))
-        problem += (
-            pulp.lpSum(edge_flows_to_node) == pulp.lpSum(edge_flows_from_node),
-            "Flows through %s" % node,
-        )
-
-    # Add a constraint for the flow to the sink. The flow through all_temp_files of
-    # the edges into the sink should sum up to exactly 1.
-    edge_flows_to_sink = get_new_indices(compact, edge_flows, dag.in_edges(sink))
-    problem += pulp.lpSum(edge_flows_to_sink) == 1, "Flows to sink"
-
-    # Add constraints for the exclusive path constraints. To ensure that
-    # the edges in each constraint are not taken together, the total flow
-    # through all_temp_files the edges should add to at least one unit less than
-    # the number of edges in the constraint. Hence, if a constraint
-    # contains edges e_a, e_b, e_c, then e_a + e_b + e_c must be less than 3.
-    # This way, all_temp_files three of these edges can never be taken together.
-    for constraint_num, path in enumerate(path_exclusive_constraints):
-        edge_flows_in_constraint = get_new_indices(compact, edge_flows, path)
-        problem += (
-            pulp.lpSum(edge_flows_in_constraint) <= (len(edge_flows_in_constraint) - 1),
-            "Path exclusive constraint %d" % (constraint_num + 1),
-        )
-
-    # Each product_vars[index] in the longest path should correspond to
-    # edge_flows[index] * edge_weights[index]
-    product_vars = pulp.LpVariable.dicts("pe", range(0, new_edges), -m, m)
-    for index in range(0, new_edges):
-        if extremum == Extremum.LONGEST:
-            problem += product_vars[index] <= edge_weights[index]
-            problem += product_vars[index] <= m * edge_flows[index]
-        else:
-            problem += product_vars[index] >= edge_weights[index] - m * (
-                1.0 - edge_flows[index]
-            )
-            problem += product_vars[index] >= 0
-
-    objective = pulp.lpSum(product_vars)
-    problem += objective
-    logger.info("Objective function constructed.")
-
     if extremum == Extremum.LONGEST:
         logger.info("Finding the maximum value of the objective function...")
-        problem.sense = pulp.LpMaximize
     else:
         logger.info("Finding the minimum value of the objective function...")
-        problem.sense = pulp.LpMinimize
-    problem_status = problem.solve(solver=project_config.ilp_solver)
+    # The maximum is found by minimizing the negated objective function,
+    # since CBC misjudges the cost of the warm start of a maximization.
+    problem.sense = pulp.LpMinimize
+    problem.setObjective(-objective if extremum == Extremum.LONGEST else objective)
+    problem_status = problem.solve(
+        solver=get_ilp_solver(project_config.ilp_solver, project_config, True)
+    )
+    problem.setObjective(objective)
+    problem.sense = pulp.LpMaximize if extremum == Extremum.LONGEST else pulp.LpMinimize
+    logger.info(
+        "Solved the core problem in %.3f seconds." % (time.perf_counter() - start_time)
+    )
 
     if print_problem:
         logger.info(problem)
@@ -588,11 +973,6 @@ def generate_and_solve_core_problem(
     logger.info("Maximum value found: %g" % obj_val_max)
 
     logger.info("Finding the path that corresponds to the maximum value...")
-    # Determine the edges along the extreme path using the solution.
-    max_path = [
-        edges[edge_num] for edge_num in edge_flows if edge_flows[edge_num].value() > 0.1
-    ]
-    logger.info("Path found.")
 
     total_length = sum(
         [
@@ -605,15 +985,11 @@ def generate_and_solve_core_problem(
     obj_val_max = total_length
 
     max_path = [
-        edge_num
-        for edge_num in range(0, new_edges)
-        if edge_flows[edge_num].value() > 0.1
+        edge_num for edge_num in edge_flows if edge_flows[edge_num].value() > 0.1
     ]
-    extreme_path = []
     # reverse extreme_path according to the compact edgeMap
-    for edge in max_path:
-        map_to = [source for source in compact if compact[source] == edge]
-        extreme_path.extend(map_to)
+    extreme_path = compact_dag.edges_of(max_path)
+    logger.info("Path found.")
 
     # Arrange the nodes along the extreme path in order of traversal
     # from source to sink.
@@ -636,10 +1012,7 @@ def generate_and_solve_core_problem(
         result_path.append(curr_node)
     logger.info("Nodes along the chosen extreme path arranged.")
 
-    if project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT:
-        _move_ilp_files(os.getcwd(), project_config.location_temp_dir)
-    else:
-        _remove_temp_ilp_files()
+    _save_ilp_problem(problem, project_config)
     # We're done!
     return obj_val_max, result_path, problem
 
@@ -679,6 +1052,10 @@ def find_goodness_of_fit(analyzer, paths, basis):
     paths b_i such that the sum of absolute value of coefficients is at
     most `c`: |a_1| + |a_2| + ... + |a_n| <= c
 
+    The least sum for each path does not depend on the other paths, so
+    a small linear program is solved for each path, with one coefficient
+    for each basis path, and `c` is the largest of the sums.
+
     Parameters:
         analyzer:
             ``Analyzer`` object that maintains information about
@@ -694,50 +1071,50 @@ def find_goodness_of_fit(analyzer, paths, basis):
         The number `c` as described in the paragraph above.
 
     """
-    dag = analyzer.dag
-    source = dag.source
-    sink = dag.sink
-    num_edges = dag.num_edges
-    edges = dag.edges()
     num_paths = len(paths)
     num_basis = len(basis)
     project_config = analyzer.project_config
 
-    # Set up the linear programming problem.
     logger.info("Number of paths: %d " % num_paths)
     logger.info("Number of basis paths: %d " % num_basis)
-    logger.info("Setting up the integer linear programming problem...")
-    problem = IlpProblem("BLAH")
-
-    logger.info("Creating variables")
-    indices = [(i, j) for i in range(num_paths) for j in range(num_basis)]
-    coeffs = pulp.LpVariable.dicts("c", indices, -100, 100)
-    abs_values = pulp.LpVariable.dicts("abs", indices, 0, 100)
-    bound = pulp.LpVariable("bnd", 0, 10000)
-
-    logger.info("Add absolute values")
-    for index in indices:
-        problem += abs_values[index] >= coeffs[index]
-        problem += abs_values[index] >= -coeffs[index]
-
-    for i in range(num_paths):
-        # all_temp_files coefficients expressing path i
-        all_coeff_expressing = [abs_values[(i, j)] for j in range(num_basis)]
-        problem += pulp.lpSum(all_coeff_expressing) <= bound
-        # express path i as a linear combination of basis paths
-        for edge in edges:
-            paths_containing_edge = [j for j in range(num_basis) if (edge in basis[j])]
-            present_coeffs = [coeffs[(i, j)] for j in paths_containing_edge]
-            present = 1 if (edge in paths[i]) else 0
+
+    # Dictionary that maps each edge to the basis paths that contain it,
+    # so that the constraint for each edge is built without a scan of all
+    # of the basis paths.
+    basis_with_edge = {}
+    for j, basis_path in enumerate(basis):
+        for edge in set(basis_path):
+            basis_with_edge.setdefault(edge, []).append(j)
+
+    obj_val_min = 0
+    for i, path in enumerate(paths):
+        logger.info("Setting up the linear programming problem for path %d..." % i)
+        problem = IlpProblem("GoodnessOfFit")
+        coeffs = pulp.LpVariable.dicts("c", range(num_basis), -100, 100)
+        abs_values = pulp.LpVariable.dicts("abs", range(num_basis), 0, 100)
+        for j in range(num_basis):
+            problem += abs_values[j] >= coeffs[j]
+            problem += abs_values[j] >= -coeffs[j]
+
+        # Express the path as a linear combination of the basis paths:
+        # each edge of the path, or of a basis path, is taken once by
+        # the combination if it is on the path, and not at all otherwise.
+        path_edges = set(path)
+        for edge in path_edges.union(basis_with_edge):
+            present_coeffs = [coeffs[j] for j in basis_with_edge.get(edge, [])]
+            present = 1 if edge in path_edges else 0
             problem += pulp.lpSum(present_coeffs) == present
-    problem += bound
-    problem.sense = pulp.LpMinimize
+        objective = pulp.lpSum(abs_values.values())
+        problem += objective
+        problem.sense = pulp.LpMinimize
 
-    problem_status = problem.solve(solver=project_config.ilp_solver)
-    if problem_status != pulp.LpStatusOptimal:
-        logger.info("Minimum value not found.")
-        return [], problem
-    obj_val_min = pulp.value(bound)
+        problem_status = problem.solve(
+            solver=get_ilp_solver(project_config.ilp_solver, project_config)
+        )
+        if problem_status != pulp.LpStatusOptimal:
+            logger.info("Minimum value not found.")
+            return [], problem
+        obj_val_min = max(obj_val_min, pulp.value(objective))
 
     logger.info("Minimum value found: %g" % obj_val_min)
 
@@ -746,89 +1123,767 @@ def find_goodness_of_fit(analyzer, paths, basis):
 
 def find_minimal_overcomplete_basis(analyzer: Analyzer, paths, k):
     """
-    This function is here only for test purposes. The functions finds the
-    smallest set of 'basis paths' with the following property: Each path pi
-    in `paths', can be expressed as a linear combination
+    This function finds a minimal set of 'basis paths' with the following
+    property: Each feasible path pi through the DAG can be expressed as
+    a linear combination
     pi = a_1 b_1 + ... + a_n b_n
-    of paths b_i from `basis`. This function finds the set of basis paths
-    such that every path can be expressed as a linear combination of basis
-    paths b_i  such that the sum of absolute value of coefficients is at
-    most 'k': |a_1| + |a_2| + ... + |a_n| <= k
+    of paths b_i from the basis, such that the sum of absolute value of
+    coefficients is at most 'k': |a_1| + |a_2| + ... + |a_n| <= k
+
+    The basis is found by column generation, without listing the paths
+    through the DAG. The least such sum for the worst path, and the path
+    itself, are found by ``find_worst_expressible_path``: by duality,
+    the length of the longest path, when every basis path has a length
+    between -1 and 1, is the least sum for that path. While the sum is
+    more than 'k', the worst path is priced into the basis as a new
+    column. Finally, each basis path whose removal keeps the sum within
+    'k' is removed, so that no basis path can be left out.
 
     Parameters:
         analyzer:
             ``Analyzer`` object that maintains information about
-            the code being analyzed.
+            the code being analyzed. Its exclusive path constraints
+            exclude the infeasible paths.
         paths:
-            List of paths that we want to find out how well can be
-            expressed as a linear combination of paths in `basis`
+            List of paths, each an object of the ``Path`` class, that
+            the basis starts with, such as the basis paths generated
+            by the standard algorithm. It can be empty.
         k:
-            bound on how well the 'paths' can be expressed as a linear
-            combination of the calculated basis paths
+            bound on how well the feasible paths can be expressed as
+            a linear combination of the calculated basis paths
+
+
+    Returns:
+        List of paths satisfying the condition stated above, each an object
+        of the ``Path`` class, which are either from `paths`, or were
+        priced in.
+
+    """
+    # The path module imports this one, so it is imported here.
+    from path import Path
+
+    basis = list(paths)
+    logger.info("Number of initial basis paths: %d " % len(basis))
+    while True:
+        length, path_nodes, problem = find_worst_expressible_path(analyzer, basis, 0)
+        if problem.obj_val is None:
+            logger.info("Unable to find the worst expressible path.")
+            return []
+        logger.info("Worst expressible path has length %.2f." % length)
+        if length <= k:
+            break
+        if any(basis_path.nodes == path_nodes for basis_path in basis):
+            # The worst path is already in the basis, so the basis cannot
+            # express the paths within 'k' with more columns.
+            logger.info("Bound %.2f cannot be met." % k)
+            break
+        logger.info("Pricing in basis path number %d" % len(basis))
+        basis.append(Path(ilp_problem=problem, nodes=path_nodes))
+
+    logger.info("Removing the basis paths that are not needed...")
+    for basis_path in list(basis):
+        reduced_basis = [path for path in basis if path is not basis_path]
+        length, _, problem = find_worst_expressible_path(analyzer, reduced_basis, 0)
+        if problem.obj_val is not None and length <= k:
+            basis = reduced_basis
+
+    logger.info("Minimum value found: %d" % len(basis))
+    return basis
+
+
+class _ExtremePathModel(object):
+    """
+    Maintains the parts of the integer linear program solved by
+    ``find_extreme_path`` that do not change from one call to the next on
+    the same DAG: the binary variables for the flow through each chain of
+    the compacted DAG, the flow-conservation constraints at the nodes
+    where chains meet, which are built only once, and the path-exclusive
+    and path-bundled constraints, each of which is built only once,
+    the first time that it is used. All of the edges of a chain carry
+    the same flow, so one variable for each chain suffices.
+
+    The variables persist across calls, so that their values are those
+    of the last solution found, which solvers that support warm starts
+    use as the initial solution of the next call.
+
+    Parameters:
+        dag:
+            DAG whose paths the integer linear program finds.
+    """
+
+    def __init__(self, dag: Dag):
+        #: DAG whose paths the integer linear program finds.
+        self.dag: Dag = dag
+
+        #: Number of edges of the DAG when this model was built.
+        self.num_edges: int = dag.num_edges
+
+        #: Compacted form of the DAG.
+        self.compact_dag: CompactDag = get_compact_dag(dag)
+
+        #: Dictionary that maps each chain of the compacted DAG to
+        #: the binary variable for the flow through the chain.
+        self.edge_flows: Dict[int, pulp.LpVariable] = pulp.LpVariable.dicts(
+            "EdgeFlow", range(0, self.compact_dag.num_chains), 0, 1, pulp.LpBinary
+        )
+
+        #: Dictionary that maps the name of each flow-conservation
+        #: constraint to the constraint.
+        self.flow_constraints: Dict[str, pulp.LpConstraint] = {}
+
+        # Dictionary that maps the identifier of a path-exclusive constraint
+        # in a ``ConstraintPool`` to the name of the constraint and
+        # the constraint, built the first time that the constraint is used.
+        self._exclusive_constraints: Dict[int, Tuple[str, pulp.LpConstraint]] = {}
+
+        # Dictionary that maps the edges of a path-bundled constraint, as
+        # a tuple, to the name of the constraint and the constraint, built
+        # the first time that the constraint is used.
+        self._bundled_constraints: Dict[
+            Tuple[Tuple[str, str], ...], Tuple[str, pulp.LpConstraint]
+        ] = {}
+
+        # Add a constraint for the flow from the source. The flow through all_temp_files of
+        # the edges out of the source should sum up to exactly 1.
+        compact_dag, edge_flows = self.compact_dag, self.edge_flows
+        self._add_flow_constraint(
+            "Flows from source",
+            pulp.lpSum(edge_flows[i] for i in compact_dag.out_chains[dag.source]) == 1,
+        )
+
+        # Add constraints for the rest of the nodes (except sink). The flow
+        # through all_temp_files of the edges into a node should equal the flow through
+        # all_temp_files of the edges out of the node. Hence, for node n, if e_i and e_j
+        # enter a node, and e_k and e_l exit a node, the corresponding flow
+        # equation is e_i + e_j = e_k + e_l. The inner nodes of chains
+        # need no constraint.
+        for node in compact_dag.nodes:
+            if node == dag.source or node == dag.sink:
+                continue
+            edge_flows_to_node = [edge_flows[i] for i in compact_dag.in_chains[node]]
+            edge_flows_from_node = [edge_flows[i] for i in compact_dag.out_chains[node]]
+            self._add_flow_constraint(
+                "Flows through %s" % node,
+                pulp.lpSum(edge_flows_to_node) == pulp.lpSum(edge_flows_from_node),
+            )
+
+        # Add a constraint for the flow to the sink. The flow through all_temp_files of
+        # the edges into the sink should sum up to exactly 1.
+        self._add_flow_constraint(
+            "Flows to sink",
+            pulp.lpSum(edge_flows[i] for i in compact_dag.in_chains[dag.sink]) == 1,
+        )
+
+    def _add_flow_constraint(self, name: str, constraint: pulp.LpConstraint):
+        constraint.name = name
+        self.flow_constraints[name] = constraint
+
+    def _get_edge_flow_vars(
+        self, edges: List[Tuple[str, str]]
+    ) -> List[pulp.LpVariable]:
+        """
+        Parameters:
+            edges: List[Tuple[str, str]] :
+                List of edges whose corresponding PuLP variables are needed.
+
+        Returns:
+            List of the PuLP variables for the chains that contain
+            the edges in the input edge list, without repetitions.
+        """
+        return [self.edge_flows[i] for i in self.compact_dag.chains_of(edges)]
+
+    def exclusive_constraints(
+        self, pool: ConstraintPool
+    ) -> Dict[str, pulp.LpConstraint]:
+        """
+        Parameters:
+            pool: ConstraintPool :
+                Pool of the path-exclusive constraints, each of which is
+                a list of edges that must not be taken together.
+
+        Returns:
+            Dictionary that maps the name of each constraint in the pool
+            to the constraint. Only the constraints added to the pool since
+            the last call are built, and the constraints that were removed
+            from the pool are forgotten.
+        """
+        built = {}
+        for constraint_id, edges in pool.items():
+            if constraint_id in self._exclusive_constraints:
+                built[constraint_id] = self._exclusive_constraints[constraint_id]
+                continue
+            # To ensure that the edges in the constraint are not taken
+            # together, the total flow through the edges should add to
+            # at least one unit less than the number of edges in
+            # the constraint. Hence, if a constraint contains edges
+            # e_a, e_b, e_c, then e_a + e_b + e_c must be less than 3.
+            # Edges of the same chain share a variable, which is
+            # counted once.
+            name = "Path exclusive constraint %d" % (constraint_id + 1)
+            edge_flows = self._get_edge_flow_vars(edges)
+            constraint = pulp.lpSum(edge_flows) <= (len(edge_flows) - 1)
+            constraint.name = name
+            built[constraint_id] = (name, constraint)
+        self._exclusive_constraints = built
+        return dict(built.values())
+
+    def bundled_constraint(
+        self, edges: List[Tuple[str, str]]
+    ) -> Tuple[str, pulp.LpConstraint]:
+        """
+        Parameters:
+            edges: List[Tuple[str, str]] :
+                Edges that must be taken together, if the first is taken.
+
+        Returns:
+            Tuple of the name of the path-bundled constraint for the edges
+            and the constraint, which is built the first time that
+            it is needed.
+        """
+        key = tuple(tuple(edge) for edge in edges)
+        if key not in self._bundled_constraints:
+            # If a constraint contains edges e_a, e_b, e_c, e_d, and each
+            # edge *must* be taken, then e_b + e_c + e_d must sum up to e_a,
+            # scaled by 3 (or one less than the number of edges in
+            # the path constraint). Edges of the same chain share
+            # a variable, which is counted once.
+            name = "Path bundled constraint %d" % (len(self._bundled_constraints) + 1)
+            first_edge_flow, *edge_flows_for_rest = self._get_edge_flow_vars(edges)
+            constraint = (
+                pulp.lpSum(edge_flows_for_rest)
+                == len(edge_flows_for_rest) * first_edge_flow
+            )
+            constraint.name = name
+            self._bundled_constraints[key] = (name, constraint)
+        return self._bundled_constraints[key]
+
 
+# Dictionary that maps a DAG to a dictionary that maps the sense of
+# the objective function, maximization or minimization, to the model of
+# the integer linear program of ``find_extreme_path`` for the DAG.
+# Each sense has its own model, so that the problems for both can be
+# solved at the same time, and each warm-starts from its own last
+# solution. The models are discarded along with the DAG.
+_extreme_path_models: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_extreme_path_model(dag: Dag, sense: int) -> _ExtremePathModel:
+    """
+    Parameters:
+        dag: Dag :
+            DAG whose paths are needed.
+        sense: int :
+            Sense of the objective function, either ``pulp.LpMaximize``
+            or ``pulp.LpMinimize``.
+
+    Returns:
+        Model of the integer linear program of ``find_extreme_path`` for
+        the DAG and the sense, which is built the first time that it is
+        needed, and again if the edges of the DAG have changed since.
+    """
+    models = _extreme_path_models.setdefault(dag, {})
+    model = models.get(sense)
+    if model is None or model.num_edges != dag.num_edges:
+        logger.info("Creating the variables and the flow constraints...")
+        model = _ExtremePathModel(dag)
+        models[sense] = model
+    return model
+
+
+class _CoreProblemModel(_ExtremePathModel):
+    """
+    Maintains the integer linear program solved by
+    ``generate_and_solve_core_problem`` across calls on the same DAG:
+    in addition to the flow variables and constraints, and
+    the path-exclusive constraints, of ``_ExtremePathModel``, a weight
+    variable and a product variable for each chain, the constraints that
+    make each product variable the product of the flow through the chain
+    and its weight, which are built only once, and the constraints on
+    the lengths of the measured paths, which are built once for each
+    measured path and its bounds, the first time that they are used.
+
+    Parameters:
+        dag:
+            DAG whose paths the integer linear program finds.
+        m:
+            Bound on the absolute value of each weight, which is also
+            the constant of the constraints on the product variables.
+        weights_positive:
+            Whether the weights are required to be at least 0.
+        extremum:
+            Specifies whether the program finds Extremum.LONGEST or
+            Extremum.SHORTEST paths.
+    """
+
+    def __init__(self, dag: Dag, m: float, weights_positive: bool, extremum: int):
+        super(_CoreProblemModel, self).__init__(dag)
+
+        #: Bound on the absolute value of each weight.
+        self.m: float = m
+
+        num_chains = self.compact_dag.num_chains
+        edge_flows = self.edge_flows
+
+        #: Dictionary that maps each chain of the compacted DAG to
+        #: the variable for its weight.
+        self.edge_weights: Dict[int, pulp.LpVariable] = pulp.LpVariable.dicts(
+            "we", range(0, num_chains), 0 if weights_positive else -m, m
+        )
+
+        #: Dictionary that maps each chain of the compacted DAG to
+        #: the variable for the product of its flow and its weight.
+        self.product_vars: Dict[int, pulp.LpVariable] = pulp.LpVariable.dicts(
+            "pe", range(0, num_chains), -m, m
+        )
+
+        #: Objective function: the sum of the product variables, which is
+        #: the length of the path taken.
+        self.objective: pulp.LpAffineExpression = pulp.lpSum(self.product_vars.values())
+
+        #: Dictionary that maps the name of each constraint on a product
+        #: variable to the constraint.
+        self.product_constraints: Dict[str, pulp.LpConstraint] = {}
+
+        # Dictionary that maps the identifier of a measured path to
+        # the path, its upper and lower bounds, and the dictionary that
+        # maps the names of the constraints on its length to
+        # the constraints, built the first time that they are used.
+        self._path_constraints: Dict[
+            int, Tuple[object, float, float, Dict[str, pulp.LpConstraint]]
+        ] = {}
+        # Number of the measured paths whose constraints were built.
+        self._num_built_paths: int = 0
+
+        # Each product_vars[index] in the longest path should correspond to
+        # edge_flows[index] * edge_weights[index]. The bound by the edge
+        # weight is relaxed for the edges off the path, so that a negative
+        # weight on such an edge does not lower the value of the path.
+        for index in range(0, num_chains):
+            product_var = self.product_vars[index]
+            if extremum == Extremum.LONGEST:
+                constraints = [
+                    product_var
+                    <= self.edge_weights[index] + m * (1.0 - edge_flows[index]),
+                    product_var <= m * edge_flows[index],
+                ]
+            else:
+                constraints = [
+                    product_var
+                    >= self.edge_weights[index] - m * (1.0 - edge_flows[index]),
+                    product_var >= 0,
+                ]
+            for number, constraint in enumerate(constraints):
+                name = "Product %d bound %d" % (index, number)
+                constraint.name = name
+                self.product_constraints[name] = constraint
+
+    def path_constraints(
+        self, paths, path_function_upper, path_function_lower
+    ) -> Tuple[Dict[str, pulp.LpConstraint], int]:
+        """
+        Parameters:
+            paths:
+                List of measured paths, each an object of the ``Path``
+                class.
+            path_function_upper:
+                Function that returns the upper bound on the length of
+                a measured path.
+            path_function_lower:
+                Function that returns the lower bound on the length of
+                a measured path.
+
+        Returns:
+            Tuple whose first element is the dictionary that maps the name
+            of each constraint on the length of a measured path to
+            the constraint, and whose second element is the number of
+            the constraints that were built by this call. The constraints
+            of a path are only built again if its bounds have changed, and
+            the constraints of the paths that are not provided are
+            forgotten.
+        """
+        built, num_new_rows = {}, 0
+        for path in paths:
+            upper, lower = path_function_upper(path), path_function_lower(path)
+            entry = self._path_constraints.get(id(path))
+            if entry is None or entry[0] is not path or entry[1:3] != (upper, lower):
+                path_weight = pulp.lpSum(
+                    self.edge_weights[chain]
+                    for chain in self.compact_dag.chains_of(
+                        self.dag.get_edges(path.nodes)
+                    )
+                )
+                self._num_built_paths += 1
+                constraints = {}
+                for name, constraint in (
+                    ("Upper bound %d" % self._num_built_paths, path_weight <= upper),
+                    ("Lower bound %d" % self._num_built_paths, path_weight >= lower),
+                ):
+                    constraint.name = name
+                    constraints[name] = constraint
+                entry = (path, upper, lower, constraints)
+                num_new_rows += len(constraints)
+            built[id(path)] = entry
+        self._path_constraints = built
+        return (
+            {
+                name: constraint
+                for _, _, _, constraints in built.values()
+                for name, constraint in constraints.items()
+            },
+            num_new_rows,
+        )
+
+
+# Dictionary that maps a DAG to a dictionary that maps whether the weights
+# are positive, and the extremum, to the model of the integer linear
+# program of ``generate_and_solve_core_problem`` for the DAG. The models
+# are discarded along with the DAG.
+_core_problem_models: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_core_problem_model(
+    dag: Dag, m: float, weights_positive: bool, extremum: int
+) -> _CoreProblemModel:
+    """
+    Parameters:
+        dag: Dag :
+            DAG whose paths are needed.
+        m: float :
+            Bound on the absolute value of each weight.
+        weights_positive: bool :
+            Whether the weights are required to be at least 0.
+        extremum: int :
+            Specifies whether Extremum.LONGEST or Extremum.SHORTEST paths
+            are needed.
+
+    Returns:
+        Model of the integer linear program of
+        ``generate_and_solve_core_problem`` for the arguments provided,
+        which is built the first time that it is needed, and again if
+        the edges of the DAG, or the bound on the weights, have changed
+        since.
+    """
+    models = _core_problem_models.setdefault(dag, {})
+    key = (weights_positive, extremum)
+    model = models.get(key)
+    if model is None or model.num_edges != dag.num_edges or model.m != m:
+        logger.info("Creating variables")
+        model = _CoreProblemModel(dag, m, weights_positive, extremum)
+        models[key] = model
+    return model
+
+
+# Dictionary that maps a DAG to the integer linear program of
+# ``find_extreme_path`` for the DAG in matrix form, which is discarded
+# along with the DAG. The solver of the program in matrix form does not
+# start from the last solution found, so one program serves both senses.
+_extreme_path_matrices: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def _get_extreme_path_matrix(dag: Dag) -> ExtremePathMatrix:
+    """
+    Parameters:
+        dag: Dag :
+            DAG whose paths are needed.
+
+    Returns:
+        Integer linear program of ``find_extreme_path`` for the DAG in
+        matrix form, which is built the first time that it is needed, and
+        again if the edges of the DAG have changed since.
+    """
+    matrix = _extreme_path_matrices.get(dag)
+    if matrix is None or matrix.num_edges != dag.num_edges:
+        logger.info("Creating the flow-conservation matrix...")
+        matrix = ExtremePathMatrix(dag)
+        _extreme_path_matrices[dag] = matrix
+    return matrix
+
+
+def _find_extreme_path_in_dag(
+    dag: Dag, sense: int, edge_weights: List[float]
+) -> Tuple[List[Tuple[str, str]], IlpProblem]:
+    """
+    Finds the longest or the shortest path through the DAG by dynamic
+    programming over the chains of the compacted DAG in topological order,
+    in time linear in the size of the DAG. This gives the same optimal
+    value as
+    the integer linear program of ``find_extreme_path`` when the program
+    has no constraints other than the flow constraints.
+
+    Parameters:
+        dag: Dag :
+            DAG whose extreme path is needed.
+        sense: int :
+            ``pulp.LpMaximize`` to find the longest path, or
+            ``pulp.LpMinimize`` to find the shortest path.
+        edge_weights: List[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges.
 
     Returns:
-        List of paths satisfying the condition stated above
+        Tuple whose first element is the list of the edges along
+        the extreme path, and whose second element is an ``IlpProblem``
+        object that has no constraints, with the sense provided, and with
+        the value of the extreme path stored in its ``obj_val`` instance
+        variable.
+    """
+    maximize = sense == pulp.LpMaximize
+    compact_dag = get_compact_dag(dag)
+    chain_weights = compact_dag.chain_weights(edge_weights).tolist()
+    chain_heads = compact_dag.chain_heads
+
+    # Value of the extreme path from the source to each node, and
+    # the chain into the node along the path.
+    values = {dag.source: 0}
+    pred_chains = {}
+    for node in compact_dag.nodes:
+        if node not in values:
+            continue
+        for chain in compact_dag.out_chains[node]:
+            value = values[node] + chain_weights[chain]
+            succ = chain_heads[chain]
+            if succ not in values or (
+                value > values[succ] if maximize else value < values[succ]
+            ):
+                values[succ] = value
+                pred_chains[succ] = chain
+
+    extreme_chains = []
+    node = dag.sink
+    while node in pred_chains:
+        extreme_chains.append(pred_chains[node])
+        node = compact_dag.chain_tails[pred_chains[node]]
+    extreme_path = compact_dag.edges_of(extreme_chains)
+
+    problem = IlpProblem(_LP_NAME, sense)
+    problem.holds_program = False
+    problem.obj_val = values[dag.sink]
+    return extreme_path, problem
+
+
+def _solve_extreme_path_problem(
+    analyzer: Analyzer,
+    sense: int,
+    edge_weights: List[float],
+    interval: Interval,
+    warm_start: bool,
+) -> Tuple[Optional[List[Tuple[str, str]]], IlpProblem]:
+    """
+    Solves the integer linear program of ``find_extreme_path`` in
+    one direction.
+
+    Parameters:
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+        sense: int :
+            Sense of the objective function, either ``pulp.LpMaximize``
+            or ``pulp.LpMinimize``.
+        edge_weights: List[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges.
+        interval: Interval :
+            ``Interval`` object that represents the interval of values
+            that the path can have.
+        warm_start: bool :
+            Whether the solver should start from the last solution found
+            in the same direction, if it supports warm starts.
 
+    Returns:
+        Tuple whose first element is the list of the edges along
+        the extreme path, in no particular order, or None if no path
+        is feasible, and whose second element is the integer linear
+        programming problem that was solved, with the value of
+        the objective function at the optimal solution, if any, stored in
+        its ``obj_val`` instance variable.
     """
     project_config = analyzer.project_config
     dag = analyzer.dag
-    source = dag.source
-    sink = dag.sink
-    num_edges = dag.num_edges
-    edges = dag.edges()
-    num_paths = len(paths)
-
-    # Set up the linear programming problem.
-    logger.info("Number of paths: %d " % num_paths)
-    logger.info("Setting up the integer linear programming problem...")
+    direction = "maximum" if sense == pulp.LpMaximize else "minimum"
+
+    # Set up the linear programming problem. The variables, and
+    # the constraints that were used before, are reused from the model
+    # of the integer linear program for the DAG: only the constraints
+    # are collected, and the objective function is built.
+    model = _get_extreme_path_model(dag, sense)
+    edge_flows = model.edge_flows
+    chain_weights = model.compact_dag.chain_weights(edge_weights).tolist()
     problem = IlpProblem(_LP_NAME)
+    problem.extend(model.flow_constraints)
+
+    # Add constraints for the exclusive path constraints, such as
+    # the infeasible paths found so far, and for the bundled path
+    # constraints. Only the constraints that were not used in
+    # a previous call are built.
+    problem.extend(model.exclusive_constraints(analyzer.path_exclusive_constraints))
+    problem.extend(
+        dict(
+            model.bundled_constraint(path) for path in analyzer.path_bundled_constraints
+        )
+    )
 
-    logger.info("Creating variables")
-    indices = [(i, j) for i in range(num_paths) for j in range(num_paths)]
-    coeffs = pulp.LpVariable.dicts("c", indices, -k, k)
-    abs_values = pulp.LpVariable.dicts("abs", indices, 0, k)
-    used_paths = pulp.LpVariable.dicts("used", range(num_paths), 0, 1, pulp.LpBinary)
-
-    logger.info("Adding used_paths")
-    for i in range(num_paths):
-        for j in range(num_paths):
-            problem += k * used_paths[j] >= abs_values[(i, j)]
-
-    logger.info("Add absolute values")
-    for index in indices:
-        problem += abs_values[index] >= coeffs[index]
-        problem += abs_values[index] >= -coeffs[index]
-
-    for i in range(num_paths):
-        logger.info("Processing path number %d" % i)
-        # all_temp_files coefficients expressing path i
-        all_coeff_expressing = [abs_values[(i, j)] for j in range(num_paths)]
-        problem += pulp.lpSum(all_coeff_expressing) <= k
-        for edge in edges:
-            paths_containing_edge = [j for j in range(num_paths) if (edge in paths[j])]
-            present_coeffs = [coeffs[(i, j)] for j in paths_containing_edge]
-            present = 1 if (edge in paths[i]) else 0
-            problem += pulp.lpSum(present_coeffs) == present
-    objective = pulp.lpSum(used_paths)
-    problem += objective
-    problem.sense = pulp.LpMinimize
+    # There may be bounds on the values of the paths that are generated
+    # by this function: we add constraints for these bounds. For this,
+    # we weight the PuLP variables for the chains using the sums of
+    # the edge weights provided along them, and then impose bounds on
+    # the sum.
+    objective = pulp.LpAffineExpression(
+        [
+            (edge_flow_var, chain_weights[chain])
+            for chain, edge_flow_var in edge_flows.items()
+        ]
+    )
+    if interval.has_finite_lower_bound():
+        problem += objective >= interval.lower_bound
+    if interval.has_finite_upper_bound():
+        problem += objective <= interval.upper_bound
 
-    problem_status = problem.solve(solver=project_config.ilp_solver)
+    logger.info("Finding the %s value of the objective function..." % direction)
+    # The maximum is found by minimizing the negated objective function,
+    # since CBC misjudges the cost of the warm start of a maximization,
+    # and can return the warm start, which is the last solution found,
+    # as the optimal solution.
+    problem.sense = pulp.LpMinimize
+    problem.setObjective(-objective if sense == pulp.LpMaximize else objective)
+    # Each direction has its own solver object, since the problems for
+    # both directions can be solved at the same time.
+    problem_status = problem.solve(
+        solver=get_ilp_solver(
+            project_config.ilp_solver, project_config, warm_start, sense
+        )
+    )
+    problem.setObjective(objective)
+    problem.sense = sense
     if problem_status != pulp.LpStatusOptimal:
-        logger.info("Minimum value not found.")
-        return [], problem
-    obj_val_min = pulp.value(objective)
+        logger.info("%s value not found." % direction.capitalize())
+        return None, problem
+    problem.obj_val = pulp.value(objective)
+    logger.info("%s value found: %g" % (direction.capitalize(), problem.obj_val))
 
-    logger.info("Minimum value found: %g" % obj_val_min)
+    # Determine the edges along the extreme path using the solution.
+    extreme_path = model.compact_dag.edges_of(
+        chain for chain in edge_flows if edge_flows[chain].value() == 1
+    )
+    return extreme_path, problem
+
+
+def _solve_extreme_path_matrix(
+    analyzer: Analyzer,
+    sense: int,
+    edge_weights: List[float],
+    interval: Interval,
+) -> Tuple[Optional[List[Tuple[str, str]]], IlpProblem]:
+    """
+    Solves the integer linear program of ``find_extreme_path`` in
+    one direction, in matrix form, with the HiGHS solver provided with
+    the SciPy package.
+
+    Parameters:
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+        sense: int :
+            Sense of the objective function, either ``pulp.LpMaximize``
+            or ``pulp.LpMinimize``.
+        edge_weights: List[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges.
+        interval: Interval :
+            ``Interval`` object that represents the interval of values
+            that the path can have.
 
-    solution_paths = [
-        index for index in range(num_paths) if used_paths[index].value() == 1
+    Returns:
+        Tuple whose first element is the list of the edges along
+        the extreme path, in no particular order, or None if no path
+        is feasible, and whose second element is an ``IlpProblem`` object
+        that has no constraints, with the sense provided, and with
+        the value of the extreme path, if any, stored in its ``obj_val``
+        instance variable.
+    """
+    direction = "maximum" if sense == pulp.LpMaximize else "minimum"
+    matrix = _get_extreme_path_matrix(analyzer.dag)
+    rows = matrix.exclusive_rows(analyzer.path_exclusive_constraints)
+    rows.extend(matrix.bundled_row(path) for path in analyzer.path_bundled_constraints)
+
+    logger.info("Finding the %s value of the objective function..." % direction)
+    chains, obj_val = matrix.solve(
+        matrix.compact_dag.chain_weights(edge_weights),
+        sense == pulp.LpMaximize,
+        rows,
+        interval,
+    )
+    problem = IlpProblem(_LP_NAME, sense)
+    problem.holds_program = False
+    if chains is None:
+        logger.info("%s value not found." % direction.capitalize())
+        return None, problem
+    problem.obj_val = obj_val
+    logger.info("%s value found: %g" % (direction.capitalize(), problem.obj_val))
+    return matrix.compact_dag.edges_of(chains), problem
+
+
+def _solve_extreme_path_problems(
+    analyzer: Analyzer,
+    senses: List[int],
+    edge_weights: List[float],
+    interval: Interval,
+) -> List[Tuple[Optional[List[Tuple[str, str]]], IlpProblem]]:
+    """
+    Solves the integer linear program of ``find_extreme_path`` in each
+    of the directions provided, at the same time if the solver runs
+    as a separate process, or is HiGHS, which runs in this process
+    without holding the global interpreter lock.
+
+    Parameters:
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+        senses: List[int] :
+            Senses of the objective function to solve for, each either
+            ``pulp.LpMaximize`` or ``pulp.LpMinimize``.
+        edge_weights: List[float] :
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges.
+        interval: Interval :
+            ``Interval`` object that represents the interval of values
+            that the path can have.
+
+    Returns:
+        List of the tuples returned by ``_solve_extreme_path_problem``,
+        one for each sense, in the same order.
+    """
+    project_config = analyzer.project_config
+    if project_config.ilp_solver == "highs-scipy":
+        # The program is built in matrix form, directly from the chains
+        # of the compacted DAG, rather than term by term with PuLP.
+        return [
+            _solve_extreme_path_matrix(analyzer, sense, edge_weights, interval)
+            for sense in senses
+        ]
+    ilp_solver = get_ilp_solver(project_config.ilp_solver, project_config)
+    if len(senses) > 1 and isinstance(ilp_solver, (pulp.LpSolver_CMD, pulp.HiGHS)):
+        # Each problem is solved by a separate process of the solver, with
+        # its own files, or by its own HiGHS model in this process, so
+        # the problems for both extrema are solved at the same time.
+        logger.info("Solving for both extrema in parallel...")
+        with ThreadPoolExecutor(max_workers=len(senses)) as executor:
+            return list(
+                executor.map(
+                    lambda sense: _solve_extreme_path_problem(
+                        analyzer, sense, edge_weights, interval, True
+                    ),
+                    senses,
+                )
+            )
+    return [
+        _solve_extreme_path_problem(analyzer, sense, edge_weights, interval, True)
+        for sense in senses
     ]
-    return solution_paths
 
 
-def find_extreme_path(analyzer, extremum=Extremum.LONGEST, interval=None):
+def find_extreme_path(
+    analyzer, extremum=Extremum.LONGEST, interval=None, edge_weights=None
+):
     """
     Determines either the longest or the shortest path through the DAG
     with the constraints stored in the ``Analyzer`` object provided.
@@ -844,6 +1899,10 @@ def find_extreme_path(analyzer, extremum=Extremum.LONGEST, interval=None):
             that the generated paths can have. If no ``Interval`` object
             is provided, the interval of values is considered to be
             all_temp_files real numbers.
+        edge_weights:
+            Weights on all of the edges of the DAG, in the order of
+            the list of all edges, such as a column of an ``EdgeWeights``
+            object. If None, the edge weights of the DAG are used.
 
     Returns:
         Tuple whose first element is the longest or the shortest path
@@ -865,163 +1924,117 @@ def find_extreme_path(analyzer, extremum=Extremum.LONGEST, interval=None):
 
     dag = analyzer.dag
     source = dag.source
-    sink = dag.sink
-    num_edges = dag.num_edges
-
-    nodes_except_source_sink = dag.nodes_except_source_sink
-    edges = list(dag.all_edges)
-    edge_weights = dag.edge_weights
-
-    path_exclusive_constraints = analyzer.path_exclusive_constraints
-    path_bundled_constraints = analyzer.path_bundled_constraints
-
-    # Set up the linear programming problem.
-    logger.info("Setting up the integer linear programming problem...")
-    problem = IlpProblem(_LP_NAME)
 
-    logger.info("Creating the variables and adding the constraints...")
+    if edge_weights is None:
+        edge_weights = dag.edge_weights
 
-    # Set up the variables that correspond to the flow through each edge.
-    # Set each of the variables to be an integer binary variable.
-    edge_flows = pulp.LpVariable.dicts(
-        "EdgeFlow", range(0, num_edges), 0, 1, pulp.LpBinary
-    )
+    interval = interval or Interval()
 
-    # Add a constraint for the flow from the source. The flow through all_temp_files of
-    # the edges out of the source should sum up to exactly 1.
-    edge_flows_from_source = _get_edge_flow_vars(
-        analyzer, edge_flows, dag.out_edges(source)
+    # The path with the largest absolute value is either the longest or
+    # the shortest path, so both are found, and compared. If no edge
+    # weight is negative, however, no path has a negative value, so
+    # the longest path also has the largest absolute value, and only
+    # the extremum required needs to be found; likewise, if no edge
+    # weight is positive, the shortest path has the largest absolute value.
+    longest = extremum is Extremum.LONGEST
+    if all(edge_weight >= 0 for edge_weight in edge_weights):
+        senses = [pulp.LpMaximize if longest else pulp.LpMinimize]
+    elif all(edge_weight <= 0 for edge_weight in edge_weights):
+        senses = [pulp.LpMinimize if longest else pulp.LpMaximize]
+    else:
+        senses = [pulp.LpMaximize, pulp.LpMinimize]
+
+    # The solutions of the integer linear programs are cached, so that
+    # a program that was solved before, by this analysis or by an earlier
+    # one, is not solved again.
+    uses_solver = bool(
+        analyzer.path_exclusive_constraints
+        or analyzer.path_bundled_constraints
+        or interval.has_finite_lower_bound()
+        or interval.has_finite_upper_bound()
     )
-    problem += pulp.lpSum(edge_flows_from_source) == 1, "Flows from source"
-
-    # Add constraints for the rest of the nodes (except sink). The flow
-    # through all_temp_files of the edges into a node should equal the flow through
-    # all_temp_files of the edges out of the node. Hence, for node n, if e_i and e_j
-    # enter a node, and e_k and e_l exit a node, the corresponding flow
-    # equation is e_i + e_j = e_k + e_l.
-    for node in nodes_except_source_sink:
-        edge_flows_to_node = _get_edge_flow_vars(
-            analyzer, edge_flows, dag.in_edges(node)
+    ilp_cache = (
+        get_ilp_cache(
+            project_config.location_ilp_cache_dir, project_config.ILP_CACHE_SIZE
         )
-        edge_flows_from_node = _get_edge_flow_vars(
-            analyzer, edge_flows, dag.out_edges(node)
-        )
-        problem += (
-            pulp.lpSum(edge_flows_to_node) == pulp.lpSum(edge_flows_from_node),
-            "Flows through %s" % node,
-        )
-
-    # Add a constraint for the flow to the sink. The flow through all_temp_files of
-    # the edges into the sink should sum up to exactly 1.
-    edge_flows_to_sink = _get_edge_flow_vars(analyzer, edge_flows, dag.in_edges(sink))
-    problem += pulp.lpSum(edge_flows_to_sink) == 1, "Flows to sink"
-
-    # Add constraints for the exclusive path constraints. To ensure that
-    # the edges in each constraint are not taken together, the total flow
-    # through all_temp_files the edges should add to at least one unit less than
-    # the number of edges in the constraint. Hence, if a constraint
-    # contains edges e_a, e_b, e_c, then e_a + e_b + e_c must be less than 3.
-    # This way, all_temp_files three of these edges can never be taken together.
-    for constraint_num, path in enumerate(path_exclusive_constraints):
-        edge_flows_in_constraint = _get_edge_flow_vars(analyzer, edge_flows, path)
-        problem += (
-            pulp.lpSum(edge_flows_in_constraint) <= (len(path) - 1),
-            "Path exclusive constraint %d" % (constraint_num + 1),
+        if uses_solver
+        else None
+    )
+    if ilp_cache is not None:
+        identities = analyzer.get_node_identities()
+        cache_key = IlpCache.make_key(
+            identities,
+            dag,
+            edge_weights,
+            analyzer.path_exclusive_constraints,
+            analyzer.path_bundled_constraints,
+            interval,
+            extremum,
+            project_config.ilp_solver,
         )
-
-    # Add constraints for the bundled path constraints. If a constraint
-    # contains edges e_a, e_b, e_c, e_d, and each edge *must* be taken,
-    # then e_b + e_c + e_d must sum up to e_a, scaled by -3 (or one less
-    # than the number of edges in the path constraint). Hence, the flow
-    # constraint is e_b + e_c + e_d = -3 * e_a. By default, we scale
-    # the first edge in a constraint with this negative value.
-    for constraint_num, path in enumerate(path_bundled_constraints):
-        first_edge = path[0]
-        first_edge_flow = _get_edge_flow_var(analyzer, edge_flows, first_edge)
-        edge_flows_for_rest = _get_edge_flow_vars(analyzer, edge_flows, path[1:])
-        problem += (
-            pulp.lpSum(edge_flows_for_rest) == (len(path) - 1) * first_edge_flow,
-            "Path bundled constraint %d" % (constraint_num + 1),
+        cached_solution = ilp_cache.get(cache_key)
+        if cached_solution is not None:
+            logger.info(
+                "Found the solution of the integer linear program in the cache."
+            )
+            node_ids, obj_val, sense = cached_solution
+            result_path = [identities.nodes[node_id] for node_id in node_ids]
+            problem = IlpProblem(_LP_NAME, senses[0] if sense is None else sense)
+            problem.holds_program = False
+            problem.obj_val = obj_val
+            return result_path, problem
+
+    start_time = time.perf_counter()
+    if not uses_solver:
+        # Without constraints other than the flow constraints, the extreme
+        # path is found directly by dynamic programming, without a solver.
+        logger.info("Finding the extreme path by dynamic programming...")
+        solutions = [
+            _find_extreme_path_in_dag(dag, sense, edge_weights) for sense in senses
+        ]
+        num_solves = 0
+    else:
+        logger.info("Setting up the integer linear programming problem...")
+        solutions = _solve_extreme_path_problems(
+            analyzer, senses, edge_weights, interval
         )
-
-    # There may be bounds on the values of the paths that are generated
-    # by this function: we add constraints for these bounds. For this,
-    # we weight the PuLP variables for the edges using the list of
-    # edge weights provided, and then impose bounds on the sum.
-    weighted_edge_flow_vars = []
-    for edge_index, edge_flow_var in edge_flows.items():
-        edge_weight = edge_weights[edge_index]
-        weighted_edge_flow_vars.append(edge_weight * edge_flow_var)
-    interval = interval or Interval()
-    if interval.has_finite_lower_bound():
-        problem += pulp.lpSum(weighted_edge_flow_vars) >= interval.lower_bound
-    if interval.has_finite_upper_bound():
-        problem += pulp.lpSum(weighted_edge_flow_vars) <= interval.upper_bound
-
-    logger.info("Variables created and constraints added.")
-
-    logger.info("Constructing the objective function...")
-    # Finally, construct and add the objective function.
-    # We reuse the constraint (possibly) added in the last step of
-    # the constraint addition phase.
-    objective = pulp.lpSum(weighted_edge_flow_vars)
-    problem += objective
-    logger.info("Objective function constructed.")
-
-    logger.info("Finding the maximum value of the objective function...")
-
-    problem.sense = pulp.LpMaximize
-    problem_status = problem.solve(
-        solver=get_ilp_solver(project_config.ilp_solver, project_config)
-    )
-    if problem_status != pulp.LpStatusOptimal:
-        logger.info("Maximum value not found.")
-        return [], problem
-    obj_val_max = pulp.value(objective)
-
-    logger.info("Maximum value found: %g" % obj_val_max)
-
-    logger.info("Finding the path that corresponds to the maximum value...")
-    # Determine the edges along the extreme path using the solution.
-
-    max_path = [
-        edges[edge_num]
-        for edge_num in edge_flows.keys()
-        if (edge_flows[edge_num].value() == 1)
-    ]
-    logger.info("Path found.")
-
-    logger.info("Finding the minimum value of the objective function...")
-
-    problem.sense = pulp.LpMinimize
-    problem_status = problem.solve(
-        solver=get_ilp_solver(project_config.ilp_solver, project_config)
+        num_solves = len(senses)
+    solve_time = time.perf_counter() - start_time
+    logger.info(
+        "Solved %d integer linear program(s) in %.3f seconds."
+        % (num_solves, solve_time)
     )
-    if problem_status != pulp.LpStatusOptimal:
-        logger.info("Minimum value not found.")
-        return [], problem
-    obj_val_min = pulp.value(objective)
 
-    logger.info("Minimum value found: %g" % obj_val_min)
-
-    logger.info("Finding the path that corresponds to the minimum value...")
-    # Determine the edges along the extreme path using the solution.
-    min_path = [
-        edges[edge_num] for edge_num in edge_flows if edge_flows[edge_num].value() == 1
-    ]
-    logger.info("Path found.")
+    for extreme_path, problem in solutions:
+        problem.solve_time, problem.num_solves = solve_time, num_solves
+        if extreme_path is None:
+            if ilp_cache is not None:
+                ilp_cache.put(cache_key, [], None, None)
+            return [], problem
 
     # Choose the correct extreme path based on the optimal solutions
     # and the type of extreme path required.
-    abs_max, abs_min = abs(obj_val_max), abs(obj_val_min)
-    if extremum is Extremum.LONGEST:
-        extreme_path = max_path if abs_max >= abs_min else min_path
-        problem.sense = pulp.LpMaximize if abs_max >= abs_min else pulp.LpMinimize
-        problem.obj_val = max(abs_max, abs_min)
-    elif extremum is Extremum.SHORTEST:
-        extreme_path = min_path if abs_max >= abs_min else max_path
-        problem.sense = pulp.LpMinimize if abs_max >= abs_min else pulp.LpMaximize
-        problem.obj_val = min(abs_max, abs_min)
+    if len(solutions) > 1:
+        (max_path, max_problem), (min_path, min_problem) = solutions
+        abs_max, abs_min = abs(max_problem.obj_val), abs(min_problem.obj_val)
+        if extremum is Extremum.LONGEST:
+            extreme_path, problem = (
+                (max_path, max_problem)
+                if abs_max >= abs_min
+                else (min_path, min_problem)
+            )
+            problem.obj_val = max(abs_max, abs_min)
+        elif extremum is Extremum.SHORTEST:
+            extreme_path, problem = (
+                (min_path, min_problem)
+                if abs_max >= abs_min
+                else (max_path, max_problem)
+            )
+            problem.obj_val = min(abs_max, abs_min)
+    else:
+        ((extreme_path, problem),) = solutions
+        problem.obj_val = abs(problem.obj_val)
+    logger.info("Path found.")
 
     # Arrange the nodes along the extreme path in order of traversal
     # from source to sink.
@@ -1044,43 +2057,61 @@ def find_extreme_path(analyzer, extremum=Extremum.LONGEST, interval=None):
         result_path.append(curr_node)
     logger.info("Nodes along the chosen extreme path arranged.")
 
-    if project_config.debug_config.KEEP_ILP_SOLVER_OUTPUT:
-        _move_ilp_files(os.getcwd(), project_config.location_temp_dir)
-    else:
-        _remove_temp_ilp_files()
+    _save_ilp_problem(problem, project_config)
+    if ilp_cache is not None:
+        ilp_cache.put(
+            cache_key,
+            [identities.ids[node] for node in result_path],
+            problem.obj_val,
+            problem.sense,
+        )
 
     # We're done!
     return result_path, problem
 
 
-def _move_ilp_files(source_dir, dest_dir):
+def find_extreme_paths(
+    analyzer: Analyzer,
+    num_paths: int,
+    extremum: int = Extremum.LONGEST,
+    interval: Optional[Interval] = None,
+) -> List[Tuple[List[str], IlpProblem]]:
     """
-    Moves the files that are generated when an integer linear program
-    is solved, from the source directory whose location is provided
-    to the destination directory whose location is provided.
+    Determines a batch of up to ``num_paths`` distinct paths through the DAG,
+    in the order in which ``find_extreme_path`` finds them when each path
+    found is excluded before the next one is found. Each path is found by
+    a call to ``find_extreme_path``, and is added to the exclusive path
+    constraints of the ``Analyzer`` object provided as soon as it is found,
+    so that the next call excludes it.
 
     Parameters:
-        source_dir :
-            Location of the source directory
-        dest_dir :
-            Location of the destination directory
-    """
-    move_files(
-        [
-            _LP_NAME + r"-pulp\.lp",
-            _LP_NAME + r"-pulp\.mps",
-            _LP_NAME + r"-pulp\.prt",
-            _LP_NAME + r"-pulp\.sol",
-        ],
-        source_dir,
-        dest_dir,
-    )
-
-
-def _remove_temp_ilp_files():
-    """
-    Removes the temporary files that are generated when an
-    integer linear program is solved.
+        analyzer: Analyzer :
+            ``Analyzer`` object that maintains information about
+            the code being analyzed.
+        num_paths: int :
+            Upper bound on the number of paths to find.
+        extremum: int :
+            Type of extreme path to calculate.
+        interval: Optional[Interval] :
+            ``Interval`` object that represents the interval of values
+            that the paths can have. If no ``Interval`` object is
+            provided, the interval of values is considered to be all real
+            numbers.
 
+    Returns:
+        List of tuples, one for each path found, in the order in which
+        they were found, whose first element is the list of nodes along
+        the path, ordered by traversal from source to sink, and whose
+        second element is the integer linear programming problem that was
+        solved to obtain the path. The list has fewer than ``num_paths``
+        tuples if no other path is feasible.
     """
-    remove_files([r".*\.lp", r".*\.mps", r".*\.prt", r".*\.sol"], os.getcwd())
+    paths = []
+    while len(paths) < num_paths:
+        path_nodes, problem = find_extreme_path(analyzer, extremum, interval)
+        if problem.obj_val is None:
+            break
+        analyzer.add_path_exclusive_constraint(Dag.get_edges(path_nodes))
+        paths.append((path_nodes, problem))
+    logger.info("Found a batch of %d candidate path(s)." % len(paths))
+    return paths
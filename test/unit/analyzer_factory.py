@@ -0,0 +1,66 @@
+"""
+Builds the ``Analyzer`` objects that the unit tests use, for DAGs that
+are provided directly, rather than generated from code.
+"""
+
+import types
+
+from analyzer import Analyzer
+from constraint_pool import ConstraintPool
+from nx_helper import Dag
+from path_encoding import PathEncoder
+from project_configuration import DebugConfiguration
+
+
+class ProjectConfig(types.SimpleNamespace):
+    """
+    Stands in for a ``ProjectConfiguration`` object. It is hashed by
+    identity, as the caches of the ``pulp_helper`` module that are keyed
+    on the configuration require.
+    """
+
+    __hash__ = object.__hash__
+
+
+def make_analyzer(dag: Dag, temp_dir: str, **config) -> Analyzer:
+    """
+    Parameters:
+        dag: Dag
+            DAG to analyze.
+        temp_dir: str
+            Temporary directory of the analysis.
+        config
+            Values of the configuration that replace the defaults.
+
+    Returns:
+        Analyzer: Analyzer of the DAG, without a file to preprocess or
+        a backend to measure paths with.
+    """
+    project_config = ProjectConfig(
+        location_temp_dir=temp_dir,
+        func="main",
+        ilp_solver="cbc",
+        debug_config=DebugConfiguration(),
+        location_ilp_cache_dir=None,
+        ILP_CACHE_SIZE=0,
+        NUM_JOBS=1,
+        RESUME_BASIS_GENERATION=False,
+        INCREMENTAL_ANALYSIS=False,
+        SPARSE_BASIS_THRESHOLD=1000,
+    )
+    for name, value in config.items():
+        setattr(project_config, name, value)
+    analyzer = Analyzer.__new__(Analyzer)
+    analyzer.project_config = project_config
+    analyzer.dag = dag
+    analyzer.path_encoder = PathEncoder(dag)
+    analyzer.path_dimension = dag.num_edges - dag.num_nodes + 2
+    analyzer.basis_matrix = None
+    analyzer.reduced_edge_weights = None
+    analyzer.path_exclusive_constraints = ConstraintPool()
+    analyzer.path_bundled_constraints = []
+    analyzer.num_bad_rows = 0
+    analyzer.basis_paths = []
+    analyzer.basis_paths_nodes = []
+    analyzer._node_identities = None
+    return analyzer
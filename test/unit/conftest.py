@@ -0,0 +1,19 @@
+"""
+Configuration of the unit tests of the GameTime modules, which are run
+with ``python -m pytest test/unit`` from the root of the repository.
+"""
+
+import logging
+import os
+import sys
+
+# Add the src directory to the path to allow imports
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+        "src",
+    ),
+)
+
+logging.disable(logging.INFO)
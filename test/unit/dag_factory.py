@@ -0,0 +1,39 @@
+"""
+Builds the random directed acyclic graphs that the unit tests use.
+"""
+
+import random
+
+import networkx as nx
+
+from nx_helper import Dag
+
+
+def make_random_dag(num_nodes: int, num_extra_edges: int, seed: int) -> Dag:
+    """
+    Parameters:
+        num_nodes: int
+            Number of nodes of the DAG, at least 3.
+        num_extra_edges: int
+            Number of random forward edges added to the chain of the nodes.
+        seed: int
+            Seed of the choice of the edges.
+
+    Returns:
+        Dag: DAG whose nodes, in order, form a chain from the source to
+        the sink, with random edges from each node to a later one, and
+        whose label of each node is its name.
+    """
+    rng = random.Random(seed)
+    graph = nx.DiGraph()
+    names = ["N%03d" % i for i in range(num_nodes)]
+    for tail, head in zip(names[:-1], names[1:]):
+        graph.add_edge(tail, head)
+    for _ in range(num_extra_edges):
+        tail = rng.randrange(num_nodes - 2)
+        graph.add_edge(names[tail], names[rng.randrange(tail + 2, num_nodes)])
+    for name in names:
+        graph.nodes[name]["label"] = name
+    dag = Dag(graph)
+    dag.load_variables()
+    return dag
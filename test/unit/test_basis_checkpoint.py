@@ -0,0 +1,138 @@
+"""
+Tests of the checkpoints of basis generation, which must be restored for
+the DAG of a later run of GameTime on the same code, whose nodes have
+different names.
+"""
+
+import os
+import types
+
+import networkx as nx
+import numpy as np
+
+import basis_checkpoint
+from analyzer import Analyzer
+from basis_matrix import BasisMatrix
+from constraint_pool import ConstraintPool
+from dag_factory import make_random_dag
+from nx_helper import Dag, construct_dag
+from path import Path
+from path_encoding import PathEncoder
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def rename_nodes(dag: Dag, prefix: str) -> Dag:
+    renamed = Dag(
+        nx.relabel_nodes(
+            dag, {node: "%s%s" % (prefix, node) for node in dag.nodes}, copy=True
+        )
+    )
+    renamed.load_variables()
+    return renamed
+
+
+def make_analyzer(dag: Dag, temp_dir: str) -> Analyzer:
+    """
+    Returns:
+        Analyzer of the DAG provided, without a project to preprocess,
+        that saves its checkpoints of basis generation to the directory
+        provided, and resumes from them.
+    """
+    analyzer = Analyzer.__new__(Analyzer)
+    analyzer.project_config = types.SimpleNamespace(
+        location_temp_dir=temp_dir,
+        RESUME_BASIS_GENERATION=True,
+        SPARSE_BASIS_THRESHOLD=1000,
+    )
+    analyzer.dag = dag
+    analyzer.path_encoder = PathEncoder(dag)
+    analyzer.path_dimension = dag.num_edges - dag.num_nodes + 2
+    analyzer.basis_matrix = None
+    analyzer.num_bad_rows = 0
+    analyzer.path_exclusive_constraints = ConstraintPool()
+    analyzer._node_identities = None
+    return analyzer
+
+
+def labels(dag: Dag, nodes):
+    return [dag.nodes[node]["label"] for node in nodes]
+
+
+def test_identities_do_not_depend_on_names():
+    dag = make_random_dag(20, 15, 0)
+    # Give many nodes the same basic block, as the unrolled iterations
+    # of a loop have.
+    for index, node in enumerate(dag.nodes):
+        dag.nodes[node]["label"] = "block %d" % (index % 4)
+    dag.load_variables()
+    renamed = rename_nodes(dag, "Other")
+
+    identities = basis_checkpoint.NodeIdentities(dag)
+    renamed_identities = basis_checkpoint.NodeIdentities(renamed)
+    assert len(set(identities.ids.values())) == dag.num_nodes
+    assert identities.fingerprint == renamed_identities.fingerprint
+    for node in dag.nodes:
+        assert identities.ids[node] == renamed_identities.ids["Other%s" % node]
+
+
+def test_fingerprint_depends_on_edges():
+    dag = make_random_dag(20, 15, 0)
+    other = make_random_dag(20, 15, 1)
+    assert (
+        basis_checkpoint.NodeIdentities(dag).fingerprint
+        != basis_checkpoint.NodeIdentities(other).fingerprint
+    )
+
+
+def test_resume_across_runs_of_opt(tmp_path):
+    # The two files were written by two runs of ``opt -passes=dot-cfg`` on
+    # the same code, and name the nodes after different addresses.
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run1.dot"))
+    other_dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run2.dot"))
+    assert not set(dag.nodes) & set(other_dag.nodes)
+
+    analyzer = make_analyzer(dag, str(tmp_path))
+    all_paths = sorted(nx.all_simple_paths(dag, dag.source, dag.sink))
+    rows = analyzer.path_encoder.dense_rows(all_paths[: analyzer.path_dimension])
+    analyzer.basis_matrix = BasisMatrix(rows + np.eye(analyzer.path_dimension))
+    analyzer.basis_matrix.swap_rows(0, 1)
+    basis_paths = []
+    for index, nodes in enumerate(all_paths[:2]):
+        path = Path(nodes=nodes, measured_value=10.0 + index, predicted_value=9.0)
+        path.name = "basis-path%d" % index
+        basis_paths.append(path)
+    infeasible = [Dag.get_edges(all_paths[2])]
+    analyzer.add_path_exclusive_constraint(infeasible[0])
+    analyzer._save_basis_checkpoint(
+        "initial", basis_paths, infeasible, current_row=2, num_paths_unsat=0
+    )
+
+    resumed = make_analyzer(other_dag, str(tmp_path))
+    stage, resumed_paths, resumed_infeasible, loop_state = (
+        resumed._load_basis_checkpoint()
+    )
+    assert stage == "initial"
+    assert loop_state == {"current_row": 2, "num_paths_unsat": 0}
+    np.testing.assert_array_equal(
+        resumed.basis_matrix.matrix, analyzer.basis_matrix.matrix
+    )
+    for path, resumed_path in zip(basis_paths, resumed_paths):
+        assert resumed_path.name == path.name
+        assert resumed_path.measured_value == path.measured_value
+        assert all(node in other_dag for node in resumed_path.nodes)
+        assert labels(other_dag, resumed_path.nodes) == labels(dag, path.nodes)
+    (resumed_edges,) = resumed_infeasible
+    assert [labels(other_dag, edge) for edge in resumed_edges] == [
+        labels(dag, edge) for edge in infeasible[0]
+    ]
+    assert list(resumed.path_exclusive_constraints) == [resumed_edges]
+
+
+def test_checkpoint_for_other_dag_is_ignored(tmp_path):
+    dag = make_random_dag(12, 8, 0)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    analyzer._save_basis_checkpoint("done", [], [])
+    assert make_analyzer(dag, str(tmp_path))._load_basis_checkpoint() is not None
+    other = make_analyzer(make_random_dag(12, 8, 1), str(tmp_path))
+    assert other._load_basis_checkpoint() is None
@@ -0,0 +1,236 @@
+"""
+Tests of the speculative replacement of the rows of the basis matrix,
+which checks the feasibility of the candidates for several rows at once,
+and must replace the rows with the same paths, in the same order, as
+the replacement of one row at a time.
+"""
+
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import analyzer
+import path_analyzer
+import pulp_helper
+from analyzer_factory import make_analyzer
+from basis_matrix import BasisMatrix
+from dag_factory import make_random_dag
+from nx_helper import Dag
+
+NUM_NODES, NUM_EXTRA_EDGES = 14, 10
+
+# Configurations of the tests: seed of the DAG, determinant threshold,
+# and modulus of the hash of the paths that are infeasible.
+CONFIGS = [
+    (seed, threshold, modulus)
+    for seed in range(24)
+    for threshold, modulus in [(0.001, 2), (0.001, 3), (0.001, 4), (1.5, 3)]
+]
+
+
+def is_feasible(labels_file: str, modulus: int) -> bool:
+    """
+    Returns:
+        Whether the path whose labels are in the file provided is feasible,
+        which is decided by a hash of the labels, so that about one path
+        in ``modulus`` is infeasible.
+    """
+    with open(labels_file, "rb") as labels:
+        return zlib.crc32(labels.read()) % modulus != 0
+
+
+def find_extreme_path(analyzer, *args, **kwargs):
+    """
+    Returns:
+        Nodes along the path through the DAG of the analyzer that meets
+        its constraints and whose value has the largest absolute value,
+        found by listing all of the paths, along with a stand-in for
+        the problem solved, whose value is None if there is no such path.
+    """
+    dag = analyzer.dag
+    best = None
+    for nodes in nx.all_simple_paths(dag, dag.source, dag.sink):
+        edges = Dag.get_edges(nodes)
+        if analyzer.path_exclusive_constraints.excludes(edges):
+            continue
+        value = abs(sum(dag.edge_weights[dag.edges_indices[edge]] for edge in edges))
+        # Ties are broken by the names of the nodes, so that the path found
+        # does not depend on the order in which the paths are listed.
+        if best is None or (-value, nodes) < best:
+            best = (-value, nodes)
+    if best is None:
+        return [], SimpleNamespace(obj_val=None)
+    return best[1], SimpleNamespace(obj_val=-best[0])
+
+
+class Recorder:
+    """Stands in for the logger of the analyzer, and keeps its messages."""
+
+    def __init__(self):
+        self.messages = []
+
+    def info(self, message, *args):
+        self.messages.append(str(message) % args if args else str(message))
+
+    warning = debug = info
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    """
+    Replaces the integer linear program, the feasibility checks and
+    the measurements with stand-ins, and the pool of processes with
+    a pool of threads, so that the stand-ins are used by the checks.
+    """
+    modulus = [3]
+    monkeypatch.setattr(pulp_helper, "find_extreme_path", find_extreme_path)
+    monkeypatch.setattr(
+        path_analyzer,
+        "run_smt",
+        lambda project_config, labels_file, output_folder, num_labels: is_feasible(
+            labels_file, modulus[0]
+        ),
+    )
+    monkeypatch.setattr(
+        path_analyzer.PathAnalyzer,
+        "measure_path",
+        lambda self, backend: (
+            len(self.path.nodes) if self.check_feasibility() else float("inf")
+        ),
+    )
+    monkeypatch.setattr(analyzer, "ProcessPoolExecutor", ThreadPoolExecutor)
+    return modulus
+
+
+def generate_basis(tmp_path, seed: int, threshold: float, num_jobs: int):
+    """
+    Returns:
+        Analyzer of a random DAG, whose labels of the nodes name the blocks
+        as LLVM does, after it generated its basis paths with the number
+        of jobs provided, and the nodes along the basis paths.
+    """
+    dag = make_random_dag(NUM_NODES, NUM_EXTRA_EDGES, seed)
+    for index, node in enumerate(dag.nodes):
+        dag.nodes[node]["label"] = "%%%d:" % index
+    dag.load_variables()
+    temp_dir = tmp_path / ("jobs%d" % num_jobs)
+    temp_dir.mkdir()
+    (temp_dir / "labels_0.txt").write_text(
+        "".join("%d\n" % index for index in range(dag.num_nodes))
+    )
+    basis_analyzer = make_analyzer(
+        dag,
+        str(temp_dir),
+        NUM_JOBS=num_jobs,
+        DETERMINANT_THRESHOLD=threshold,
+        MAX_INFEASIBLE_PATHS=100,
+        PREVENT_BASIS_REFINEMENT=True,
+        OVER_COMPLETE_BASIS=False,
+        RANDOMIZE_INITIAL_BASIS=False,
+    )
+    basis_analyzer.backend = None
+    basis_analyzer.preprocessed_path = ""
+    paths = basis_analyzer.generate_basis_paths()
+    return basis_analyzer, [path.nodes for path in paths]
+
+
+def spy_on_basis_matrix(monkeypatch, threshold: float):
+    """
+    Returns:
+        List that is set to True once a candidate for a row, whose
+        determinant reached the threshold provided when it was found,
+        no longer reaches it after another row is replaced.
+    """
+    stale = [False]
+    # Candidates found since the last row was replaced, as the storage
+    # positions of their rows and the encodings of their paths.
+    candidates = []
+    replacement_log_det = BasisMatrix.replacement_log_det
+    replace_row = BasisMatrix.replace_row
+
+    def is_good(sign, log_det):
+        return sign != 0 and np.exp(log_det) >= threshold
+
+    def spy_replacement_log_det(self, row, path):
+        sign, log_det = replacement_log_det(self, row, path)
+        if is_good(sign, log_det):
+            candidates.append((self.order[row], np.array(path)))
+        return sign, log_det
+
+    def spy_replace_row(self, row, path):
+        position = self.order[row]
+        replace_row(self, row, path)
+        for candidate_position, candidate_path in candidates:
+            if candidate_position == position:
+                continue
+            candidate_row = list(self.order).index(candidate_position)
+            if not is_good(*replacement_log_det(self, candidate_row, candidate_path)):
+                stale[0] = True
+        candidates.clear()
+
+    monkeypatch.setattr(BasisMatrix, "replacement_log_det", spy_replacement_log_det)
+    monkeypatch.setattr(BasisMatrix, "replace_row", spy_replace_row)
+    return stale
+
+
+def has_infeasible_middle_candidate(messages) -> bool:
+    """
+    Returns:
+        Whether, in a batch of three rows, the candidate for the first row
+        replaced it, and the candidate for the second row was infeasible.
+    """
+    outcomes = {
+        "Replacement is infeasible.": "infeasible",
+        "Moving the bad row to the bottom of the basis matrix.": "bad",
+    }
+    batches = []
+    for message in messages:
+        if message.startswith("Currently at rows "):
+            first, last = message[len("Currently at rows ") : -3].split(" to ")
+            batches.append((int(last) - int(first) + 1, []))
+        elif message.startswith("Row ") and message.endswith(" replaced."):
+            batches[-1][1].append("replaced")
+        elif message in outcomes:
+            batches[-1][1].append(outcomes[message])
+    return any(
+        size >= 3 and results[:2] == ["replaced", "infeasible"]
+        for size, results in batches
+    )
+
+
+def test_speculative_rows_match_sequential_rows(tmp_path, monkeypatch, stubs):
+    infeasible_middle, stale = [], []
+    for seed, threshold, modulus in CONFIGS:
+        stubs[0] = modulus
+        run_dir = tmp_path / ("%d-%g-%d" % (seed, threshold, modulus))
+        run_dir.mkdir()
+        sequential, sequential_paths = generate_basis(run_dir, seed, threshold, 1)
+
+        with monkeypatch.context() as patch:
+            recorder = Recorder()
+            patch.setattr(analyzer, "logger", recorder)
+            is_stale = spy_on_basis_matrix(patch, threshold)
+            speculative, speculative_paths = generate_basis(run_dir, seed, threshold, 3)
+
+        assert speculative_paths == sequential_paths
+        assert np.array_equal(
+            np.asarray(speculative.basis_matrix.matrix),
+            np.asarray(sequential.basis_matrix.matrix),
+        )
+        assert speculative.num_bad_rows == sequential.num_bad_rows
+        assert len(speculative.path_exclusive_constraints) == len(
+            sequential.path_exclusive_constraints
+        )
+        if has_infeasible_middle_candidate(recorder.messages):
+            infeasible_middle.append((seed, threshold, modulus))
+        if is_stale[0]:
+            stale.append((seed, threshold, modulus))
+
+    # The configurations cover the batches in which the rows are not all
+    # replaced by the candidates found for them.
+    assert infeasible_middle
+    assert stale
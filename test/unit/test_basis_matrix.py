@@ -0,0 +1,116 @@
+"""
+Tests of the basis matrix, whose cofactors, determinants and solves,
+read off one factorization that is updated as rows change, must agree
+with those computed directly from the matrix.
+"""
+
+import types
+
+import numpy as np
+import pytest
+from numpy.linalg import slogdet
+
+from analyzer import Analyzer
+from basis_matrix import BasisMatrix, SparseBasisMatrix, minor_cofactors
+from dag_factory import make_random_dag
+from path_encoding import PathEncoder
+
+MATRIX_CLASSES = [BasisMatrix, SparseBasisMatrix]
+
+
+def assert_cofactors_match(basis_matrix, matrix):
+    for row in range(matrix.shape[0]):
+        expected = minor_cofactors(matrix, row)
+        np.testing.assert_allclose(
+            basis_matrix.cofactors(row),
+            expected,
+            rtol=1e-8,
+            atol=1e-10 * max(1.0, np.abs(expected).max()),
+        )
+
+
+@pytest.mark.parametrize("matrix_class", MATRIX_CLASSES)
+@pytest.mark.parametrize("seed", range(5))
+def test_cofactors_match_minors(matrix_class, seed):
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(-3, 4, size=(7, 7)).astype(float) + np.eye(7) * 5
+    assert_cofactors_match(matrix_class(matrix), matrix)
+
+
+@pytest.mark.parametrize("matrix_class", MATRIX_CLASSES)
+@pytest.mark.parametrize("seed", range(5))
+def test_cofactors_match_minors_after_updates(matrix_class, seed):
+    rng = np.random.default_rng(seed)
+    dimension = 6
+    matrix = rng.integers(0, 2, size=(dimension, dimension)).astype(float)
+    matrix += np.eye(dimension)
+    basis_matrix = matrix_class(matrix, max_updates=4)
+    for _ in range(12):
+        operation = rng.integers(3)
+        row = int(rng.integers(dimension))
+        if operation == 0:
+            new_row = rng.integers(0, 2, size=dimension).astype(float)
+            sign, log_det = basis_matrix.replacement_log_det(row, new_row)
+            matrix[row] = new_row
+            expected_sign, expected_log_det = slogdet(matrix)
+            assert sign == expected_sign
+            if sign != 0:
+                assert log_det == pytest.approx(expected_log_det, abs=1e-9)
+            basis_matrix.replace_row(row, new_row)
+        elif operation == 1:
+            other = int(rng.integers(dimension))
+            basis_matrix.swap_rows(row, other)
+            matrix[[row, other]] = matrix[[other, row]]
+        else:
+            basis_matrix.move_row_to_bottom(row)
+            matrix[row:] = np.roll(matrix[row:], -1, axis=0)
+        np.testing.assert_array_equal(basis_matrix.matrix, matrix)
+        assert basis_matrix.is_singular == (slogdet(matrix)[0] == 0)
+        assert_cofactors_match(basis_matrix, matrix)
+
+
+@pytest.mark.parametrize("matrix_class", MATRIX_CLASSES)
+def test_solve_matches_numpy(matrix_class):
+    rng = np.random.default_rng(0)
+    matrix = rng.normal(size=(8, 8))
+    b = rng.normal(size=(8, 3))
+    basis_matrix = matrix_class(matrix)
+    basis_matrix.replace_row(2, rng.normal(size=8))
+    matrix = basis_matrix.matrix
+    np.testing.assert_allclose(
+        basis_matrix.solve(b), np.linalg.solve(matrix, b), rtol=1e-8, atol=1e-10
+    )
+
+
+def baseline_subdets(dag, matrix, row):
+    """
+    Returns:
+        Edge weights computed as the original ``_calculate_subdets`` of
+        ``Analyzer`` computed them: one determinant for each minor.
+    """
+    edge_weights = [0] * dag.num_edges
+    cofactors = minor_cofactors(matrix, row)
+    for j, edge in enumerate(dag.edges_reduced):
+        edge_weights[dag.edges_reduced_indices[edge]] = cofactors[j]
+    return edge_weights
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_calculate_subdets_matches_baseline(seed):
+    dag = make_random_dag(12, 8, seed)
+    path_encoder = PathEncoder(dag)
+    dimension = path_encoder.num_columns
+    rng = np.random.default_rng(seed)
+    matrix = rng.integers(0, 2, size=(dimension, dimension)).astype(float)
+    matrix += np.eye(dimension)
+    analyzer = types.SimpleNamespace(
+        basis_matrix=BasisMatrix(matrix), path_encoder=path_encoder
+    )
+    for row in range(dimension):
+        expected = baseline_subdets(dag, matrix, row)
+        np.testing.assert_allclose(
+            Analyzer._calculate_subdets(analyzer, row),
+            expected,
+            rtol=1e-8,
+            atol=1e-10 * max(1.0, np.abs(expected).max()),
+        )
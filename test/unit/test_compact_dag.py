@@ -0,0 +1,86 @@
+"""
+Tests of the compacted form of a DAG, whose chains must partition its
+edges into the branch-free sequences that every path takes entirely
+or not at all.
+"""
+
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from compact_dag import CompactDag, get_compact_dag
+from dag_factory import make_random_dag
+from nx_helper import Dag, construct_dag
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def dags():
+    for seed in range(5):
+        yield make_random_dag(20, 6, seed)
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run1.dot"))
+    yield dag
+
+
+@pytest.mark.parametrize("dag", list(dags()))
+def test_chains_partition_the_edges(dag):
+    compact_dag = CompactDag(dag)
+    edges = compact_dag.edges_of(range(compact_dag.num_chains))
+    assert sorted(edges) == sorted(dag.all_edges)
+    assert compact_dag.chain_offsets[-1] == dag.num_edges
+
+    edge_map = compact_dag.edge_map()
+    for chain in range(compact_dag.num_chains):
+        chain_edges = compact_dag.edges_of([chain])
+        assert chain_edges[0][0] == compact_dag.chain_tails[chain]
+        assert chain_edges[-1][1] == compact_dag.chain_heads[chain]
+        for (_, head), (tail, _) in zip(chain_edges, chain_edges[1:]):
+            # Each inner node of a chain has one edge in and one edge out.
+            assert head == tail
+            assert dag.in_degree(head) == 1 and dag.out_degree(head) == 1
+        assert all(edge_map[edge] == chain for edge in chain_edges)
+        assert chain in compact_dag.out_chains[compact_dag.chain_tails[chain]]
+        assert chain in compact_dag.in_chains[compact_dag.chain_heads[chain]]
+
+
+@pytest.mark.parametrize("dag", list(dags()))
+def test_nodes_are_in_topological_order(dag):
+    compact_dag = CompactDag(dag)
+    order = {node: index for index, node in enumerate(compact_dag.nodes)}
+    for tail, head in zip(compact_dag.chain_tails, compact_dag.chain_heads):
+        assert order[tail] < order[head]
+    assert compact_dag.nodes[0] == dag.source
+    assert compact_dag.nodes[-1] == dag.sink
+
+
+@pytest.mark.parametrize("dag", list(dags()))
+def test_paths_take_whole_chains(dag):
+    compact_dag = CompactDag(dag)
+    rng = np.random.default_rng(0)
+    edge_weights = rng.uniform(-5, 5, size=dag.num_edges)
+    chain_weights = compact_dag.chain_weights(edge_weights)
+    for nodes in nx.all_simple_paths(dag, dag.source, dag.sink):
+        edges = Dag.get_edges(nodes)
+        chains = compact_dag.chains_of(edges)
+        assert sorted(compact_dag.edges_of(chains)) == sorted(edges)
+        assert chain_weights[chains].sum() == pytest.approx(
+            sum(edge_weights[dag.edges_indices[edge]] for edge in edges)
+        )
+
+
+def test_compact_dag_is_shared_until_edges_change():
+    dag = make_random_dag(12, 4, 0)
+    compact_dag = get_compact_dag(dag)
+    assert get_compact_dag(dag) is compact_dag
+
+    tail, head = dag.all_nodes[0], dag.all_nodes[-2]
+    if dag.has_edge(tail, head):
+        dag.remove_edge(tail, head)
+    else:
+        dag.add_edge(tail, head)
+    dag.load_variables()
+    rebuilt = get_compact_dag(dag)
+    assert rebuilt is not compact_dag
+    assert sorted(rebuilt.edges_of(range(rebuilt.num_chains))) == sorted(dag.all_edges)
@@ -0,0 +1,85 @@
+"""
+Tests of the pool of path-exclusive constraints, which must keep exactly
+the constraints that no other constraint dominates, as a scan of every
+pair of constraints would.
+"""
+
+import random
+
+import pytest
+
+from constraint_pool import ConstraintPool
+
+
+def reference_pool(constraints):
+    """
+    Returns:
+        Edge lists of the constraints that a pool should keep after
+        the constraints provided are added in order, found by comparing
+        each constraint against every stored one.
+    """
+    stored = []
+    for edges in constraints:
+        edge_set = set(edges)
+        if any(set(other) <= edge_set for other in stored):
+            continue
+        stored = [other for other in stored if not edge_set <= set(other)]
+        stored.append(list(edges))
+    return stored
+
+
+def random_constraints(seed, num_constraints, num_edges):
+    rng = random.Random(seed)
+    edges = [("n%d" % i, "n%d" % (i + 1)) for i in range(num_edges)]
+    return [
+        rng.sample(edges, rng.randint(1, min(5, num_edges)))
+        for _ in range(num_constraints)
+    ]
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_pool_keeps_undominated_constraints(seed):
+    constraints = random_constraints(seed, 200, 12)
+    pool = ConstraintPool()
+    for edges in constraints:
+        pool.add(edges)
+    expected = reference_pool(constraints)
+    assert list(pool) == expected
+    assert len(pool) == len(expected)
+    assert pool.num_ignored + len(pool) + pool.num_pruned == len(constraints)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_excludes_and_contains(seed):
+    constraints = random_constraints(seed, 50, 10)
+    pool = ConstraintPool(constraints)
+    stored = list(pool)
+    for edges in random_constraints(seed + 100, 100, 10):
+        edge_set = set(edges)
+        assert pool.excludes(edges) == any(set(other) <= edge_set for other in stored)
+        assert (edges in pool) == any(set(other) == edge_set for other in stored)
+
+
+def test_identifiers_are_kept_while_stored():
+    first, second = ConstraintPool(), ConstraintPool()
+    a, b, c = ("a", "b"), ("b", "c"), ("c", "d")
+    assert first.add([a, b])
+    assert first.add([b, c])
+    assert second.add([a, b])
+    ids = dict(first.items())
+    assert not set(ids) & set(dict(second.items()))
+
+    # A duplicate, in any order, and a superset are ignored.
+    assert not first.add([b, a])
+    assert not first.add([a, b, c])
+    assert dict(first.items()) == ids
+
+    # A subset replaces the constraints that it dominates, and the others
+    # keep their identifiers.
+    assert first.add([c])
+    ((first_id, _),) = [item for item in ids.items() if item[1] == [a, b]]
+    assert dict(first.items())[first_id] == [a, b]
+    assert first.add([a])
+    assert list(first) == [[c], [a]]
+    assert first.num_pruned == 2
+    assert first == [[c], [a]]
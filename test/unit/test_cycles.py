@@ -0,0 +1,90 @@
+"""
+Tests of the detection of cycles, which must agree with the cycles that
+NetworkX lists, and must reflect every change to the nodes or the edges
+of a ``Dag``, whose back edges found from the root, once removed, leave
+a graph without cycles.
+"""
+
+import networkx as nx
+import pytest
+
+from dag_factory import make_random_dag
+from nx_helper import Dag, find_back_edges, find_root_node, has_cycles
+
+
+def random_digraph(seed: int) -> nx.DiGraph:
+    """
+    Returns:
+        Random directed graph, which has cycles for about a third of
+        the seeds.
+    """
+    graph = nx.gnp_random_graph(12, 0.02 + 0.01 * (seed % 10), seed, directed=True)
+    return nx.DiGraph(graph)
+
+
+def lists_cycles(graph: nx.DiGraph) -> bool:
+    return next(nx.simple_cycles(graph), None) is not None
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_agrees_with_simple_cycles(seed):
+    graph = random_digraph(seed)
+    expected = lists_cycles(graph)
+    assert has_cycles(graph) == expected
+    assert has_cycles(Dag(graph)) == expected
+    assert len(find_back_edges(graph, first_only=True)) == int(expected)
+
+
+def test_seeds_cover_both_cases():
+    assert {lists_cycles(random_digraph(seed)) for seed in range(40)} == {
+        False,
+        True,
+    }
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_removing_back_edges_leaves_no_cycles(seed):
+    graph = random_digraph(seed)
+    root = find_root_node(graph) or next(iter(graph.nodes))
+    back_edges = find_back_edges(graph, root)
+    assert len(set(back_edges)) == len(back_edges)
+    assert all(graph.has_edge(*edge) for edge in back_edges)
+    assert bool(back_edges) == lists_cycles(graph)
+    graph.remove_edges_from(back_edges)
+    assert nx.is_directed_acyclic_graph(graph)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dag_changes_are_reflected(seed):
+    dag = make_random_dag(12, 6, seed)
+    nodes = dag.all_nodes
+    assert not has_cycles(dag)
+    assert dag._has_cycles is False
+
+    # An edge back to the source, and its removal.
+    dag.add_edge(nodes[-1], nodes[0])
+    assert dag._has_cycles is None
+    assert has_cycles(dag)
+    dag.remove_edge(nodes[-1], nodes[0])
+    assert not has_cycles(dag)
+
+    # Edges added several at a time, and removed several at a time.
+    dag.add_edges_from([(nodes[5], "loop"), ("loop", nodes[2])])
+    assert has_cycles(dag)
+    dag.remove_edges_from([("loop", nodes[2])])
+    assert not has_cycles(dag)
+    dag.update(edges=[(nodes[7], nodes[3])])
+    assert has_cycles(dag)
+    dag.remove_node(nodes[3])
+    assert not has_cycles(dag)
+
+    # A self-loop, and the removal of every edge, then of every node.
+    dag.add_edge(nodes[4], nodes[4])
+    assert has_cycles(dag)
+    dag.clear_edges()
+    assert not has_cycles(dag)
+    dag.add_edge(nodes[6], nodes[6])
+    assert has_cycles(dag)
+    dag.clear()
+    assert not has_cycles(dag)
+    assert lists_cycles(dag) is False
@@ -0,0 +1,153 @@
+"""
+Tests of the reader of the control-flow graphs that ``opt -passes=dot-cfg``
+writes, which must build the graph that ``read_dot`` builds for files in
+that dialect of DOT, and must refuse every other file.
+"""
+
+import os
+import re
+
+import networkx as nx
+import pytest
+
+from dot_cfg_parser import parse_dot_cfg
+from nx_helper import Dag
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+DOT_FILES = [os.path.join(DATA_DIR, "cfg_run%d.dot" % run) for run in (1, 2)]
+
+
+def parse_file(location: str) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    with open(location, "r") as dot_file:
+        assert parse_dot_cfg(dot_file, graph)
+    return graph
+
+
+def parse_text(text: str):
+    graph = nx.DiGraph()
+    return parse_dot_cfg(text.splitlines(keepends=True), graph), graph
+
+
+@pytest.mark.parametrize("location", DOT_FILES)
+def test_reads_opt_output(location):
+    graph = parse_file(location)
+    with open(location, "r") as dot_file:
+        text = dot_file.read()
+
+    # Nodes are in the order in which they first appear, and the edges
+    # from each node in the order in which they appear, with parallel
+    # edges merged.
+    names = re.findall(r"Node0x[0-9a-f]+", text)
+    assert list(graph.nodes) == list(dict.fromkeys(names))
+    edges = re.findall(r"(Node0x[0-9a-f]+)(?::s\d+)? -> (Node0x[0-9a-f]+)", text)
+    edges = list(dict.fromkeys(edges))
+    assert list(graph.edges) == [
+        edge for node in graph.nodes for edge in edges if edge[0] == node
+    ]
+    assert len(edges) < len(re.findall("->", text))
+
+    name = "CFG for 'f' function"
+    assert graph.graph["name"] == name
+    assert graph.graph["label"] == name
+    assert graph.graph["graph"] == {"label": name}
+    assert graph.graph["node"] == {} and graph.graph["edge"] == {}
+
+    blocks = {
+        graph.nodes[node]["label"].split(":")[0][1:]: node for node in graph.nodes
+    }
+    assert sorted(blocks) == ["a", "b", "else", "entry", "join", "loop", "then"]
+    entry = graph.nodes[blocks["entry"]]
+    assert entry["shape"] == "record"
+    assert entry["color"] == "#3d50c3ff"
+    assert entry["label"].startswith("{entry:\\l  %c = icmp sgt i32 %n, 0\\l")
+
+    # The ports of the record shapes are kept, and the self-loop of
+    # the loop is read as an edge.
+    assert graph.edges[blocks["entry"], blocks["then"]]["tailport"] == "s0"
+    assert graph.edges[blocks["entry"], blocks["else"]]["tailport"] == "s1"
+    assert graph.has_edge(blocks["loop"], blocks["loop"])
+
+
+def test_runs_differ_only_in_names():
+    first, second = (parse_file(location) for location in DOT_FILES)
+    assert set(first.nodes).isdisjoint(second.nodes)
+    renaming = dict(zip(first.nodes, second.nodes))
+    assert [(renaming[tail], renaming[head]) for tail, head in first.edges] == list(
+        second.edges
+    )
+    for node in first.nodes:
+        assert first.nodes[node] == second.nodes[renaming[node]]
+
+
+def test_reads_into_a_dag():
+    dag = Dag()
+    with open(DOT_FILES[0], "r") as dot_file:
+        assert parse_dot_cfg(dot_file, dag)
+    assert dag.number_of_nodes() == 7
+    assert dag.number_of_edges() == 10
+
+
+def test_identifiers_and_escapes():
+    success, graph = parse_text(
+        "strict digraph G {\n"
+        "  rankdir = LR;\n"
+        '  "a node" [label="say \\"hi\\"\\l", width=1.5];\n'
+        '  1 [label="back\\\\slash"]\n'
+        '  "a node":"p 1" -> 1:s2 [style="dashed", weight=2];\n'
+        "  1 -> -2.5\n"
+        "}\n"
+        "\n"
+    )
+    assert success
+    assert graph.graph["name"] == "G"
+    assert graph.graph["rankdir"] == "LR"
+    assert list(graph.nodes) == ["a node", "1", "-2.5"]
+    assert graph.nodes["a node"] == {"label": 'say "hi"\\l', "width": "1.5"}
+    assert graph.nodes["1"] == {"label": "back\\\\slash"}
+    assert graph.edges["a node", "1"] == {
+        "style": "dashed",
+        "weight": "2",
+        "tailport": "p 1",
+        "headport": "s2",
+    }
+    assert graph.edges["1", "-2.5"] == {}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "\n\n",
+        "graph G {\n  a;\n}\n",
+        "digraph G {\n  node [shape=record];\n  a -> b;\n}\n",
+        "digraph G {\n  edge [color=red];\n  a -> b;\n}\n",
+        "digraph G {\n  graph [rankdir=LR];\n  a -> b;\n}\n",
+        "digraph G {\n  subgraph cluster {\n    a -> b;\n  }\n}\n",
+        "digraph G {\n  a -> b -> c;\n}\n",
+        'digraph G {\n  a [label="first\nsecond"];\n}\n',
+        "digraph G {\n  a [shape=record\n    label=x];\n}\n",
+        "digraph G {\n  a [shape=];\n}\n",
+        "digraph G {\n  a -> b;\n",
+        "digraph G {\n  a -> b;\n}\nc -> d;\n",
+        "digraph G { a -> b; }\n",
+    ],
+)
+def test_other_dialects_are_refused(text):
+    success, graph = parse_text(text)
+    assert not success
+    assert graph.number_of_nodes() == 0
+    assert graph.graph == {}
+
+
+@pytest.mark.parametrize("location", DOT_FILES)
+def test_matches_read_dot(location):
+    pytest.importorskip("pygraphviz")
+    graph = parse_file(location)
+    expected = nx.DiGraph(nx.nx_agraph.read_dot(location))
+    assert list(graph.nodes) == list(expected.nodes)
+    assert list(graph.edges) == list(expected.edges)
+    for node in graph.nodes:
+        assert graph.nodes[node] == expected.nodes[node]
+    assert graph.graph == expected.graph
@@ -0,0 +1,165 @@
+"""
+Tests of the dynamic program that finds extreme paths through DAGs
+without constraints, which must find the same paths as the integer
+linear program that it replaces.
+"""
+
+import os
+
+import networkx as nx
+import numpy as np
+import pulp
+import pytest
+
+import pulp_helper
+from analyzer_factory import make_analyzer
+from dag_factory import make_random_dag
+from interval import Interval
+from nx_helper import Dag, construct_dag
+from path import Path
+from project_configuration import DebugConfiguration
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def path_value(dag: Dag, nodes, edge_weights) -> float:
+    return sum(edge_weights[dag.edges_indices[edge]] for edge in Dag.get_edges(nodes))
+
+
+def random_weights(dag: Dag, seed: int):
+    rng = np.random.default_rng(seed)
+    return rng.uniform(-10, 10, size=dag.num_edges).tolist()
+
+
+def solve_with_ilp(analyzer, sense, edge_weights):
+    """
+    Returns:
+        Nodes along the extreme path that the integer linear program finds,
+        and its value.
+    """
+    ((edges, problem),) = pulp_helper._solve_extreme_path_problems(
+        analyzer, [sense], edge_weights, Interval()
+    )
+    assert problem.holds_program
+    successors = dict(edges)
+    nodes = [analyzer.dag.source]
+    while nodes[-1] in successors:
+        nodes.append(successors[nodes[-1]])
+    return nodes, problem.obj_val
+
+
+def dags():
+    for seed in range(6):
+        yield make_random_dag(15, 14, seed), seed
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run1.dot"))
+    yield dag, 100
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize("sense", [pulp.LpMaximize, pulp.LpMinimize])
+def test_dynamic_program_matches_ilp(tmp_path, dag, seed, sense):
+    edge_weights = random_weights(dag, seed)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    edges, problem = pulp_helper._find_extreme_path_in_dag(dag, sense, edge_weights)
+    assert not problem.holds_program
+    ilp_nodes, ilp_value = solve_with_ilp(analyzer, sense, edge_weights)
+    assert problem.obj_val == pytest.approx(ilp_value, abs=1e-6)
+    assert sorted(edges) == sorted(Dag.get_edges(ilp_nodes))
+
+    values = [
+        path_value(dag, nodes, edge_weights)
+        for nodes in nx.all_simple_paths(dag, dag.source, dag.sink)
+    ]
+    expected = max(values) if sense == pulp.LpMaximize else min(values)
+    assert problem.obj_val == pytest.approx(expected, abs=1e-6)
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize(
+    "extremum", [pulp_helper.Extremum.LONGEST, pulp_helper.Extremum.SHORTEST]
+)
+def test_find_extreme_path_matches_ilp(tmp_path, dag, seed, extremum):
+    edge_weights = random_weights(dag, seed)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    nodes, problem = pulp_helper.find_extreme_path(
+        analyzer, extremum, edge_weights=edge_weights
+    )
+
+    # ``find_extreme_path`` picks the path with the largest or the smallest
+    # absolute value among the longest and the shortest paths.
+    candidates = [
+        solve_with_ilp(analyzer, sense, edge_weights)
+        for sense in (pulp.LpMaximize, pulp.LpMinimize)
+    ]
+    choose = max if extremum is pulp_helper.Extremum.LONGEST else min
+    expected_nodes, expected_value = choose(
+        candidates, key=lambda candidate: abs(candidate[1])
+    )
+    assert nodes == expected_nodes
+    assert problem.obj_val == pytest.approx(abs(expected_value), abs=1e-6)
+
+
+def test_programs_not_built_are_not_written(tmp_path):
+    dag = make_random_dag(10, 6, 0)
+    analyzer = make_analyzer(
+        dag,
+        str(tmp_path),
+        debug_config=DebugConfiguration(keep_ilp_solver_output=True),
+    )
+    edge_weights = random_weights(dag, 0)
+    nodes, problem = pulp_helper.find_extreme_path(analyzer, edge_weights=edge_weights)
+    assert not problem.holds_program
+    assert not list(tmp_path.glob("*.lp"))
+
+    path = Path(ilp_problem=problem, nodes=nodes)
+    path.write_ilp_problem_to_lp_file(str(tmp_path / "path"))
+    Path(nodes=nodes).write_ilp_problem_to_lp_file(str(tmp_path / "enumerated"))
+    assert not list(tmp_path.glob("*.lp"))
+
+    ((edges, ilp_problem),) = pulp_helper._solve_extreme_path_problems(
+        analyzer, [pulp.LpMaximize], edge_weights, Interval()
+    )
+    Path(ilp_problem=ilp_problem, nodes=nodes).write_ilp_problem_to_lp_file(
+        str(tmp_path / "solved")
+    )
+    assert (tmp_path / "solved.lp").exists()
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_highs_solves_both_extrema_at_the_same_time(tmp_path, monkeypatch, seed):
+    pytest.importorskip("highspy")
+    dag = make_random_dag(15, 14, seed)
+    edge_weights = random_weights(dag, seed)
+    analyzer = make_analyzer(dag, str(tmp_path), ilp_solver="highs")
+    # A constraint that excludes one path, as that of an infeasible path does.
+    analyzer.add_path_exclusive_constraint(
+        Dag.get_edges(next(nx.all_simple_paths(dag, dag.source, dag.sink)))
+    )
+
+    executors = []
+
+    class Executor(pulp_helper.ThreadPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            executors.append(self)
+
+    monkeypatch.setattr(pulp_helper, "ThreadPoolExecutor", Executor)
+    senses = [pulp.LpMaximize, pulp.LpMinimize]
+    solutions = pulp_helper._solve_extreme_path_problems(
+        analyzer, senses, edge_weights, Interval()
+    )
+    assert len(executors) == 1
+
+    # Each direction is solved by its own solver object, and finds
+    # the path that it finds when it is solved alone.
+    solvers = pulp_helper._ilp_solver_registry._solvers[analyzer.project_config]
+    assert solvers[("highs", True, pulp.LpMaximize)] is not (
+        solvers[("highs", True, pulp.LpMinimize)]
+    )
+    for sense, (edges, problem) in zip(senses, solutions):
+        assert problem.sense == sense
+        ((alone_edges, alone_problem),) = pulp_helper._solve_extreme_path_problems(
+            analyzer, [sense], edge_weights, Interval()
+        )
+        assert problem.obj_val == pytest.approx(alone_problem.obj_val, abs=1e-6)
+        assert sorted(edges) == sorted(alone_edges)
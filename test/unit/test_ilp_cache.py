@@ -0,0 +1,168 @@
+"""
+Tests of the cache of the solutions of integer linear programs, whose
+keys must not depend on the names of the nodes, which change every time
+that the code is preprocessed, so that a later run finds the solutions of
+an earlier one.
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+import ilp_cache
+import pulp_helper
+from analyzer_factory import make_analyzer
+from basis_checkpoint import NodeIdentities
+from ilp_cache import ILP_CACHE_FILE, IlpCache
+from interval import Interval
+from nx_helper import Dag, construct_dag
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    """Keeps the caches of each test apart from those of the others."""
+    monkeypatch.setattr(ilp_cache, "_ilp_caches", {})
+
+
+def load_run(run: int) -> Dag:
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run%d.dot" % run))
+    return dag
+
+
+def stable_weights(dag: Dag, identities: NodeIdentities, seed: int):
+    """
+    Returns:
+        Weights on the edges of the DAG that depend only on the identities
+        of their nodes, so that the DAGs of two runs get the same weights.
+    """
+    edge_ids = sorted(map(tuple, identities.edges_to_list(dag.all_edges)))
+    rng = np.random.default_rng(seed)
+    weights = dict(zip(edge_ids, rng.uniform(-10, 10, size=len(edge_ids))))
+    return [weights[tuple(ids)] for ids in identities.edges_to_list(dag.all_edges)]
+
+
+def make_run_analyzer(run: int, tmp_path, **config):
+    dag = load_run(run)
+    return make_analyzer(
+        dag,
+        str(tmp_path / ("temp%d" % run)),
+        location_ilp_cache_dir=str(tmp_path / "cache"),
+        ILP_CACHE_SIZE=100,
+        **config
+    )
+
+
+def exclude_first_path(analyzer, path_ids):
+    identities = analyzer.get_node_identities()
+    nodes = [identities.nodes[node_id] for node_id in path_ids]
+    analyzer.add_path_exclusive_constraint(Dag.get_edges(nodes))
+
+
+def test_keys_do_not_depend_on_names():
+    first, second = load_run(1), load_run(2)
+    assert set(first.nodes) != set(second.nodes)
+    first_ids, second_ids = NodeIdentities(first), NodeIdentities(second)
+    edges = list(first.all_edges)
+    constraint = edges[:3]
+    translated = second_ids.edges_from_list(first_ids.edges_to_list(constraint))
+
+    def key(dag, identities, edges):
+        return IlpCache.make_key(
+            identities,
+            dag,
+            stable_weights(dag, identities, 0),
+            [edges],
+            [],
+            Interval(),
+            pulp_helper.Extremum.LONGEST,
+            "cbc",
+        )
+
+    assert key(first, first_ids, constraint) == key(second, second_ids, translated)
+    assert key(first, first_ids, constraint) != key(first, first_ids, edges[1:4])
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize(
+    "extremum", [pulp_helper.Extremum.LONGEST, pulp_helper.Extremum.SHORTEST]
+)
+def test_later_run_finds_the_solutions(tmp_path, seed, extremum):
+    first = make_run_analyzer(1, tmp_path)
+    first_ids = first.get_node_identities()
+    first_weights = stable_weights(first.dag, first_ids, seed)
+    nodes, _ = pulp_helper.find_extreme_path(
+        first, extremum, edge_weights=first_weights
+    )
+    path_ids = [first_ids.ids[node] for node in nodes]
+    exclude_first_path(first, path_ids)
+    nodes, problem = pulp_helper.find_extreme_path(
+        first, extremum, edge_weights=first_weights
+    )
+    assert problem.holds_program
+    solved_ids = [first_ids.ids[node] for node in nodes]
+
+    # Nothing is written to disk until the cache is saved.
+    cache_file = tmp_path / "cache" / ILP_CACHE_FILE
+    assert not cache_file.exists()
+    ilp_cache.save_ilp_caches()
+    assert cache_file.exists()
+
+    # A later run, with a cache that is read from the disk, finds
+    # the solution for the DAG of its own preprocessing.
+    ilp_cache._ilp_caches.clear()
+    second = make_run_analyzer(2, tmp_path)
+    second_ids = second.get_node_identities()
+    exclude_first_path(second, path_ids)
+    nodes, cached_problem = pulp_helper.find_extreme_path(
+        second, extremum, edge_weights=stable_weights(second.dag, second_ids, seed)
+    )
+    assert not cached_problem.holds_program
+    assert [second_ids.ids[node] for node in nodes] == solved_ids
+    assert set(nodes) <= set(second.dag.nodes)
+    assert cached_problem.obj_val == pytest.approx(problem.obj_val)
+    assert cached_problem.sense == problem.sense
+    assert ilp_cache.get_ilp_cache_statistics()[:2] == (1, 0)
+
+
+def test_least_recently_used_solutions_are_evicted(tmp_path):
+    location = str(tmp_path / "cache")
+    cache = IlpCache(location, 3)
+    for index in range(3):
+        cache.put("key%d" % index, ["node%d" % index], float(index), 1)
+    # Using the oldest solution makes the second one the least recently used.
+    assert cache.get("key0") == (["node0"], 0.0, 1)
+    cache.put("key3", [], None, None)
+    assert cache.num_evictions == 1
+    assert cache.get("key1") is None
+    assert cache.get("key3") == ([], None, None)
+    assert (cache.num_hits, cache.num_misses) == (2, 1)
+
+    cache.save()
+    reloaded = IlpCache(location, 3)
+    assert reloaded.get("key0") == (["node0"], 0.0, 1)
+    assert reloaded.get("key2") == (["node2"], 2.0, 1)
+    assert reloaded.get("key1") is None
+
+
+def test_save_merges_solutions_of_other_runs(tmp_path):
+    location = str(tmp_path / "cache")
+    first, second = IlpCache(location, 3), IlpCache(location, 3)
+    assert first.get("missing") is None and second.get("missing") is None
+    first.put("first", ["a"], 1.0, 1)
+    second.put("second", ["b"], 2.0, -1)
+    first.save()
+    second.save()
+    for index in range(3):
+        second.put("new%d" % index, [], None, None)
+    second.save()
+
+    # Only the most recently used solutions are kept in the file.
+    reloaded = IlpCache(location, 5)
+    assert reloaded.get("second") is None and reloaded.get("first") is None
+    assert all(reloaded.get("new%d" % index) for index in range(3))
+    first.put("first", ["a"], 1.0, 1)
+    first.save()
+    assert IlpCache(location, 5).get("first") == (["a"], 1.0, 1)
@@ -0,0 +1,184 @@
+"""
+Tests of the integer linear program of ``find_extreme_path`` in matrix
+form, which must find the same extreme paths as the program that PuLP
+builds term by term, under path-exclusive and path-bundled constraints
+and bounds on the value of the path.
+"""
+
+import os
+
+import networkx as nx
+import numpy as np
+import pulp
+import pytest
+
+import pulp_helper
+from analyzer_factory import make_analyzer
+from dag_factory import make_random_dag
+from interval import Interval
+from nx_helper import Dag, construct_dag
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def dags():
+    for seed in range(5):
+        yield make_random_dag(14, 12, seed), seed
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run1.dot"))
+    yield dag, 100
+
+
+def make_analyzers(dag: Dag, tmp_path):
+    """
+    Returns:
+        Analyzers of the DAG provided that solve the program in matrix
+        form and with PuLP, respectively.
+    """
+    return (
+        make_analyzer(dag, str(tmp_path / "matrix"), ilp_solver="highs-scipy"),
+        make_analyzer(dag, str(tmp_path / "pulp"), ilp_solver="cbc"),
+    )
+
+
+def brute_force(analyzer, sense, edge_weights, interval: Interval):
+    """
+    Returns:
+        Value of the extreme path through the DAG of the analyzer provided
+        that meets its constraints and whose value is in the interval,
+        found by listing all of the paths, or None if there is no such path.
+    """
+    dag = analyzer.dag
+    values = []
+    for nodes in nx.all_simple_paths(dag, dag.source, dag.sink):
+        edges = set(Dag.get_edges(nodes))
+        if any(
+            set(excluded) <= edges for excluded in analyzer.path_exclusive_constraints
+        ):
+            continue
+        # The flow through the other edges of a path-bundled constraint
+        # follows the flow through its first edge, so either all of
+        # the edges are taken, or none is.
+        if any(
+            0 < len(edges & set(bundled)) < len(bundled)
+            for bundled in analyzer.path_bundled_constraints
+        ):
+            continue
+        value = sum(edge_weights[dag.edges_indices[edge]] for edge in edges)
+        if interval.has_finite_lower_bound() and value < interval.lower_bound - 1e-9:
+            continue
+        if interval.has_finite_upper_bound() and value > interval.upper_bound + 1e-9:
+            continue
+        values.append(value)
+    if not values:
+        return None
+    return max(values) if sense == pulp.LpMaximize else min(values)
+
+
+def solve(analyzer, sense, edge_weights, interval):
+    ((edges, problem),) = pulp_helper._solve_extreme_path_problems(
+        analyzer, [sense], edge_weights, interval
+    )
+    return edges, problem
+
+
+def assert_same_solution(analyzers, sense, edge_weights, interval):
+    """
+    Checks that both analyzers find the extreme path that listing all of
+    the paths finds, and returns its edges, or None if there is none.
+    """
+    matrix_analyzer, pulp_analyzer = analyzers
+    expected = brute_force(pulp_analyzer, sense, edge_weights, interval)
+    matrix_edges, matrix_problem = solve(matrix_analyzer, sense, edge_weights, interval)
+    pulp_edges, pulp_problem = solve(pulp_analyzer, sense, edge_weights, interval)
+    assert not matrix_problem.holds_program
+    if expected is None:
+        assert matrix_edges is None and pulp_edges is None
+        return None
+    assert matrix_problem.obj_val == pytest.approx(expected, abs=1e-6)
+    assert pulp_problem.obj_val == pytest.approx(expected, abs=1e-6)
+    # The weights are drawn at random, so no two paths have the same value.
+    assert sorted(matrix_edges) == sorted(pulp_edges)
+    return matrix_edges
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize("sense", [pulp.LpMaximize, pulp.LpMinimize])
+def test_exclusive_constraints(tmp_path, dag, seed, sense):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.uniform(-10, 10, size=dag.num_edges).tolist()
+    analyzers = make_analyzers(dag, tmp_path)
+    # The constraints are added one at a time, as ``find_extreme_paths``
+    # adds them, so that the rows kept from earlier solves are reused.
+    for _ in range(6):
+        edges = assert_same_solution(analyzers, sense, edge_weights, Interval())
+        if edges is None:
+            break
+        for analyzer in analyzers:
+            analyzer.add_path_exclusive_constraint(edges)
+
+    # A constraint on part of a path removes every path through that part.
+    edges = Dag.get_edges(next(nx.all_simple_paths(dag, dag.source, dag.sink)))
+    for analyzer in analyzers:
+        analyzer.add_path_exclusive_constraint(edges[:2])
+    assert_same_solution(analyzers, sense, edge_weights, Interval())
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize("sense", [pulp.LpMaximize, pulp.LpMinimize])
+def test_bundled_constraints(tmp_path, dag, seed, sense):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.uniform(-10, 10, size=dag.num_edges).tolist()
+    analyzers = make_analyzers(dag, tmp_path)
+    all_nodes = list(nx.all_simple_paths(dag, dag.source, dag.sink))
+    for index in rng.choice(len(all_nodes), size=2, replace=False):
+        edges = Dag.get_edges(all_nodes[index])
+        bundled = [edges[i] for i in sorted(rng.choice(len(edges), 2, replace=False))]
+        for analyzer in analyzers:
+            analyzer.add_path_bundled_constraint(bundled)
+        assert_same_solution(analyzers, sense, edge_weights, Interval())
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize("sense", [pulp.LpMaximize, pulp.LpMinimize])
+def test_interval(tmp_path, dag, seed, sense):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.uniform(-10, 10, size=dag.num_edges).tolist()
+    analyzers = make_analyzers(dag, tmp_path)
+    values = sorted(
+        sum(edge_weights[dag.edges_indices[edge]] for edge in Dag.get_edges(nodes))
+        for nodes in nx.all_simple_paths(dag, dag.source, dag.sink)
+    )
+    # Bounds between the values of paths, on one side and on both, and
+    # bounds that no path meets.
+    lower, upper = np.quantile(values, [0.25, 0.75])
+    intervals = [
+        Interval(lower, upper),
+        Interval(lower=lower),
+        Interval(upper=upper),
+        Interval(values[-1] + 1, values[-1] + 2),
+    ]
+    for interval in intervals:
+        assert_same_solution(analyzers, sense, edge_weights, interval)
+
+    # Bounds combine with the constraints.
+    edges = assert_same_solution(analyzers, sense, edge_weights, intervals[0])
+    for analyzer in analyzers:
+        analyzer.add_path_exclusive_constraint(edges)
+    assert_same_solution(analyzers, sense, edge_weights, intervals[0])
+
+
+def test_matrix_is_rebuilt_when_edges_change(tmp_path):
+    dag = make_random_dag(12, 6, 0)
+    matrix = pulp_helper._get_extreme_path_matrix(dag)
+    assert pulp_helper._get_extreme_path_matrix(dag) is matrix
+
+    tail, head = dag.all_nodes[0], dag.all_nodes[-2]
+    assert not dag.has_edge(tail, head)
+    dag.add_edge(tail, head)
+    dag.load_variables()
+    assert pulp_helper._get_extreme_path_matrix(dag) is not matrix
+    edge_weights = np.random.default_rng(0).uniform(-10, 10, size=dag.num_edges)
+    for sense in (pulp.LpMaximize, pulp.LpMinimize):
+        assert_same_solution(
+            make_analyzers(dag, tmp_path), sense, edge_weights.tolist(), Interval()
+        )
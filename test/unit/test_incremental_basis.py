@@ -0,0 +1,285 @@
+"""
+Tests of the reuse of the basis paths of a previous incremental analysis,
+which must keep exactly the saved paths that only go through basic blocks
+that did not change, even though an edit renumbers the values of the later
+blocks, and must complete them into a nonsingular basis matrix.
+"""
+
+import os
+import re
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import incremental_basis
+from analyzer_factory import make_analyzer
+from nx_helper import Dag, construct_dag
+from path import Path
+
+# Basic blocks of a function of three arguments, `%0' to `%2', with three
+# if-then-else statements in a row, as the names of their blocks, their
+# instructions and their successors.
+BLOCKS = [
+    (
+        "%3",
+        ["%4 = icmp sgt i32 %0, 0", "br i1 %4, label %5, label %7"],
+        ["%5", "%7"],
+    ),
+    ("%5", ["%6 = add nsw i32 %0, 1", "br label %9"], ["%9"]),
+    ("%7", ["%8 = sub nsw i32 %0, 1", "br label %9"], ["%9"]),
+    (
+        "%9",
+        [
+            "%10 = phi i32 [ %6, %5 ], [ %8, %7 ]",
+            "%11 = icmp sgt i32 %1, 0",
+            "br i1 %11, label %12, label %14",
+        ],
+        ["%12", "%14"],
+    ),
+    ("%12", ["%13 = shl nsw i32 %10, 1", "br label %16"], ["%16"]),
+    ("%14", ["%15 = mul nsw i32 %10, 3", "br label %16"], ["%16"]),
+    (
+        "%16",
+        [
+            "%17 = phi i32 [ %13, %12 ], [ %15, %14 ]",
+            "%18 = icmp slt i32 %2, 5",
+            "br i1 %18, label %19, label %21",
+        ],
+        ["%19", "%21"],
+    ),
+    ("%19", ["%20 = add nsw i32 %17, %2", "br label %23"], ["%23"]),
+    ("%21", ["%22 = sub nsw i32 %17, %2", "br label %23"], ["%23"]),
+    ("%23", ["%24 = phi i32 [ %20, %19 ], [ %22, %21 ]", "ret i32 %24"], []),
+]
+
+# Block that the edit inserts an instruction into.
+EDITED_BLOCK = 1
+
+
+def edit(blocks):
+    """
+    Returns:
+        Blocks provided, with a call inserted after the first instruction
+        of the edited block, whose result is the value `%7', so that
+        every later numbered value is numbered one more.
+    """
+
+    def renumber(text: str) -> str:
+        return re.sub(
+            r"%(\d+)\b",
+            lambda match: "%%%d" % (int(match.group(1)) + (int(match.group(1)) >= 7)),
+            text,
+        )
+
+    edited = []
+    for index, (name, instructions, successors) in enumerate(blocks):
+        instructions = [renumber(instruction) for instruction in instructions]
+        if index == EDITED_BLOCK:
+            instructions.insert(1, "%7 = call i32 @g()")
+        edited.append(
+            (renumber(name), instructions, [renumber(name) for name in successors])
+        )
+    return edited
+
+
+def write_dot(location: str, blocks, address: int) -> Dag:
+    """
+    Writes the blocks provided to a file in the dialect of DOT that
+    ``opt -passes=dot-cfg`` writes, with the nodes named after
+    the address provided, as they are named after the addresses of
+    the blocks in memory, and reads the DAG back from the file.
+
+    Returns:
+        DAG of the blocks, whose nodes are in the order of the blocks.
+    """
+    nodes = {
+        name: "Node0x%x" % (address + 0x70 * i) for i, (name, _, _) in enumerate(blocks)
+    }
+    lines = [
+        "digraph \"CFG for 'f' function\" {",
+        "\tlabel=\"CFG for 'f' function\";",
+        "",
+    ]
+    for name, instructions, successors in blocks:
+        label = "{%s:\\l%s}" % (
+            name,
+            "".join("  %s\\l" % instruction for instruction in instructions),
+        )
+        lines.append('\t%s [shape=record,label="%s"];' % (nodes[name], label))
+        for successor in successors:
+            lines.append("\t%s -> %s;" % (nodes[name], nodes[successor]))
+    lines.append("}")
+    with open(location, "w") as dot_file:
+        dot_file.write("\n".join(lines) + "\n")
+    dag, _ = construct_dag(location)
+    return dag
+
+
+def all_paths(dag: Dag):
+    return list(nx.all_simple_paths(dag, dag.source, dag.sink))
+
+
+def save_paths(location: str, temp_dir: str, dag: Dag, paths):
+    """
+    Saves the paths provided as the basis paths of an analysis of the DAG,
+    each with a file of inputs in its output folder.
+
+    Returns:
+        Basis paths saved.
+    """
+    basis_paths = []
+    for index, nodes in enumerate(paths):
+        path = Path(nodes=nodes, measured_value=100 + index)
+        path.name = "gen-basis-path-row%d-attempt%d" % (index, index)
+        output_folder = os.path.join(temp_dir, path.name)
+        os.makedirs(output_folder)
+        with open(os.path.join(output_folder, "klee_input_0.txt"), "w") as inputs:
+            inputs.write("%d\n" % index)
+        basis_paths.append(path)
+    incremental_basis.save_basis_paths(location, dag, basis_paths, temp_dir)
+    return basis_paths
+
+
+@pytest.fixture
+def dags(tmp_path):
+    """
+    Returns:
+        DAGs of the function before and after the edit, whose nodes have
+        different names, and the dictionary that maps each node of the first
+        to the node of the same block in the second.
+    """
+    previous = write_dot(str(tmp_path / "previous.dot"), BLOCKS, 0x1A2B000)
+    current = write_dot(str(tmp_path / "current.dot"), edit(BLOCKS), 0x5C6D000)
+    return previous, current, dict(zip(previous.nodes, current.nodes))
+
+
+def test_labels_of_the_edit(dags):
+    previous, current, nodes = dags
+    assert set(previous.nodes).isdisjoint(current.nodes)
+    changed = []
+    for node, block_hash in incremental_basis.block_hashes(previous).items():
+        previous_label = previous.nodes[node]["label"]
+        current_label = current.nodes[nodes[node]]["label"]
+        if block_hash != incremental_basis.block_hashes(current)[nodes[node]]:
+            changed.append(node)
+        elif list(nodes).index(node) > EDITED_BLOCK:
+            # The later blocks are renumbered, but hash the same.
+            assert previous_label != current_label
+    assert changed == [list(nodes)[EDITED_BLOCK]]
+
+
+# Paths of the previous analysis to save, by their index: a basis of
+# the paths, and all of the paths, with one of them saved twice. The paths
+# that are kept, which take the branch of the first statement that was
+# not edited, are linearly dependent in the second case, even without
+# the repeated path, since they only span three dimensions.
+SAVED_PATHS = {
+    "basis": [0, 4, 5, 6],
+    "dependent": list(range(8)) + [5],
+}
+
+
+@pytest.mark.parametrize("saved", sorted(SAVED_PATHS))
+def test_paths_through_unchanged_blocks_are_kept(tmp_path, dags, saved):
+    previous, current, nodes = dags
+    location = str(tmp_path / "incremental")
+    previous_paths = [all_paths(previous)[index] for index in SAVED_PATHS[saved]]
+    save_paths(location, str(tmp_path / "previous"), previous, previous_paths)
+
+    kept = incremental_basis.match_basis_paths(
+        incremental_basis.read_basis_paths(location), current
+    )
+    edited_node = list(nodes)[EDITED_BLOCK]
+    expected = [
+        [nodes[node] for node in path]
+        for path in previous_paths
+        if edited_node not in path
+    ]
+    assert expected
+    assert [path_nodes for _, path_nodes in kept] == expected
+    assert all(
+        saved_path["blocks"]
+        == [incremental_basis.block_hashes(current)[node] for node in path_nodes]
+        for saved_path, path_nodes in kept
+    )
+
+
+@pytest.mark.parametrize("saved", sorted(SAVED_PATHS))
+def test_reused_paths_complete_a_nonsingular_basis(tmp_path, dags, saved):
+    previous, current, nodes = dags
+    location = str(tmp_path / "incremental")
+    previous_paths = [all_paths(previous)[index] for index in SAVED_PATHS[saved]]
+    saved_paths = save_paths(
+        location, str(tmp_path / "previous"), previous, previous_paths
+    )
+
+    temp_dir = tmp_path / "current"
+    temp_dir.mkdir()
+    (temp_dir / "labels_0.txt").write_text(
+        "".join("%d\n" % index for index in range(current.num_nodes))
+    )
+    analyzer = make_analyzer(
+        current,
+        str(temp_dir),
+        INCREMENTAL_ANALYSIS=True,
+        location_incremental_dir=location,
+    )
+    analyzer.preprocessed_path = ""
+    basis_paths = []
+    num_reused = analyzer._reuse_basis_paths(basis_paths)
+
+    kept = [
+        (saved_path, [nodes[node] for node in path])
+        for saved_path, path in zip(saved_paths, previous_paths)
+        if list(nodes)[EDITED_BLOCK] not in path
+    ]
+    rows = analyzer.path_encoder.dense_rows([path for _, path in kept])
+    rank = np.linalg.matrix_rank(rows)
+    assert (rank < len(kept)) == (saved == "dependent")
+    assert num_reused == rank == len(basis_paths)
+
+    # The reused paths are linearly independent kept paths, with their
+    # measured values and their inputs, and they are the top rows of
+    # a basis matrix that is nonsingular.
+    kept_values = [(path, saved_path.measured_value) for saved_path, path in kept]
+    for row, path in enumerate(basis_paths):
+        assert (path.nodes, path.measured_value) in kept_values
+        assert path.path_analyzer.is_valid
+        inputs = os.path.join(path.path_analyzer.output_folder, "klee_input_0.txt")
+        with open(inputs, "r") as input_file:
+            assert int(input_file.read()) == path.measured_value - 100
+        assert np.array_equal(
+            analyzer.basis_matrix.row(row), analyzer.path_encoder.dense(path.nodes)
+        )
+    matrix = np.asarray(analyzer.basis_matrix.matrix)
+    assert matrix.shape == (analyzer.path_dimension, analyzer.path_dimension)
+    assert np.linalg.matrix_rank(matrix) == analyzer.path_dimension
+    assert not analyzer.basis_matrix.is_singular
+
+
+@pytest.mark.parametrize("seed", range(6))
+def test_select_basis_rows(seed):
+    rng = np.random.default_rng(seed)
+    dimension = 8
+    independent = rng.integers(0, 2, size=(4, dimension)).astype(float)
+    # Rows that are combinations of the others, and a repeated row.
+    rows = np.vstack(
+        [
+            independent,
+            independent[0] + independent[1] - independent[2],
+            independent[3],
+            np.zeros(dimension),
+        ]
+    )[rng.permutation(7)]
+    selected, free_columns = incremental_basis.select_basis_rows(rows)
+    rank = np.linalg.matrix_rank(rows)
+    assert len(selected) == rank == np.linalg.matrix_rank(rows[selected])
+    assert selected == sorted(selected)
+    assert len(free_columns) == dimension - rank
+    completed = np.vstack([rows[selected], np.eye(dimension)[free_columns]])
+    assert np.linalg.matrix_rank(completed) == dimension
+
+
+def test_select_basis_rows_without_rows():
+    assert incremental_basis.select_basis_rows(np.zeros((0, 3))) == ([], [0, 1, 2])
@@ -0,0 +1,132 @@
+"""
+Tests of the linear program that finds the least delta compatible with
+the measured paths, which must find the same delta after each update,
+whether it is kept in a HiGHS model or in a PuLP problem, as a program
+built from scratch for all of the paths does.
+"""
+
+import networkx as nx
+import numpy as np
+import pytest
+from scipy.optimize import linprog
+
+import pulp_helper
+from analyzer_factory import make_analyzer
+from dag_factory import make_random_dag
+from nx_helper import Dag
+from path import Path
+
+
+def measured_paths(dag: Dag, seed: int, num_paths: int):
+    """
+    Returns:
+        Paths through the DAG provided, with measured values that are
+        the sums of random edge weights plus noise, so that no set of
+        nonnegative edge weights fits them exactly.
+    """
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.uniform(0, 10, size=dag.num_edges)
+    all_nodes = list(nx.all_simple_paths(dag, dag.source, dag.sink))
+    paths = []
+    for index in rng.choice(len(all_nodes), size=num_paths):
+        nodes = all_nodes[index]
+        value = sum(
+            edge_weights[dag.edges_indices[edge]] for edge in Dag.get_edges(nodes)
+        )
+        paths.append(Path(nodes=nodes, measured_value=value + rng.uniform(-5, 5)))
+    return paths
+
+
+def least_delta(dag: Dag, paths) -> float:
+    """
+    Returns:
+        Least delta compatible with the paths provided, found by solving
+        the linear program for all of them at once.
+    """
+    num_edges = dag.num_edges
+    rows, bounds = [], []
+    for path in paths:
+        row = np.zeros(num_edges + 1)
+        for edge in Dag.get_edges(path.nodes):
+            row[dag.edges_indices[edge]] = 1.0
+        row[num_edges] = -1.0
+        rows.append(row)
+        bounds.append(path.measured_value)
+        row = -row
+        row[num_edges] = -1.0
+        rows.append(row)
+        bounds.append(-path.measured_value)
+    objective = np.zeros(num_edges + 1)
+    objective[num_edges] = 1.0
+    result = linprog(objective, A_ub=np.array(rows), b_ub=bounds, method="highs")
+    assert result.status == 0
+    return result.fun
+
+
+def updated_deltas(analyzer, paths):
+    """
+    Returns:
+        Least delta that ``find_least_compatible_mu_max`` returns after
+        each path provided is measured, along with the estimator used.
+    """
+    deltas = [
+        pulp_helper.find_least_compatible_mu_max(analyzer, paths[: count + 1])
+        for count in range(len(paths))
+    ]
+    return deltas, pulp_helper.get_mu_max_estimator(analyzer, paths)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_highs_model_is_updated_in_place(tmp_path, seed):
+    pytest.importorskip("highspy")
+    dag = make_random_dag(14, 10, seed)
+    paths = measured_paths(dag, seed, 15)
+    analyzer = make_analyzer(dag, str(tmp_path))
+
+    deltas, estimator = updated_deltas(analyzer, paths)
+    # The rows of each path are added to the model of the first call,
+    # which is solved again from the basis of the last solve.
+    assert estimator._highs is not None and estimator._problem is None
+    assert estimator.paths == paths
+    assert estimator._highs.getNumCol() == dag.num_edges + 1
+    assert estimator._highs.getNumRow() == 2 * len(paths)
+    assert len(estimator.update_times) == len(paths)
+    for count, delta in enumerate(deltas):
+        assert delta == pytest.approx(least_delta(dag, paths[: count + 1]), abs=1e-6)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_highs_and_pulp_programs_agree(tmp_path, monkeypatch, seed):
+    pytest.importorskip("highspy")
+    dag = make_random_dag(14, 10, seed)
+    paths = measured_paths(dag, seed, 15)
+    highs_deltas, _ = updated_deltas(make_analyzer(dag, str(tmp_path)), paths)
+
+    monkeypatch.setattr(pulp_helper, "highspy", None)
+    pulp_deltas, estimator = updated_deltas(make_analyzer(dag, str(tmp_path)), paths)
+    assert estimator._highs is None and estimator._problem is not None
+    assert pulp_deltas == pytest.approx(highs_deltas, abs=1e-6)
+
+
+def test_pulp_program_without_highspy(tmp_path, monkeypatch):
+    monkeypatch.setattr(pulp_helper, "highspy", None)
+    dag = make_random_dag(12, 8, 0)
+    paths = measured_paths(dag, 0, 10)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    deltas, estimator = updated_deltas(analyzer, paths)
+    assert estimator._highs is None
+    for count, delta in enumerate(deltas):
+        assert delta == pytest.approx(least_delta(dag, paths[: count + 1]), abs=1e-6)
+
+
+def test_new_estimator_when_paths_are_dropped(tmp_path):
+    dag = make_random_dag(12, 8, 1)
+    paths = measured_paths(dag, 1, 6)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    pulp_helper.find_least_compatible_mu_max(analyzer, paths)
+    estimator = pulp_helper.get_mu_max_estimator(analyzer, paths)
+    assert pulp_helper.get_mu_max_estimator(analyzer, paths + paths[:1]) is estimator
+
+    delta = pulp_helper.find_least_compatible_mu_max(analyzer, paths[1:])
+    assert pulp_helper.get_mu_max_estimator(analyzer, paths[1:]) is not estimator
+    assert delta == pytest.approx(least_delta(dag, paths[1:]), abs=1e-6)
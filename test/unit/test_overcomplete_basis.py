@@ -0,0 +1,280 @@
+"""
+Tests of the overcomplete basis that ``find_minimal_overcomplete_basis``
+finds by column generation, which must express every path through
+the DAG within the bound, with no basis path to spare, as listing all
+of the paths shows, and of the programs that it is built on, whose model
+must solve the same problem as a model built from scratch as the basis
+changes.
+"""
+
+import networkx as nx
+import numpy as np
+import pulp
+import pytest
+from scipy.optimize import linprog
+
+import pulp_helper
+from analyzer_factory import make_analyzer
+from compact_dag import get_compact_dag
+from dag_factory import make_random_dag
+from nx_helper import Dag
+from path import Path
+
+
+def make_dag(edges) -> Dag:
+    graph = nx.DiGraph(edges)
+    for node in graph.nodes:
+        graph.nodes[node]["label"] = node
+    dag = Dag(graph)
+    dag.load_variables()
+    return dag
+
+
+def all_paths(dag: Dag):
+    return [
+        Path(nodes=nodes) for nodes in nx.all_simple_paths(dag, dag.source, dag.sink)
+    ]
+
+
+def chain_vector(dag: Dag, path: Path) -> np.ndarray:
+    compact_dag = get_compact_dag(dag)
+    vector = np.zeros(compact_dag.num_chains)
+    vector[compact_dag.chains_of(Dag.get_edges(path.nodes))] = 1.0
+    return vector
+
+
+def expressible_length(dag: Dag, basis, path: Path) -> float:
+    """
+    Returns:
+        Longest length of the path provided when every basis path has
+        a length between -1 and 1, and the weight of each chain is at most
+        the bound that ``find_worst_expressible_path`` uses in absolute
+        value, found by a linear program for this path alone.
+    """
+    bound = 2.0 * dag.num_edges
+    rows = np.array([chain_vector(dag, basis_path) for basis_path in basis])
+    result = linprog(
+        -chain_vector(dag, path),
+        A_ub=np.vstack([rows, -rows]),
+        b_ub=np.ones(2 * len(basis)),
+        bounds=(-bound, bound),
+        method="highs",
+    )
+    assert result.status == 0
+    return -result.fun
+
+
+def worst_expressible_length(dag: Dag, basis) -> float:
+    return max(expressible_length(dag, basis, path) for path in all_paths(dag))
+
+
+def least_coefficient_sum(dag: Dag, basis, path: Path) -> float:
+    """
+    Returns:
+        Least sum of the absolute values of the coefficients of the basis
+        paths in a linear combination that is the path provided, found by
+        a linear program over the coefficients and their absolute values.
+    """
+    num_basis = len(basis)
+    rows = np.array([chain_vector(dag, basis_path) for basis_path in basis]).T
+    result = linprog(
+        np.concatenate([np.zeros(num_basis), np.ones(num_basis)]),
+        A_ub=np.block(
+            [
+                [np.eye(num_basis), -np.eye(num_basis)],
+                [-np.eye(num_basis), -np.eye(num_basis)],
+            ]
+        ),
+        b_ub=np.zeros(2 * num_basis),
+        A_eq=np.hstack([rows, np.zeros_like(rows)]),
+        b_eq=chain_vector(dag, path),
+        bounds=[(-100, 100)] * num_basis + [(0, 100)] * num_basis,
+        method="highs",
+    )
+    assert result.status == 0
+    return result.fun
+
+
+def two_diamonds() -> Dag:
+    """
+    Returns:
+        DAG of two diamonds in a row, whose four paths each take one of
+        the chains ``s-a-u`` and ``s-b-u``, and one of the chains
+        ``u-c-t`` and ``u-d-t``.
+    """
+    return make_dag(
+        [
+            ("s", "a"),
+            ("s", "b"),
+            ("a", "u"),
+            ("b", "u"),
+            ("u", "c"),
+            ("u", "d"),
+            ("c", "t"),
+            ("d", "t"),
+        ]
+    )
+
+
+def test_negative_weights_off_the_worst_path(tmp_path):
+    dag = two_diamonds()
+    analyzer = make_analyzer(dag, str(tmp_path))
+    paths = {"".join(path.nodes[1:4:2]): path for path in all_paths(dag)}
+    basis = [paths["ac"], paths["ad"], paths["bc"]]
+    # The path through b and d is ad + bc - ac, so its length is at most
+    # 3 when the basis paths have lengths between -1 and 1. It is 3 only
+    # if the lengths of ad and bc are 1 and the length of ac is -1, so that
+    # the chain s-a-u or u-c-t, which the path does not take, has
+    # a negative weight.
+    length, nodes, problem = pulp_helper.find_worst_expressible_path(analyzer, basis, 0)
+    assert problem.obj_val is not None
+    assert nodes == paths["bd"].nodes
+    assert length == pytest.approx(3.0)
+    assert length == pytest.approx(expressible_length(dag, basis, paths["bd"]))
+
+    model = pulp_helper._get_core_problem_model(
+        dag, 2.0 * dag.num_edges, False, pulp_helper.Extremum.LONGEST
+    )
+    off_path = get_compact_dag(dag).chains_of(Dag.get_edges(paths["ac"].nodes))
+    assert min(model.edge_weights[chain].value() for chain in off_path) < 0
+
+    # The least sum of the coefficients of the path is the same length.
+    basis_edges = [Dag.get_edges(path.nodes) for path in basis]
+    fit = pulp_helper.find_goodness_of_fit(
+        analyzer, [Dag.get_edges(paths["bd"].nodes)], basis_edges
+    )
+    assert fit == pytest.approx(3.0)
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_goodness_of_fit(tmp_path, seed):
+    dag = make_random_dag(10, 5, seed)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    paths = all_paths(dag)
+    rng = np.random.default_rng(seed)
+    # A basis of the paths, which is found by adding the paths that
+    # are not spanned by the ones before them, along with other paths.
+    basis, rank = [], 0
+    for path in paths:
+        rows = [chain_vector(dag, basis_path) for basis_path in basis + [path]]
+        if np.linalg.matrix_rank(np.array(rows)) > rank or rng.random() < 0.3:
+            basis.append(path)
+            rank = np.linalg.matrix_rank(np.array(rows))
+
+    fit = pulp_helper.find_goodness_of_fit(
+        analyzer,
+        [Dag.get_edges(path.nodes) for path in paths],
+        [Dag.get_edges(path.nodes) for path in basis],
+    )
+    assert fit == pytest.approx(
+        max(least_coefficient_sum(dag, basis, path) for path in paths), abs=1e-6
+    )
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_worst_expressible_path(tmp_path, seed):
+    dag = make_random_dag(12, 7, seed)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    paths = all_paths(dag)
+    rng = np.random.default_rng(seed)
+    for size in (2, len(paths) // 3, len(paths) - 1):
+        basis = [paths[index] for index in rng.choice(len(paths), size, replace=False)]
+        length, nodes, problem = pulp_helper.find_worst_expressible_path(
+            analyzer, basis, 0
+        )
+        assert problem.obj_val is not None
+        expected = worst_expressible_length(dag, basis)
+        assert length == pytest.approx(expected, abs=1e-6)
+        assert expressible_length(dag, basis, Path(nodes=nodes)) == pytest.approx(
+            expected, abs=1e-6
+        )
+
+
+@pytest.mark.parametrize("seed", range(2))
+@pytest.mark.parametrize("k", [1.0, 2.5])
+def test_minimal_overcomplete_basis(tmp_path, seed, k):
+    dag = make_random_dag(12, 7, seed)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    paths = all_paths(dag)
+    # The basis starts from some of the paths, as it does from the basis
+    # paths that the standard algorithm generates.
+    rng = np.random.default_rng(seed)
+    initial = [paths[index] for index in rng.choice(len(paths), 3, replace=False)]
+
+    basis = pulp_helper.find_minimal_overcomplete_basis(analyzer, initial, k)
+    assert basis
+    assert len({tuple(path.nodes) for path in basis}) == len(basis)
+    assert all(path.nodes in [other.nodes for other in paths] for path in basis)
+    assert worst_expressible_length(dag, basis) <= k + 1e-6
+    # No basis path can be left out.
+    for index in range(len(basis)):
+        reduced_basis = basis[:index] + basis[index + 1 :]
+        assert worst_expressible_length(dag, reduced_basis) > k + 1e-6
+
+
+def solve_core_problem(analyzer, paths, bound: float):
+    """
+    Returns:
+        Length of the longest path through the DAG of the analyzer when
+        the measured paths provided have lengths between ``-bound`` and
+        ``bound``, and the problem solved to find it, which is the problem
+        that ``find_worst_expressible_path`` solves if the bound is 1.
+    """
+    if bound == 1:
+        length, _, problem = pulp_helper.find_worst_expressible_path(analyzer, paths, 0)
+    else:
+        length, _, problem = pulp_helper.generate_and_solve_core_problem(
+            analyzer, paths, (lambda path: bound), (lambda path: -bound), False
+        )
+    assert problem.obj_val is not None
+    return length, problem
+
+
+def test_core_problem_model_is_reused(tmp_path):
+    dag = make_random_dag(12, 7, 0)
+    analyzer = make_analyzer(dag, str(tmp_path))
+    paths = all_paths(dag)
+    # The basis grows, as it does during column generation, then shrinks,
+    # and then the bound on the lengths of its paths changes, which changes
+    # the bound on the weights.
+    steps = [
+        (paths[:2], 1),
+        (paths[:4], 1),
+        (paths[:6], 1),
+        (paths[2:5], 1),
+        (paths[2:5], 2),
+        (paths[:6], 2),
+    ]
+    previous_model, previous_bound = None, None
+    for basis, bound in steps:
+        length, problem = solve_core_problem(analyzer, basis, bound)
+        m = (bound + 1.0) * dag.num_edges
+        model = pulp_helper._get_core_problem_model(
+            dag, m, False, pulp_helper.Extremum.LONGEST
+        )
+        assert model.m == m
+        assert (model is previous_model) == (bound == previous_bound)
+        # Only the rows of the paths provided are kept.
+        assert list(model._path_constraints) == [id(path) for path in basis]
+        previous_model, previous_bound = model, bound
+
+        # The model built for this call alone solves the same problem.
+        models = pulp_helper._core_problem_models.pop(dag)
+        fresh_length, fresh_problem = solve_core_problem(analyzer, basis, bound)
+        pulp_helper._core_problem_models[dag] = models
+        assert length == pytest.approx(fresh_length, abs=1e-6)
+        assert len(problem.constraints) == len(fresh_problem.constraints)
+
+    # A path whose object has the identifier of a path that was freed, and
+    # whose rows are still kept, has its own rows built.
+    path = Path(nodes=paths[-1].nodes)
+    model._path_constraints[id(path)] = model._path_constraints[id(paths[0])]
+    constraints, num_new_rows = model.path_constraints(
+        [path], (lambda path: bound), (lambda path: -bound)
+    )
+    assert num_new_rows == 2
+    assert model._path_constraints[id(path)][0] is path
+    chains = get_compact_dag(dag).chains_of(Dag.get_edges(path.nodes))
+    expected = pulp.lpSum(model.edge_weights[chain] for chain in chains)
+    for constraint in constraints.values():
+        assert {var.name for var in constraint} == {var.name for var in expected}
@@ -0,0 +1,97 @@
+"""
+Tests of the enumeration of the paths through a DAG in order of value,
+which must list every path once, in the order in which
+``find_extreme_path`` finds them when each path found is excluded.
+"""
+
+import itertools
+import os
+
+import networkx as nx
+import numpy as np
+import pytest
+
+import pulp_helper
+from analyzer_factory import make_analyzer
+from dag_factory import make_random_dag
+from gametime_error import GameTimeError
+from nx_helper import Dag, construct_dag
+from path_enumeration import PathEnumerator, can_enumerate_extreme_paths, extreme_paths
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+
+
+def path_value(dag: Dag, nodes, edge_weights) -> float:
+    return sum(edge_weights[dag.edges_indices[edge]] for edge in Dag.get_edges(nodes))
+
+
+def all_path_values(dag: Dag, edge_weights):
+    return {
+        tuple(nodes): path_value(dag, nodes, edge_weights)
+        for nodes in nx.all_simple_paths(dag, dag.source, dag.sink)
+    }
+
+
+def dags():
+    for seed in range(5):
+        yield make_random_dag(14, 12, seed), seed
+    dag, _ = construct_dag(os.path.join(DATA_DIR, "cfg_run1.dot"))
+    yield dag, 100
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+@pytest.mark.parametrize("longest", [True, False])
+def test_enumerator_lists_every_path_in_order(dag, seed, longest):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.integers(-5, 6, size=dag.num_edges).tolist()
+    expected = all_path_values(dag, edge_weights)
+
+    enumerated = list(PathEnumerator(dag, edge_weights, longest))
+    assert sorted(tuple(nodes) for nodes, _ in enumerated) == sorted(expected)
+    for nodes, value in enumerated:
+        assert value == pytest.approx(expected[tuple(nodes)])
+    values = [value for _, value in enumerated]
+    assert values == sorted(values, reverse=longest)
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+def test_extreme_paths_in_order_of_absolute_value(dag, seed):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.integers(-5, 6, size=dag.num_edges).tolist()
+    expected = all_path_values(dag, edge_weights)
+
+    enumerated = list(extreme_paths(dag, edge_weights, longest=True))
+    assert sorted(tuple(nodes) for nodes, _ in enumerated) == sorted(expected)
+    for nodes, value in enumerated:
+        assert value == pytest.approx(abs(expected[tuple(nodes)]))
+    values = [value for _, value in enumerated]
+    assert values == sorted(values, reverse=True)
+
+
+def test_shortest_paths_need_weights_of_one_sign():
+    dag = make_random_dag(10, 6, 0)
+    assert can_enumerate_extreme_paths([1.0, 0.0, 2.0], longest=False)
+    assert can_enumerate_extreme_paths([-1.0, 0.0, -2.0], longest=False)
+    assert not can_enumerate_extreme_paths([-1.0, 2.0], longest=False)
+    assert can_enumerate_extreme_paths([-1.0, 2.0], longest=True)
+
+    edge_weights = [-2.0] * dag.num_edges
+    values = [value for _, value in extreme_paths(dag, edge_weights, False)]
+    assert values == sorted(values)
+    edge_weights[0] = 1.0
+    with pytest.raises(GameTimeError):
+        next(extreme_paths(dag, edge_weights, False))
+
+
+@pytest.mark.parametrize("dag, seed", list(dags()))
+def test_extreme_paths_match_find_extreme_path(tmp_path, dag, seed):
+    rng = np.random.default_rng(seed)
+    edge_weights = rng.uniform(-10, 10, size=dag.num_edges).tolist()
+    analyzer = make_analyzer(dag, str(tmp_path))
+    for nodes, value in itertools.islice(extreme_paths(dag, edge_weights), 8):
+        found_nodes, problem = pulp_helper.find_extreme_path(
+            analyzer, edge_weights=edge_weights
+        )
+        assert found_nodes == nodes
+        assert problem.obj_val == pytest.approx(value, abs=1e-6)
+        analyzer.add_path_exclusive_constraint(Dag.get_edges(found_nodes))
@@ -0,0 +1,41 @@
+"""
+Tests of the parser of the YAML project configuration files.
+"""
+
+import pytest
+
+from gametime_error import GameTimeError
+from project_configuration_parser import YAMLConfigurationParser
+
+
+def write_config(tmp_path, analysis):
+    (tmp_path / "program.c").write_text("int main(void) { return 0; }\n")
+    lines = [
+        "---",
+        "gametime-project:",
+        "  file:",
+        "    location: program.c",
+        "    analysis-function: main",
+        "  analysis:",
+    ] + ["    %s: %s" % item for item in analysis.items()]
+    config_path = tmp_path / "config.yaml"
+    config_path.write_text("\n".join(lines) + "\n")
+    return str(config_path)
+
+
+@pytest.mark.parametrize("jobs", [2, 8])
+def test_jobs(tmp_path, jobs):
+    config_path = write_config(tmp_path, {"jobs": jobs})
+    assert YAMLConfigurationParser.parse(config_path).NUM_JOBS == jobs
+
+
+@pytest.mark.parametrize("jobs", [0, -1])
+def test_jobs_below_one_are_rejected(tmp_path, jobs):
+    config_path = write_config(tmp_path, {"jobs": jobs})
+    with pytest.raises(GameTimeError):
+        YAMLConfigurationParser.parse(config_path)
+
+
+def test_sparse_basis_threshold(tmp_path):
+    config_path = write_config(tmp_path, {"sparse-basis-threshold": 50})
+    assert YAMLConfigurationParser.parse(config_path).SPARSE_BASIS_THRESHOLD == 50